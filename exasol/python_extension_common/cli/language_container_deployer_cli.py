@@ -8,11 +8,13 @@ from exasol.python_extension_common.connections.bucketfs_location import (
 from exasol.python_extension_common.connections.pyexasol_connection import (
     open_pyexasol_connection,
 )
+from exasol.python_extension_common.deployment.container_cache import ContainerCache
 from exasol.python_extension_common.deployment.language_container_deployer import (
     ExtractValidator,
     LanguageContainerDeployer,
     display_extract_progress,
 )
+from exasol.python_extension_common.deployment.polling import AdaptivePolling
 
 
 class LanguageContainerDeployerCli:
@@ -46,15 +48,24 @@ class LanguageContainerDeployerCli:
         wait_for_completion = kwargs[StdParams.wait_for_completion.name]
         deploy_timeout_minutes = kwargs[StdParams.deploy_timeout_minutes.name]
         display_progress = kwargs[StdParams.display_progress.name]
+        # The options below may be missing in CLIs defined before they were introduced.
+        use_container_cache = kwargs.get(StdParams.use_container_cache.name, True)
+        container_cache_dir = kwargs.get(StdParams.container_cache_dir.name)
 
         display_callback = display_extract_progress if display_progress else None
         extract_validator = ExtractValidator(
             pyexasol_connection,
             timedelta(minutes=deploy_timeout_minutes),
             callback=display_callback,
+            polling=AdaptivePolling(),
         )
+        container_cache = ContainerCache(container_cache_dir) if use_container_cache else None
         deployer = LanguageContainerDeployer(
-            pyexasol_connection, language_alias, bucketfs_location, extract_validator
+            pyexasol_connection,
+            language_alias,
+            bucketfs_location,
+            extract_validator,
+            container_cache=container_cache,
         )
         if not upload_container:
             deployer.run(
@@ -163,6 +163,8 @@ class StdParams(Enum):
     wait_for_completion = (StdTags.SLC, auto())
     deploy_timeout_minutes = (StdTags.SLC, auto())
     display_progress = (StdTags.SLC, auto())
+    use_container_cache = (StdTags.SLC, auto())
+    container_cache_dir = (StdTags.SLC, auto())
 
     def __init__(self, tags: StdTags, value):
         self.tags = tags
@@ -210,6 +212,8 @@ _std_options = {
     StdParams.wait_for_completion: {"type": bool, "default": True},
     StdParams.deploy_timeout_minutes: {"type": int, "default": 10},
     StdParams.display_progress: {"type": bool, "default": True},
+    StdParams.use_container_cache: {"type": bool, "default": True},
+    StdParams.container_cache_dir: {"type": str, "default": ""},
 }
 
 
@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+import click
+
+from exasol.python_extension_common.connections.pyexasol_connection import (
+    open_pyexasol_connection,
+)
+from exasol.python_extension_common.deployment.temp_objects import sweep_temp_objects
+
+
+class TempObjectSweeperCli:
+    """
+    The class provides a CLI callback function that drops the stale temporary
+    objects, e.g. left behind by deployments which have been killed, see
+    sweep_temp_objects().
+
+    The user defines the names of the options for the min. age in hours and
+    for the dry run, next to the standard database options.
+    """
+
+    def __init__(self, min_age_hours_arg: str, dry_run_arg: str | None = None) -> None:
+        self._min_age_hours_arg = min_age_hours_arg
+        self._dry_run_arg = dry_run_arg
+
+    def __call__(self, **kwargs):
+        min_age = timedelta(hours=kwargs.pop(self._min_age_hours_arg))
+        dry_run = bool(kwargs.pop(self._dry_run_arg, False)) if self._dry_run_arg else False
+        pyexasol_connection = open_pyexasol_connection(**kwargs)
+        try:
+            objects = sweep_temp_objects(pyexasol_connection, min_age, dry_run)
+        finally:
+            pyexasol_connection.close()
+        verb = "Would drop" if dry_run else "Dropped"
+        for obj in objects:
+            click.echo(f"{verb} {obj.object_type} {obj.qualified_name}")
+        click.echo(f"{verb} {len(objects)} temporary objects.")
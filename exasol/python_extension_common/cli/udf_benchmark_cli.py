@@ -0,0 +1,66 @@
+from datetime import timedelta
+from pathlib import Path
+
+import click
+
+from exasol.python_extension_common.cli.std_options import StdParams
+from exasol.python_extension_common.connections.pyexasol_connection import (
+    open_pyexasol_connection,
+)
+from exasol.python_extension_common.deployment.extract_validator import ExtractValidator
+from exasol.python_extension_common.deployment.temp_schema import (
+    get_schema,
+    temp_schema,
+)
+from exasol.python_extension_common.deployment.udf_benchmark import benchmark_cold_start
+
+
+class UdfBenchmarkCli:
+    """
+    The class provides a CLI callback function that benchmarks the cold start of
+    the language container activated under the language alias, see
+    benchmark_cold_start(). The results are written as JSON to the output file,
+    or printed if no output file is specified.
+
+    The user defines the names of the options for the modules to import, the
+    number of repetitions and the output file, next to the standard database
+    options and the language alias. The modules can be given as a list, e.g. by
+    a multiple option, or as a comma-separated string.
+    """
+
+    def __init__(
+        self, modules_arg: str, repetitions_arg: str, output_file_arg: str | None = None
+    ) -> None:
+        self._modules_arg = modules_arg
+        self._repetitions_arg = repetitions_arg
+        self._output_file_arg = output_file_arg
+
+    def __call__(self, **kwargs):
+        modules = kwargs.pop(self._modules_arg) or []
+        if isinstance(modules, str):
+            modules = [module.strip() for module in modules.split(",") if module.strip()]
+        repetitions = kwargs.pop(self._repetitions_arg)
+        output_file = kwargs.pop(self._output_file_arg, None) if self._output_file_arg else None
+        language_alias = kwargs[StdParams.language_alias.name]
+        timeout_minutes = kwargs.get(StdParams.deploy_timeout_minutes.name) or 10
+
+        pyexasol_connection = open_pyexasol_connection(**kwargs)
+        try:
+            validator = ExtractValidator(pyexasol_connection, timedelta(minutes=timeout_minutes))
+            schema = get_schema(pyexasol_connection)
+            if schema:
+                benchmark = benchmark_cold_start(
+                    validator, schema, language_alias, list(modules), repetitions
+                )
+            else:
+                with temp_schema(pyexasol_connection) as schema:
+                    benchmark = benchmark_cold_start(
+                        validator, schema, language_alias, list(modules), repetitions
+                    )
+        finally:
+            pyexasol_connection.close()
+
+        if output_file:
+            Path(output_file).write_text(benchmark.to_json(), encoding="utf-8")
+        else:
+            click.echo(benchmark.to_json())
@@ -0,0 +1,42 @@
+import asyncio
+import threading
+import weakref
+from collections.abc import Callable
+from typing import (
+    Any,
+    TypeVar,
+)
+
+import pyexasol  # type: ignore
+
+T = TypeVar("T")
+
+_connection_locks: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_connection_locks_guard = threading.Lock()
+
+
+def _connection_lock(conn: pyexasol.ExaConnection) -> threading.Lock:
+    with _connection_locks_guard:
+        return _connection_locks.setdefault(conn, threading.Lock())
+
+
+async def run_in_thread(
+    conn: pyexasol.ExaConnection, func: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """
+    Runs a blocking function using the specified pyexasol connection in a
+    worker thread, without blocking the event loop.
+
+    The calls using the same connection are serialized, as a pyexasol
+    connection must not be used by several threads at the same time. This is
+    also the case after a cancellation: the awaiting coroutine is cancelled
+    immediately, but the statement already sent to the database keeps running
+    in its thread. Subsequent calls, e.g. for cleaning up, wait until it has
+    finished.
+    """
+
+    def locked() -> T:
+        with _connection_lock(conn):
+            return func(*args, **kwargs)
+
+    return await asyncio.to_thread(locked)
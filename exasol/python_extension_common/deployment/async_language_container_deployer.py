@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import tempfile
+from pathlib import Path
+
+from exasol.python_extension_common.connections.async_connection import run_in_thread
+from exasol.python_extension_common.deployment.container_download import (
+    DEFAULT_CHUNK_SIZE,
+    download_container,
+)
+from exasol.python_extension_common.deployment.language_container_deployer import (
+    DeploymentResult,
+    LanguageContainerDeployer,
+)
+from exasol.python_extension_common.deployment.temp_schema import (
+    get_schema,
+    temp_schema_async,
+)
+from exasol.python_extension_common.deployment.udf_warm_up import warm_up_container
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncLanguageContainerDeployer:
+    """
+    Asyncio counterpart of the LanguageContainerDeployer, allowing to deploy
+    language containers from an event loop, e.g. to many databases
+    concurrently using asyncio.gather().
+
+    As neither pyexasol nor the BucketFS client are asynchronous, the
+    blocking operations are executed in worker threads. The statements using
+    the same pyexasol connection are serialized, see run_in_thread. Waiting
+    for the extraction of the container on all nodes doesn't occupy a thread
+    between the attempts.
+
+    A cancelled deployment stops at the next await. A statement or an upload
+    in progress at that time still runs to its end in its thread. The UDF
+    script and a temporary schema created for waiting for the extraction are
+    removed in any case.
+    """
+
+    def __init__(self, deployer: LanguageContainerDeployer) -> None:
+        self._deployer = deployer
+
+    @property
+    def deployer(self) -> LanguageContainerDeployer:
+        return self._deployer
+
+    async def download_and_run(
+        self,
+        url: str,
+        bucket_file_path: str,
+        alter_system: bool = True,
+        allow_override: bool = False,
+        wait_for_completion: bool = True,
+        print_activation_statements: bool = True,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        connections: int = 1,
+        skip_if_identical: bool = False,
+    ) -> DeploymentResult:
+        """
+        Downloads the language container and then deploys it. See the
+        `download_and_run` method of the LanguageContainerDeployer for the
+        description of the parameters.
+        """
+        cache = self._deployer.container_cache
+        if cache is not None:
+            container = await asyncio.to_thread(cache.get, url)
+            with container:
+                return await self.run(
+                    Path(container.name),
+                    bucket_file_path,
+                    alter_system,
+                    allow_override,
+                    wait_for_completion,
+                    print_activation_statements,
+                    skip_if_identical,
+                )
+
+        with tempfile.NamedTemporaryFile() as tmp_file:
+            await asyncio.to_thread(download_container, url, tmp_file, chunk_size, connections)
+            return await self.run(
+                Path(tmp_file.name),
+                bucket_file_path,
+                alter_system,
+                allow_override,
+                wait_for_completion,
+                print_activation_statements,
+                skip_if_identical,
+            )
+
+    async def run(
+        self,
+        container_file: Path | None = None,
+        bucket_file_path: str | None = None,
+        alter_system: bool = True,
+        allow_override: bool = False,
+        wait_for_completion: bool = True,
+        print_activation_statements: bool = True,
+        skip_if_identical: bool = False,
+    ) -> DeploymentResult:
+        """
+        Deploys the language container. See the `run` method of the
+        LanguageContainerDeployer for the description of the parameters.
+        """
+        if not bucket_file_path:
+            if not container_file:
+                raise ValueError("Either a container file or a bucket file path must be specified.")
+            bucket_file_path = container_file.name
+
+        result = DeploymentResult()
+        if container_file:
+            uploaded = await asyncio.to_thread(
+                self._deployer.upload_container,
+                container_file,
+                bucket_file_path,
+                skip_if_identical,
+            )
+            result.upload_skipped = not uploaded
+
+        result.system_altered = await run_in_thread(
+            self._deployer.pyexasol_connection,
+            self._deployer.activate_and_wait,
+            bucket_file_path,
+            alter_system,
+            allow_override,
+            False,
+            False,
+        )
+        if container_file and not result.upload_skipped and wait_for_completion:
+            await self.wait_for_completion(bucket_file_path)
+        if not alter_system and print_activation_statements:
+            # Printed after waiting, in the same order as the synchronous deployer.
+            await run_in_thread(
+                self._deployer.pyexasol_connection,
+                self._deployer.print_activation_commands,
+                bucket_file_path,
+            )
+        modules = self._deployer.warm_up_modules
+        if modules is not None:
+            result.warm_up_times = await run_in_thread(
+                self._deployer.pyexasol_connection, warm_up_container, self._deployer, modules
+            )
+        return result
+
+    async def wait_for_completion(self, bucket_file_path: str) -> None:
+        """
+        Waits until the container is extracted on all nodes of the database
+        cluster. The UDF for the validation is created in the current schema
+        of the pyexasol connection if one is open, otherwise in a schema leased
+        from the schema pool of the deployer or in a temporary schema, unless
+        the validator uses a persistent UDF.
+        """
+        conn = self._deployer.pyexasol_connection
+        validator = self._deployer.extract_validator
+        alias = self._deployer.language_alias
+        upload_path = self._deployer.bucketfs_path / bucket_file_path
+        schema = validator.udf_schema or await run_in_thread(conn, get_schema, conn)
+        if schema:
+            await validator.verify_all_nodes_async(schema, alias, upload_path)
+            return
+        pool = self._deployer.schema_pool
+        scratch_schema = pool.lease_async(conn) if pool else temp_schema_async(conn)
+        async with scratch_schema as schema:
+            await validator.verify_all_nodes_async(schema, alias, upload_path)
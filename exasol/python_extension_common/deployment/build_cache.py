@@ -0,0 +1,164 @@
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import zipfile
+from pathlib import Path
+
+from exasol.slc.models.compression_strategy import CompressionStrategy  # type: ignore
+from exasol.slc.models.export_container_result import (
+    ExportContainerResult,  # type: ignore
+)
+
+from exasol.python_extension_common.deployment.container_cache import default_cache_dir
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BUILD_CACHE_ENTRIES = 5
+
+_RESULT_FILE = "result.json"
+
+
+def default_build_cache_dir() -> Path:
+    """
+    Returns the default location of the build cache, next to the default
+    location of the container cache.
+    """
+    return default_cache_dir().parent / "slc-build"
+
+
+def _update_with_wheel(sha256, wheel: Path) -> None:
+    """
+    Hashes the names and the contents of the files in the wheel, but not the
+    timestamps in the zip archive, which change with each build of the wheel.
+    """
+    with zipfile.ZipFile(wheel) as archive:
+        for info in sorted(archive.infolist(), key=lambda i: i.filename):
+            sha256.update(info.filename.encode("utf-8") + b"\0")
+            sha256.update(archive.read(info))
+
+
+def flavor_hash(flavor_path: Path) -> str:
+    """
+    Returns the SHA-256 hash of the files in the flavor directory, including
+    the requirements and the wheel of the project added by prepare_flavor().
+    """
+    sha256 = hashlib.sha256()
+    for file in sorted(f for f in flavor_path.rglob("*") if f.is_file()):
+        sha256.update(file.relative_to(flavor_path).as_posix().encode("utf-8") + b"\0")
+        if file.suffix == ".whl":
+            _update_with_wheel(sha256, file)
+        else:
+            sha256.update(file.read_bytes())
+    return sha256.hexdigest()
+
+
+class BuildCache:
+    """
+    A local on-disk cache for exported language containers, see
+    LanguageContainerBuilder.
+
+    An exported container is stored together with its ExportContainerResult,
+    under a key derived from the content of the flavor, i.e. the Dockerfiles,
+    the requirements and the content of the wheel, and from the compression
+    strategy. As long as the key matches, the container doesn't need to be
+    built and exported again.
+
+    The number of entries is limited by `max_entries`. When the limit is
+    exceeded the least recently used entries are evicted. Entries are written
+    to a temporary directory first and then atomically renamed.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path | None = None,
+        max_entries: int = DEFAULT_MAX_BUILD_CACHE_ENTRIES,
+    ) -> None:
+        self._cache_dir = Path(cache_dir) if cache_dir else default_build_cache_dir()
+        self._max_entries = max_entries
+
+    @property
+    def cache_dir(self) -> Path:
+        return self._cache_dir
+
+    def key(self, flavor_path: Path, compression_strategy: CompressionStrategy) -> str:
+        """
+        Returns the cache key for exporting the flavor with the specified
+        compression strategy.
+        """
+        sha256 = hashlib.sha256()
+        sha256.update(flavor_path.name.encode("utf-8") + b"\0")
+        sha256.update(str(compression_strategy.value).encode("utf-8") + b"\0")
+        sha256.update(flavor_hash(flavor_path).encode("utf-8"))
+        return sha256.hexdigest()
+
+    def _entry_dir(self, key: str) -> Path:
+        return self._cache_dir / key
+
+    def get(self, key: str, flavor_path: Path, export_path: Path) -> ExportContainerResult | None:
+        """
+        Returns the cached export result for the specified key, or None if the
+        cache holds no such entry. The cached containers are copied to the
+        export path, and the result refers to them and to the specified flavor
+        path, as if the flavor had just been exported.
+        """
+        entry_dir = self._entry_dir(key)
+        try:
+            result = ExportContainerResult.from_json((entry_dir / _RESULT_FILE).read_text())
+        except (FileNotFoundError, ValueError, TypeError):
+            return None
+        os.utime(entry_dir)
+        export_path.mkdir(parents=True, exist_ok=True)
+        export_infos = {}
+        for export_info_by_goal in result.export_infos.values():
+            for export_info in export_info_by_goal.values():
+                file_name = Path(export_info.cache_file).name
+                if not (entry_dir / file_name).is_file():
+                    return None
+                shutil.copyfile(entry_dir / file_name, export_path / file_name)
+                export_info.cache_file = str(export_path / file_name)
+                export_info.output_file = str(export_path / file_name)
+                export_info.is_new = False
+            export_infos[str(flavor_path)] = export_info_by_goal
+        result.export_infos = export_infos
+        logger.info("Using the cached language container %s.", key)
+        return result
+
+    def put(self, key: str, result: ExportContainerResult) -> None:
+        """
+        Stores the containers referred to by the export result and the result
+        itself under the specified key.
+        """
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(dir=self._cache_dir, suffix=".tmp"))
+        try:
+            for export_info_by_goal in result.export_infos.values():
+                for export_info in export_info_by_goal.values():
+                    shutil.copyfile(
+                        export_info.cache_file, tmp_dir / Path(export_info.cache_file).name
+                    )
+            (tmp_dir / _RESULT_FILE).write_text(result.to_json())
+            entry_dir = self._entry_dir(key)
+            if entry_dir.exists():
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        self.evict(keep=key)
+
+    def evict(self, keep: str | None = None) -> None:
+        """
+        Removes the least recently used entries exceeding the max. number of
+        entries. The entry with the key `keep` is never removed.
+        """
+        entries = sorted(
+            (entry for entry in self._cache_dir.iterdir() if entry.is_dir()),
+            key=lambda entry: entry.stat().st_mtime,
+            reverse=True,
+        )
+        entries = [entry for entry in entries if not entry.name.endswith(".tmp")]
+        for entry in entries[self._max_entries :]:
+            if entry.name != keep:
+                shutil.rmtree(entry, ignore_errors=True)
@@ -0,0 +1,323 @@
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from dataclasses import (
+    asdict,
+    dataclass,
+)
+from pathlib import Path
+from typing import BinaryIO
+
+import requests  # type: ignore
+
+from exasol.python_extension_common.deployment.container_download import (
+    DEFAULT_CHUNK_SIZE,
+    DOWNLOAD_TIMEOUT,
+    download_container,
+)
+from exasol.python_extension_common.deployment.content_hash import file_sha256
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CACHE_SIZE = 10 * 1024**3
+
+# Files in the cache which are not referenced by any entry, e.g. left behind
+# by a killed process, are removed only after this number of seconds. This
+# protects the files just being published by a concurrent process.
+_ORPHAN_GRACE_PERIOD = 3600
+
+
+def default_cache_dir() -> Path:
+    """
+    Returns the default location of the container cache, following the XDG
+    base directory specification.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "exasol-python-extension-common" / "slc"
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """
+    Metadata of a cached container. The content is stored under its SHA-256
+    hash, so that identical containers downloaded from different urls share
+    a single file.
+    """
+
+    url: str
+    sha256: str
+    size: int
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+def _url_key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+class ContainerCache:
+    """
+    A local on-disk cache for downloaded language containers.
+
+    A cached container is revalidated with a conditional GET request using
+    the ETag and Last-Modified headers from the original response. The
+    container is downloaded again only if the server reports a change.
+
+    The total size of the cached containers is limited by `max_size`. When
+    the limit is exceeded the least recently used containers are evicted.
+
+    The cache can be shared between several processes. All files are written
+    to temporary files first and then atomically renamed, so that a reader
+    never sees a partially written container or entry. A container returned
+    by `get` holds a shared advisory lock (flock) until it is closed, and the
+    eviction skips locked containers. Looking up a container for locking it
+    and the eviction are serialized by an exclusive lock on the cache
+    directory.
+
+    The containers are downloaded with `download_container`, see its
+    docstring for the meaning of `chunk_size` and `connections`.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path | None = None,
+        max_size: int = DEFAULT_MAX_CACHE_SIZE,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        connections: int = 1,
+    ) -> None:
+        self._cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self._max_size = max_size
+        self._chunk_size = chunk_size
+        self._connections = connections
+
+    @property
+    def cache_dir(self) -> Path:
+        return self._cache_dir
+
+    @property
+    def _entries_dir(self) -> Path:
+        return self._cache_dir / "entries"
+
+    @property
+    def _objects_dir(self) -> Path:
+        return self._cache_dir / "objects"
+
+    def _entry_path(self, url: str) -> Path:
+        return self._entries_dir / f"{_url_key(url)}.json"
+
+    def object_path(self, entry: CacheEntry) -> Path:
+        return self._objects_dir / entry.sha256
+
+    def lookup(self, url: str) -> CacheEntry | None:
+        """
+        Returns the entry for the specified url, if the container is in the
+        cache, without revalidating it.
+        """
+        try:
+            entry = CacheEntry(**json.loads(self._entry_path(url).read_text()))
+        except (FileNotFoundError, ValueError, TypeError):
+            return None
+        if entry.url != url or not self.object_path(entry).is_file():
+            return None
+        return entry
+
+    def get(self, url: str) -> BinaryIO:
+        """
+        Returns the local copy of the container at the specified url, opened
+        for reading. The container gets downloaded unless the cache holds an
+        up-to-date copy. Its path is provided by the attribute `name` of the
+        file.
+
+        The container is not evicted, e.g. by a concurrent process, until the
+        file is closed. The caller is responsible for closing it.
+        """
+        while True:
+            entry = self._fetch(url)
+            with self._lock():
+                container = self._open_locked(self.object_path(entry))
+            # Otherwise, another process evicted the container in the meantime.
+            if container is not None:
+                break
+        try:
+            self._touch(url)
+            self.evict(keep=entry)
+        except BaseException:
+            container.close()
+            raise
+        return container
+
+    def _fetch(self, url: str) -> CacheEntry:
+        self._entries_dir.mkdir(parents=True, exist_ok=True)
+        self._objects_dir.mkdir(parents=True, exist_ok=True)
+        entry = self.lookup(url)
+        headers = {}
+        if entry and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        if self._connections > 1:
+            # Only the first byte, the content gets downloaded in byte ranges.
+            headers["Range"] = "bytes=0-0"
+        try:
+            response = requests.get(url, stream=True, timeout=DOWNLOAD_TIMEOUT, headers=headers)
+        except (requests.ConnectionError, requests.Timeout):
+            if entry is None:
+                raise
+            logger.warning("Could not revalidate %s, using the cached container.", url)
+        else:
+            with response:
+                if entry and response.status_code == requests.codes.not_modified:
+                    logger.debug("Using cached container for %s", url)
+                else:
+                    response.raise_for_status()
+                    entry = self._store(url, response)
+        assert entry is not None
+        return entry
+
+    @contextmanager
+    def _lock(self) -> Generator[None, None, None]:
+        """
+        Holds an exclusive lock on the cache directory.
+        """
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(self._cache_dir / "lock", "a", encoding="utf-8") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    @staticmethod
+    def _open_locked(path: Path) -> BinaryIO | None:
+        """
+        Opens the file and takes a shared lock on it, protecting it from
+        being removed. Returns None if the file doesn't exist.
+        """
+        try:
+            file = open(path, "rb")  # pylint: disable=consider-using-with
+        except FileNotFoundError:
+            return None
+        fcntl.flock(file, fcntl.LOCK_SH)
+        return file
+
+    @staticmethod
+    def _remove_unless_locked(path: Path) -> bool:
+        """
+        Removes the file unless another file object holds a lock on it.
+        Returns False if the file is locked and has been kept.
+        """
+        try:
+            file = open(path, "rb")  # pylint: disable=consider-using-with
+        except FileNotFoundError:
+            return True
+        with file:
+            try:
+                fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+            path.unlink(missing_ok=True)
+        return True
+
+    def _store(self, url: str, response: requests.Response) -> CacheEntry:
+        """
+        Writes the container to the cache. The content of a full response is
+        written directly, so the container isn't requested a second time. If
+        the transfer gets interrupted, the download is resumed with a new
+        request. After a partial response for the first byte, the container is
+        downloaded in byte ranges over the configured number of connections.
+        """
+        full_response = response if response.status_code == requests.codes.ok else None
+        if full_response is None:
+            response.close()
+        with tempfile.NamedTemporaryFile(
+            dir=self._objects_dir, suffix=".tmp", delete=False
+        ) as tmp_file:
+            try:
+                size = download_container(
+                    url, tmp_file, self._chunk_size, self._connections, response=full_response
+                )
+                sha256 = file_sha256(tmp_file.name, self._chunk_size)
+            except BaseException:
+                tmp_file.close()
+                os.unlink(tmp_file.name)
+                raise
+        entry = CacheEntry(
+            url=url,
+            sha256=sha256,
+            size=size,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        os.replace(tmp_file.name, self.object_path(entry))
+        self._write_entry(entry)
+        logger.debug("Cached container %s with SHA-256 %s", url, entry.sha256)
+        return entry
+
+    def _write_entry(self, entry: CacheEntry) -> None:
+        with tempfile.NamedTemporaryFile(
+            mode="w", dir=self._entries_dir, suffix=".tmp", delete=False
+        ) as tmp_file:
+            json.dump(asdict(entry), tmp_file)
+        os.replace(tmp_file.name, self._entry_path(entry.url))
+
+    def _touch(self, url: str) -> None:
+        try:
+            os.utime(self._entry_path(url))
+        except FileNotFoundError:
+            pass
+
+    def _entries(self) -> list[tuple[float, Path, CacheEntry]]:
+        result = []
+        for entry_path in self._entries_dir.glob("*.json"):
+            try:
+                mtime = entry_path.stat().st_mtime
+                entry = CacheEntry(**json.loads(entry_path.read_text()))
+            except (FileNotFoundError, ValueError, TypeError):
+                continue
+            result.append((mtime, entry_path, entry))
+        return sorted(result, key=lambda x: x[0])
+
+    def evict(self, keep: CacheEntry | None = None) -> None:
+        """
+        Removes the least recently used containers until the total size of
+        the cache is within the limit. The entry specified in `keep` and the
+        containers still opened by `get` are never removed.
+        """
+        with self._lock():
+            self._evict(keep)
+
+    def _evict(self, keep: CacheEntry | None) -> None:
+        entries = self._entries()
+        total = sum({entry.sha256: entry.size for _, _, entry in entries}.values())
+        referenced: dict[str, int] = {}
+        for _, _, entry in entries:
+            referenced[entry.sha256] = referenced.get(entry.sha256, 0) + 1
+        for _, entry_path, entry in entries:
+            if total <= self._max_size:
+                break
+            if keep and entry.sha256 == keep.sha256:
+                continue
+            if referenced[entry.sha256] == 1:
+                if not self._remove_unless_locked(self.object_path(entry)):
+                    logger.debug("Keeping cached container %s, as it is in use", entry.url)
+                    continue
+                total -= entry.size
+                logger.debug("Evicted cached container %s", entry.url)
+            entry_path.unlink(missing_ok=True)
+            referenced[entry.sha256] -= 1
+        self._remove_orphans({sha256 for sha256, count in referenced.items() if count > 0})
+
+    def _remove_orphans(self, referenced: set[str]) -> None:
+        deadline = time.time() - _ORPHAN_GRACE_PERIOD
+        candidates = list(self._objects_dir.iterdir()) + list(self._entries_dir.glob("*.tmp"))
+        for path in candidates:
+            if path.name in referenced:
+                continue
+            try:
+                if path.stat().st_mtime < deadline:
+                    self._remove_unless_locked(path)
+            except FileNotFoundError:
+                pass
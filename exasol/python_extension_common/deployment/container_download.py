@@ -0,0 +1,314 @@
+import io
+import logging
+import queue
+import re
+import threading
+from collections.abc import (
+    Generator,
+    Iterable,
+)
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import (
+    IO,
+    BinaryIO,
+)
+
+import requests  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# Size of the chunks in which a container is transferred from the HTTP
+# response to its destination. This is also the upper bound of the memory
+# held for the content of the container at any time.
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Max. number of chunks buffered between the download and the upload when the
+# container is piped directly into the BucketFS.
+DEFAULT_BUFFER_CHUNKS = 4
+
+DOWNLOAD_TIMEOUT = 300
+
+# Max. number of times an interrupted download gets resumed.
+DEFAULT_MAX_RETRIES = 5
+
+# Errors after which a download can be resumed.
+_TRANSIENT_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+# How often a blocked producer checks if the consumer has gone away.
+_PUT_TIMEOUT = 0.1
+
+_EOF = object()
+
+
+def download_container(
+    url: str,
+    file: IO[bytes],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    connections: int = 1,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    response: requests.Response | None = None,
+) -> int:
+    """
+    Downloads the language container from the provided url and writes it to
+    the given binary file. The content is streamed in chunks, so that the
+    memory consumption doesn't depend on the size of the container.
+
+    An interrupted download is resumed from where it stopped, if the server
+    supports HTTP range requests. Otherwise, the download starts again from
+    the beginning.
+
+    With more than one connection, the container is split into byte ranges
+    which are fetched concurrently and written to their positions in the
+    file. This requires the file to be seekable. If the server doesn't
+    support range requests, the container is downloaded in a single stream.
+
+    Returns the number of downloaded bytes.
+
+    url              - Address where the container will be downloaded from.
+    file             - Binary file, opened for writing.
+    chunk_size       - Max. number of bytes read from the response at once.
+    connections      - Number of byte ranges downloaded concurrently.
+    max_retries      - Max. number of times an interrupted download gets resumed.
+    response         - An already open streamed response to a GET request for the url.
+                       Its content is written to the file first, so that a response
+                       received e.g. for revalidating a cached copy isn't discarded.
+                       The download is then done in one stream, regardless of the
+                       number of connections.
+    """
+    if response is not None:
+        return _download_stream(url, file, chunk_size, max_retries, response)
+    if connections > 1:
+        length = _get_ranged_length(url)
+        if length:
+            return _download_ranges(url, file, length, chunk_size, connections, max_retries)
+        logger.debug("Server doesn't support range requests, downloading %s in one stream", url)
+    return _download_stream(url, file, chunk_size, max_retries)
+
+
+def _download_stream(
+    url: str,
+    file: IO[bytes],
+    chunk_size: int,
+    max_retries: int,
+    response: requests.Response | None = None,
+) -> int:
+    size = 0
+    attempt = 0
+    resumable = False
+    while True:
+        headers = {"Range": f"bytes={size}-"} if size and resumable else {}
+        try:
+            if response is None:
+                response = requests.get(url, stream=True, timeout=DOWNLOAD_TIMEOUT, headers=headers)
+            with response:
+                response.raise_for_status()
+                if size and response.status_code != requests.codes.partial_content:
+                    # The download can't be resumed, start again from the beginning.
+                    file.seek(0)
+                    file.truncate()
+                    size = 0
+                resumable = response.headers.get("Accept-Ranges") == "bytes"
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    file.write(chunk)
+                    size += len(chunk)
+            break
+        except _TRANSIENT_ERRORS as ex:
+            response = None
+            attempt += 1
+            if attempt > max_retries:
+                raise
+            logger.warning(
+                "Download of %s interrupted after %d bytes, retrying (%d/%d): %s",
+                url,
+                size,
+                attempt,
+                max_retries,
+                ex,
+            )
+    file.flush()
+    return size
+
+
+def _get_ranged_length(url: str) -> int | None:
+    """
+    Returns the length of the content at the url, if the server supports
+    range requests, or None otherwise. A GET request for the first byte is
+    used instead of HEAD, as pre-signed URLs are often valid for GET only.
+    """
+    with requests.get(
+        url, stream=True, timeout=DOWNLOAD_TIMEOUT, headers={"Range": "bytes=0-0"}
+    ) as response:
+        response.raise_for_status()
+        if response.status_code != requests.codes.partial_content:
+            return None
+        match = re.fullmatch(r"bytes 0-0/(\d+)", response.headers.get("Content-Range", ""))
+        return int(match.group(1)) if match else None
+
+
+def _download_ranges(
+    url: str, file: IO[bytes], length: int, chunk_size: int, connections: int, max_retries: int
+) -> int:
+    lock = threading.Lock()
+
+    def fetch(first: int, last: int) -> None:
+        position = first
+        attempt = 0
+        while position <= last:
+            start = position
+            try:
+                with requests.get(
+                    url,
+                    stream=True,
+                    timeout=DOWNLOAD_TIMEOUT,
+                    headers={"Range": f"bytes={position}-{last}"},
+                ) as response:
+                    response.raise_for_status()
+                    if response.status_code != requests.codes.partial_content:
+                        raise RuntimeError(f"Server ignored the range request for {url}.")
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        chunk = chunk[: last - position + 1]
+                        with lock:
+                            file.seek(position)
+                            file.write(chunk)
+                        position += len(chunk)
+                if position > start:
+                    continue
+                error: Exception = RuntimeError(f"Received no data for bytes {position}-{last}.")
+            except _TRANSIENT_ERRORS as ex:
+                error = ex
+            attempt += 1
+            if attempt > max_retries:
+                raise error
+            logger.warning(
+                "Download of bytes %d-%d of %s interrupted, retrying (%d/%d): %s",
+                position,
+                last,
+                url,
+                attempt,
+                max_retries,
+                error,
+            )
+
+    range_size = -(-length // connections)
+    with ThreadPoolExecutor(max_workers=connections) as executor:
+        futures = [
+            executor.submit(fetch, first, min(first + range_size, length) - 1)
+            for first in range(0, length, range_size)
+        ]
+        for future in futures:
+            future.result()
+    file.flush()
+    return length
+
+
+class PipeReader(io.RawIOBase):
+    """
+    A read-only binary stream fed by a background thread that consumes the
+    given chunks. The chunks are passed from the producer thread to the
+    reader through a queue holding at most `buffer_chunks` items, so the
+    producer can run ahead of the reader only by this many chunks.
+
+    An exception raised by the producer is re-raised in the reader. Closing
+    the reader stops the producer, even if not all chunks have been consumed.
+
+    If the total length of the content is known, it is exposed in the
+    attribute `len`. The `requests` library uses it for setting the
+    Content-Length header instead of falling back to the chunked transfer
+    encoding.
+    """
+
+    def __init__(
+        self,
+        chunks: Iterable[bytes],
+        length: int | None = None,
+        buffer_chunks: int = DEFAULT_BUFFER_CHUNKS,
+    ) -> None:
+        super().__init__()
+        self.len = length
+        self._queue: queue.Queue = queue.Queue(maxsize=buffer_chunks)
+        self._stopped = threading.Event()
+        self._pending = memoryview(b"")
+        self._position = 0
+        self._eof = False
+        self._producer = threading.Thread(target=self._produce, args=(chunks,), daemon=True)
+        self._producer.start()
+
+    def _put(self, item) -> bool:
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(item, timeout=_PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _produce(self, chunks: Iterable[bytes]) -> None:
+        try:
+            for chunk in chunks:
+                if chunk and not self._put(chunk):
+                    return
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            self._put(ex)
+            return
+        self._put(_EOF)
+
+    def readable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        while not self._pending and not self._eof:
+            item = self._queue.get()
+            if item is _EOF:
+                self._eof = True
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                self._pending = memoryview(item)
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        self._position += size
+        return size
+
+    def close(self) -> None:
+        self._stopped.set()
+        self._producer.join()
+        super().close()
+
+
+@contextmanager
+def open_container_stream(
+    url: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    buffer_chunks: int = DEFAULT_BUFFER_CHUNKS,
+) -> Generator[BinaryIO, None, None]:
+    """
+    A context manager opening the language container at the provided url as
+    a binary stream, which can be passed directly to `PathLike.write` of the
+    BucketFS. The download runs in a background thread and overlaps with
+    the consumption of the stream. The memory consumption is bounded by
+    approximately `chunk_size * (buffer_chunks + 2)` bytes.
+
+    url              - Address where the container will be downloaded from.
+    chunk_size       - Max. number of bytes read from the response at once.
+    buffer_chunks    - Max. number of chunks buffered between the download and the consumer.
+    """
+    with requests.get(url, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+        response.raise_for_status()
+        # With a content encoding, the decoded size differs from the Content-Length.
+        content_length = response.headers.get("Content-Length")
+        if response.headers.get("Content-Encoding") or not content_length:
+            length = None
+        else:
+            length = int(content_length)
+        chunks = response.iter_content(chunk_size=chunk_size)
+        with PipeReader(chunks, length, buffer_chunks) as stream:
+            yield stream  # type: ignore
@@ -0,0 +1,89 @@
+"""
+Precompiles the bytecode of the Python environment in a language container.
+
+The script runs during the build of the container, with the Python
+interpreter of the container, see LanguageContainerBuilder.add_bytecode_compilation.
+The file system of a language container is read-only at UDF runtime, hence
+without precompiled bytecode every UDF VM compiles the imported modules again.
+
+The bytecode is compiled with unchecked hashes. The interpreter then uses it
+without comparing the timestamp of the source file, which may change when the
+container is exported and extracted.
+"""
+
+import argparse
+import compileall
+import importlib.util
+import py_compile
+import sys
+import sysconfig
+from pathlib import Path
+
+DEFAULT_MIN_COVERAGE = 0.98
+
+
+def default_paths() -> list[Path]:
+    """
+    Returns the directories of the standard library and the installed packages.
+    """
+    paths = sysconfig.get_paths()
+    names = {paths[key] for key in ("stdlib", "purelib", "platlib") if key in paths}
+    return sorted(Path(name) for name in names if Path(name).is_dir())
+
+
+def compile_paths(paths: list[Path], optimize: int) -> None:
+    """
+    Compiles the source files in the specified directories. Existing bytecode
+    is compiled again, as bytecode precompiled by pip is validated by the
+    timestamp of the source file.
+    """
+    for path in paths:
+        compileall.compile_dir(
+            path,
+            quiet=2,
+            force=True,
+            optimize=optimize,
+            workers=0,
+            invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+        )
+
+
+def bytecode_coverage(paths: list[Path], optimize: int) -> tuple[int, list[Path]]:
+    """
+    Returns the number of source files in the specified directories and the
+    source files without bytecode at the specified optimization level.
+    """
+    optimization = optimize if optimize else ""
+    total = 0
+    missing = []
+    for path in paths:
+        for source in path.rglob("*.py"):
+            total += 1
+            cached = importlib.util.cache_from_source(str(source), optimization=optimization)
+            if not Path(cached).is_file():
+                missing.append(source)
+    return total, missing
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("paths", nargs="*", type=Path)
+    parser.add_argument("--optimize", type=int, default=0, choices=[0, 1, 2])
+    parser.add_argument("--min-coverage", type=float, default=DEFAULT_MIN_COVERAGE)
+    args = parser.parse_args(argv)
+
+    paths = args.paths or default_paths()
+    compile_paths(paths, args.optimize)
+    total, missing = bytecode_coverage(paths, args.optimize)
+    coverage = (total - len(missing)) / total if total else 1.0
+    print(f"Bytecode coverage: {total - len(missing)} of {total} source files ({coverage:.2%}).")
+    for source in missing[:20]:
+        print(f"No bytecode for {source}")
+    if coverage < args.min_coverage:
+        print(f"The bytecode coverage is below {args.min_coverage:.2%}.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
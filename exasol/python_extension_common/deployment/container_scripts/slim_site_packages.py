@@ -0,0 +1,159 @@
+"""
+Removes files not needed at UDF runtime from the installed Python packages in
+a language container, and reports the size of each installed distribution.
+
+The script runs during the build of the container, with the Python
+interpreter of the container, see LanguageContainerBuilder.add_slimming.
+"""
+
+import argparse
+import fnmatch
+import importlib.metadata
+import json
+import shutil
+import site
+import sys
+from pathlib import Path
+
+# Directories holding tests or documentation, which some distributions install
+# directly into site-packages. Only these top-level directories are removed by
+# default, as a package may import its own nested directories of these names.
+DEFAULT_TOP_LEVEL_DIRECTORIES = ["tests", "docs"]
+# Type stubs are used only for type checking.
+DEFAULT_FILE_PATTERNS = ["*.pyi"]
+
+
+def site_packages() -> list[Path]:
+    return sorted({Path(path) for path in site.getsitepackages() if Path(path).is_dir()})
+
+
+def _size(path: Path) -> int:
+    if path.is_file() and not path.is_symlink():
+        return path.stat().st_size
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file() and not f.is_symlink())
+
+
+def _is_redundant_bytecode(path: Path, optimize: int) -> bool:
+    """
+    Tells if the file is bytecode which the interpreter never loads, i.e.
+    bytecode of another interpreter or of another optimization level.
+    """
+    if path.suffix != ".pyc" or path.parent.name != "__pycache__":
+        return False
+    parts = path.name.split(".")
+    if len(parts) < 3 or parts[1] != sys.implementation.cache_tag:
+        return True
+    optimization = parts[2] if len(parts) == 4 else ""
+    return optimization != (f"opt-{optimize}" if optimize else "")
+
+
+def _distribution_top_level(path: Path) -> set[str]:
+    """
+    Returns the names of the top-level directories holding files of the
+    distributions installed in the specified directory.
+    """
+    return {
+        file.parts[0]
+        for dist in importlib.metadata.distributions(path=[str(path)])
+        for file in dist.files or []
+        if len(file.parts) > 1
+    }
+
+
+def slim(
+    paths: list[Path],
+    directory_patterns: list[str],
+    file_patterns: list[str],
+    optimize: int = 0,
+    top_level_directories: list[str] | None = None,
+) -> int:
+    """
+    Removes the directories and files matching the specified glob patterns at
+    any depth, as well as bytecode which is never loaded. Returns the number
+    of bytes removed.
+
+    The top-level directories are removed only directly inside the specified
+    paths, and only if they hold files of an installed distribution.
+    """
+    removed = 0
+    for path in paths:
+        owned = _distribution_top_level(path) if top_level_directories else set()
+        for name in top_level_directories or []:
+            directory = path / name
+            if name in owned and directory.is_dir() and not directory.is_symlink():
+                removed += _size(directory)
+                shutil.rmtree(directory)
+        for directory in sorted(path.rglob("*"), reverse=True):
+            if directory.is_dir() and not directory.is_symlink():
+                if any(fnmatch.fnmatch(directory.name, p) for p in directory_patterns):
+                    removed += _size(directory)
+                    shutil.rmtree(directory)
+        for file in path.rglob("*"):
+            if not file.is_file() or file.is_symlink():
+                continue
+            if any(fnmatch.fnmatch(file.name, p) for p in file_patterns) or (
+                _is_redundant_bytecode(file, optimize)
+            ):
+                removed += file.stat().st_size
+                file.unlink()
+    return removed
+
+
+def distribution_sizes(paths: list[Path]) -> dict[str, int]:
+    """
+    Returns the size of each distribution installed in the specified
+    directories, in bytes, sorted by descending size.
+    """
+    sizes: dict[str, int] = {}
+    for dist in importlib.metadata.distributions(path=[str(path) for path in paths]):
+        size = 0
+        for file in dist.files or []:
+            located = Path(str(dist.locate_file(file)))
+            if located.is_file() and not located.is_symlink():
+                size += located.stat().st_size
+        name = dist.metadata["Name"]
+        sizes[name] = sizes.get(name, 0) + size
+    return dict(sorted(sizes.items(), key=lambda item: item[1], reverse=True))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("paths", nargs="*", type=Path)
+    parser.add_argument("--directory-pattern", action="append", dest="directory_patterns")
+    parser.add_argument("--file-pattern", action="append", dest="file_patterns")
+    parser.add_argument("--optimize", type=int, default=0, choices=[0, 1, 2])
+    parser.add_argument("--report-file", type=Path)
+    parser.add_argument("--size-budget-mb", type=float)
+    args = parser.parse_args(argv)
+
+    paths = args.paths or site_packages()
+    file_patterns = DEFAULT_FILE_PATTERNS + (args.file_patterns or [])
+    removed = slim(
+        paths,
+        args.directory_patterns or [],
+        file_patterns,
+        args.optimize,
+        DEFAULT_TOP_LEVEL_DIRECTORIES,
+    )
+    sizes = distribution_sizes(paths)
+    total = sum(_size(path) for path in paths)
+
+    print(f"Removed {removed / 1024**2:.1f} MB, remaining {total / 1024**2:.1f} MB.")
+    for name, size in sizes.items():
+        print(f"{size / 1024**2:10.1f} MB  {name}")
+    if args.report_file:
+        args.report_file.parent.mkdir(parents=True, exist_ok=True)
+        report = {"removed": removed, "total": total, "distributions": sizes}
+        args.report_file.write_text(json.dumps(report, indent=2))
+    if args.size_budget_mb is not None and total > args.size_budget_mb * 1024**2:
+        print(
+            f"The size of the installed packages {total / 1024**2:.1f} MB "
+            f"exceeds the budget of {args.size_budget_mb} MB.",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+import hashlib
+import io
+import os
+from pathlib import Path
+from typing import BinaryIO
+
+from exasol.python_extension_common.deployment.container_download import (
+    DEFAULT_CHUNK_SIZE,
+)
+
+
+def file_sha256(file: str | Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+    """
+    Returns the SHA-256 hash of the content of the specified file as a hex
+    string. The file is read in chunks.
+    """
+    sha256 = hashlib.sha256()
+    with open(file, "rb") as f:
+        while chunk := f.read(chunk_size):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+class HashingReader(io.RawIOBase):
+    """
+    A read-only binary stream computing the SHA-256 hash of the content read
+    from the wrapped stream. The hash is complete once the wrapped stream
+    has been read to its end.
+
+    The attribute `len` tells the `requests` library the number of bytes
+    remaining in the wrapped stream, so that it can set the Content-Length
+    header instead of using the chunked transfer encoding.
+    """
+
+    def __init__(self, stream: BinaryIO) -> None:
+        super().__init__()
+        self._stream = stream
+        self._sha256 = hashlib.sha256()
+        self._position = 0
+        self.len = getattr(stream, "len", None)
+        if self.len is None and hasattr(stream, "fileno"):
+            try:
+                self.len = os.fstat(stream.fileno()).st_size - stream.tell()
+            except OSError:
+                pass
+
+    def readable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        data = self._stream.read(len(buffer))
+        size = len(data)
+        buffer[:size] = data
+        self._sha256.update(data)
+        self._position += size
+        return size
+
+    def hexdigest(self) -> str:
+        return self._sha256.hexdigest()
@@ -0,0 +1,75 @@
+import re
+
+import pyexasol  # type: ignore
+
+
+class ExtractException(Exception):
+    """
+    Expected file MANIFEST_FILE could not detected on all nodes of the
+    database cluster.
+
+    When validating multiple archives, the exception provides the readiness
+    of each archive on each node, see ExtractValidator.verify_archives().
+    """
+
+    def __init__(self, message: str, readiness: dict[str, dict[int, bool]] | None = None):
+        super().__init__(message)
+        self.readiness = readiness
+
+
+class ExtractAbortedException(ExtractException):
+    """
+    The validation failed with an error which won't disappear by retrying,
+    e.g. missing privileges. The message contains a diagnosis, the original
+    error is chained as the cause.
+    """
+
+
+# Patterns of error messages, which don't disappear when retrying, and the
+# diagnosis to report for them.
+_TERMINAL_ERRORS = [
+    (
+        re.compile(r"insufficient privileges", re.IGNORECASE),
+        "The database user lacks a privilege required for the validation, e.g. CREATE SCRIPT.",
+    ),
+    (
+        re.compile(r"syntax error", re.IGNORECASE),
+        "The database rejected the statement of the validation as invalid. "
+        "Please check the language alias.",
+    ),
+    (
+        re.compile(
+            r"(script language|language alias)\b.*\b(not found|unknown|not defined)"
+            r"|unknown (script language|language alias)",
+            re.IGNORECASE,
+        ),
+        "The language alias is not defined in SCRIPT_LANGUAGES.",
+    ),
+]
+
+
+def diagnose(ex: BaseException) -> str | None:
+    """
+    Returns a diagnosis if the specified error is terminal, i.e. retrying
+    the validation won't help. Returns None for errors which may disappear
+    once the container is extracted on all nodes.
+
+    A missing UDF client binary or an invalid path in the language
+    definition cannot be told apart from a container which is not extracted
+    yet. Such errors are retried until the timeout.
+    """
+    if isinstance(ex, ExtractException):
+        return None
+    if isinstance(ex, pyexasol.ExaQueryTimeoutError):
+        return None
+    if isinstance(ex, pyexasol.ExaQueryAbortError):
+        return "The validation statement has been aborted."
+    if isinstance(ex, (pyexasol.ExaCommunicationError, pyexasol.ExaAuthError)):
+        return "The connection to the database failed."
+    if isinstance(ex, ValueError):
+        return str(ex)
+    if isinstance(ex, pyexasol.ExaRequestError):
+        for pattern, diagnosis in _TERMINAL_ERRORS:
+            if pattern.search(ex.message):
+                return diagnosis
+    return None
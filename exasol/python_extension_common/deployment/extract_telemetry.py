@@ -0,0 +1,128 @@
+import math
+from dataclasses import (
+    dataclass,
+    field,
+)
+from datetime import (
+    datetime,
+    timedelta,
+)
+
+
+@dataclass(frozen=True)
+class ProbeEvent:
+    """
+    Outcome of a single attempt of probing the nodes of a database cluster
+    for the extracted archive.
+
+    timestamp   - Time at which the probe completed.
+    attempt     - Number of the attempt within the validation, starting at 1.
+    nproc       - Total number of nodes in the database cluster.
+    pending     - IDs of the nodes still pending after the probe.
+    ready       - Nodes which reported the archive as extracted for the first
+                  time, mapped to the time elapsed since the start of the
+                  validation.
+    latency     - Duration of the query probing the nodes.
+    error       - Description of the error, if the probe failed, e.g. because
+                  the query timed out or the UDF VM couldn't be started.
+                  None, if the probe succeeded, even with nodes still pending.
+    """
+
+    timestamp: datetime
+    attempt: int
+    nproc: int
+    pending: list[int]
+    ready: dict[int, timedelta]
+    latency: timedelta
+    error: str | None = None
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not None
+
+
+def _percentile(values: list[timedelta], percent: float) -> timedelta:
+    """
+    Returns the percentile of the values using the nearest-rank method.
+    """
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+@dataclass(frozen=True)
+class ExtractionStats:
+    """
+    Statistics of the time until the archive was found extracted.
+    """
+
+    count: int
+    p50: timedelta
+    p95: timedelta
+    max: timedelta
+
+    @classmethod
+    def of(cls, values: list[timedelta]) -> "ExtractionStats":
+        return cls(
+            count=len(values),
+            p50=_percentile(values, 50),
+            p95=_percentile(values, 95),
+            max=max(values),
+        )
+
+
+@dataclass
+class ExtractTelemetry:
+    """
+    Collects the probe events of one or more validations, e.g. by passing
+    the object as the listener of an ExtractValidator.
+
+    The summary provides statistics of the extraction time for each node,
+    i.e. the time from the start of a validation until the node reported the
+    archive as extracted. The statistics over all nodes can help choosing the
+    deploy timeout, the statistics of the individual nodes reveal nodes
+    which are chronically slow.
+    """
+
+    events: list[ProbeEvent] = field(default_factory=list)
+
+    def __call__(self, event: ProbeEvent) -> None:
+        self.events.append(event)
+
+    def extraction_times(self) -> dict[int, list[timedelta]]:
+        times: dict[int, list[timedelta]] = {}
+        for event in self.events:
+            for node, elapsed in event.ready.items():
+                times.setdefault(node, []).append(elapsed)
+        return times
+
+    def summary(self) -> dict[int, ExtractionStats]:
+        """
+        Returns the statistics of the extraction time for each node.
+        """
+        return {
+            node: ExtractionStats.of(times)
+            for node, times in sorted(self.extraction_times().items())
+        }
+
+    def overall(self) -> ExtractionStats | None:
+        """
+        Returns the statistics of the extraction time over all nodes, or None
+        if no node has reported the archive as extracted yet.
+        """
+        times = [t for node_times in self.extraction_times().values() for t in node_times]
+        return ExtractionStats.of(times) if times else None
+
+    def failures(self) -> list[ProbeEvent]:
+        """
+        Returns the events of the probes which failed.
+        """
+        return [event for event in self.events if event.failed]
+
+    def probe_latency(self) -> ExtractionStats | None:
+        """
+        Returns the statistics of the query latency of all probes, including
+        the failed ones, or None if there were no probes.
+        """
+        latencies = [event.latency for event in self.events]
+        return ExtractionStats.of(latencies) if latencies else None
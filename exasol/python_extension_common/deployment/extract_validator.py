@@ -1,33 +1,189 @@
+import hashlib
 import re
 from collections.abc import (
     Callable,
+    Generator,
+)
+from contextlib import contextmanager
+from dataclasses import (
+    dataclass,
+    field,
 )
 from datetime import (
     datetime,
     timedelta,
 )
 from textwrap import dedent
+from typing import Any
 
 import exasol.bucketfs as bfs  # type: ignore
 import pyexasol  # type: ignore
-from tenacity import Retrying
+from tenacity import (
+    AsyncRetrying,
+    Retrying,
+)
+from tenacity.retry import (
+    retry_if_exception_type,
+    retry_if_not_exception_type,
+)
 from tenacity.stop import stop_after_delay
-from tenacity.wait import wait_fixed
+
+from exasol.python_extension_common.connections.async_connection import run_in_thread
+from exasol.python_extension_common.deployment.extract_errors import (
+    ExtractAbortedException,
+    ExtractException,
+    diagnose,
+)
+from exasol.python_extension_common.deployment.extract_telemetry import ProbeEvent
+from exasol.python_extension_common.deployment.polling import (
+    FixedPolling,
+    PollingStrategy,
+)
+from exasol.python_extension_common.deployment.temp_objects import temp_object_name
+from exasol.python_extension_common.deployment.temp_schema import (
+    get_schema,
+    set_schema,
+)
 
 MANIFEST_FILE = "exasol-manifest.json"
 
 
-def _udf_name(schema: str | None, name: str) -> str:
-    timestamp = f"{datetime.now().timestamp():.0f}"
-    suffix = f'"{name}_manifest_{timestamp}"'
+@dataclass(frozen=True)
+class UdfDefinition:
+    """
+    Definition of a UDF script created by the validator, e.g. for checking
+    for manifest files, see also ExtractValidator.node_udf().
+
+    kind        - Part of the name of the UDF script.
+    parameters  - Parameters of the UDF script.
+    emits       - Output columns of the UDF script.
+    body        - Python code of the UDF script.
+    """
+
+    kind: str
+    parameters: str
+    emits: str
+    body: str
+
+    @property
+    def version(self) -> str:
+        """
+        Changes whenever the definition of the UDF changes, triggering an
+        upgrade of the persistent UDFs.
+        """
+        definition = f"{self.parameters}{self.emits}{self.body}"
+        return hashlib.sha256(definition.encode("utf-8")).hexdigest()[:12]
+
+
+_MANIFEST_UDF = UdfDefinition(
+    kind="manifest",
+    parameters="my_path VARCHAR(256)",
+    emits="node INTEGER, manifest BOOL",
+    body=dedent("""
+        import os
+        def run(ctx):
+            ctx.emit(exa.meta.node_id, os.path.isfile(ctx.my_path))
+        """),
+)
+
+_BATCH_MANIFEST_UDF = UdfDefinition(
+    kind="manifests",
+    parameters="my_paths VARCHAR(2000000)",
+    emits="node INTEGER, manifest_path VARCHAR(2000000), manifest BOOL",
+    body=dedent("""
+        import os
+        def run(ctx):
+            for path in ctx.my_paths.split("\\n"):
+                ctx.emit(exa.meta.node_id, path, os.path.isfile(path))
+        """),
+)
+
+_LONG_POLL_MANIFEST_UDF = UdfDefinition(
+    kind="manifest_wait",
+    parameters="my_path VARCHAR(256), max_wait DOUBLE",
+    emits="node INTEGER, manifest BOOL",
+    body=dedent("""
+        import os
+        import time
+        def run(ctx):
+            deadline = time.time() + ctx.max_wait
+            while not os.path.isfile(ctx.my_path) and time.time() < deadline:
+                time.sleep(0.1)
+            ctx.emit(exa.meta.node_id, os.path.isfile(ctx.my_path))
+        """),
+)
+
+MANIFEST_UDF_VERSION = _MANIFEST_UDF.version
+
+
+def _udf_name(schema: str | None, name: str, kind: str = _MANIFEST_UDF.kind) -> str:
+    suffix = f'"{temp_object_name(f"{name}_{kind}")}"'
     return f'"{schema}".{suffix}' if schema else suffix
 
 
-class ExtractException(Exception):
+def _persistent_script_name(name: str, kind: str = _MANIFEST_UDF.kind) -> str:
+    return f"{name}_{kind.upper()}_CHECK"
+
+
+def _persistent_udf_name(schema: str, name: str, kind: str = _MANIFEST_UDF.kind) -> str:
+    return f'"{schema}"."{_persistent_script_name(name, kind)}"'
+
+
+def _node_table_name(udf_name: str) -> str:
+    return f'{udf_name[:-1]}_NODES"'
+
+
+# Number of rows per node inserted in one round, when filling the node table.
+_NODE_TABLE_ROWS_PER_NODE = 4
+_NODE_TABLE_MAX_ROUNDS = 8
+
+
+@dataclass
+class _Progress:
+    """
+    Progress of the checks of a single validation.
+
+    start       - Time at which the validation started.
+    attempts    - Number of checks executed so far.
+    ready       - Nodes confirmed so far, mapped to the time elapsed since
+                  the start until they were confirmed.
+    """
+
+    start: datetime = field(default_factory=datetime.now)
+    attempts: int = 0
+    ready: dict[int, timedelta] = field(default_factory=dict)
+
+    def confirm(self, nodes: set[int]) -> dict[int, timedelta]:
+        """
+        Records the specified nodes as ready and returns the nodes which
+        haven't been confirmed before.
+        """
+        elapsed = datetime.now() - self.start
+        newly_ready = {node: elapsed for node in sorted(nodes) if node not in self.ready}
+        self.ready.update(newly_ready)
+        return newly_ready
+
+
+# Retries on exceptions, but neither on terminal errors nor on a cancellation
+# or an interrupt.
+_RETRY_UNLESS_ABORTED = retry_if_exception_type(Exception) & retry_if_not_exception_type(
+    ExtractAbortedException
+)
+
+
+@contextmanager
+def _fail_fast() -> Generator[None, None, None]:
     """
-    Expected file MANIFEST_FILE could not detected on all nodes of the
-    database cluster.
+    Converts terminal errors raised in the context to an
+    ExtractAbortedException, which is not retried.
     """
+    try:
+        yield
+    except Exception as ex:
+        diagnosis = diagnose(ex)
+        if diagnosis is None:
+            raise
+        raise ExtractAbortedException(f"{diagnosis} Error: {ex}") from ex
 
 
 class ExtractValidator:
@@ -46,6 +202,43 @@ class ExtractValidator:
     The callback is called with two arguments: the total number of nodes in
     the database cluster as returned by nproc() and a list of the IDs of the
     pending nodes on which the MANIFEST_FILE could not be found, yet.
+
+    If a listener is specified, it is called with a ProbeEvent after each
+    check, providing the attempt number, the latency of the probing query
+    and the time at which each node first reported the MANIFEST_FILE. A
+    check which fails with an error is reported as well, with the error in
+    the event. See ExtractTelemetry for collecting the events and
+    summarizing them.
+
+    By default the validator waits for the specified interval between the
+    attempts. Alternatively, a polling strategy can be specified, e.g.
+    AdaptivePolling. The strategy observes the number of pending nodes after
+    each attempt.
+
+    By default, the UDF script is created before and dropped after each
+    validation, in the schema passed to verify_all_nodes(). If a udf_schema
+    is specified, a persistent UDF script per language alias is installed in
+    this schema instead, and reused by subsequent validations. The script is
+    replaced only if its version, stored in the script, differs from
+    MANIFEST_UDF_VERSION. The schema is created if it doesn't exist.
+
+    By default, the UDF is called for nproc groups of generated rows, assuming
+    the groups to be spread over all nodes. This is not guaranteed, some nodes
+    may be probed multiple times and others not at all. With the option
+    one_probe_per_node, the rows are instead taken from a table, next to the
+    UDF script, holding rows on each node. The UDF is called once per node,
+    grouping by IPROC(). Nodes confirmed by an attempt are not probed again.
+
+    Multiple archives can be validated at once, see verify_archives().
+
+    With the option long_poll, the UDF itself waits on each node for the
+    MANIFEST_FILE to appear, for up to the specified duration per attempt,
+    but not beyond the timeout. The UDF checks for the file every 100 ms,
+    hence the extraction is detected almost immediately, with few statements
+    sent to the database. A short polling interval is recommended in this
+    mode. The long poll applies to verify_all_nodes() and
+    verify_all_nodes_async(), and needs to stay below the query timeout of
+    the pyexasol connection.
     """
 
     def __init__(
@@ -54,20 +247,139 @@ class ExtractValidator:
         timeout: timedelta,
         interval: timedelta = timedelta(seconds=30),
         callback: Callable[[int, list[int]], None] | None = None,
+        polling: PollingStrategy | None = None,
+        udf_schema: str | None = None,
+        one_probe_per_node: bool = False,
+        long_poll: timedelta | None = None,
+        listener: Callable[[ProbeEvent], None] | None = None,
     ) -> None:
         self._pyexasol_conn = pyexasol_connection
         self._timeout = timeout
-        self._interval = interval
+        self._polling = polling if polling else FixedPolling(interval)
         self._callback = callback if callback else lambda x, y: None
+        self._udf_schema = udf_schema
+        self._installed_udfs: set[str] = set()
+        self._one_probe_per_node = one_probe_per_node
+        self._long_poll = long_poll
+        self._listener = listener
+
+    @property
+    def udf_schema(self) -> str | None:
+        return self._udf_schema
+
+    def _per_node(self, per_node: bool | None) -> bool:
+        """
+        Tells whether the UDF is called once per node, via the node table. By
+        default this depends on the option one_probe_per_node.
+        """
+        return self._one_probe_per_node if per_node is None else per_node
+
+    def _retrying(self, timeout: timedelta) -> Retrying:
+        return Retrying(
+            wait=self._polling,
+            stop=stop_after_delay(timeout),
+            retry=_RETRY_UNLESS_ABORTED,
+            reraise=True,
+        )
+
+    def _async_retrying(self, timeout: timedelta) -> AsyncRetrying:
+        return AsyncRetrying(
+            wait=self._polling,
+            stop=stop_after_delay(timeout),
+            retry=_RETRY_UNLESS_ABORTED,
+            reraise=True,
+        )
 
-    def _create_manifest_udf_with_retry(self, language_alias: str, udf_name: str):
-        for attempt in Retrying(
-            wait=wait_fixed(self._interval), stop=stop_after_delay(self._timeout), reraise=True
-        ):
-            with attempt:
-                self._create_manifest_udf(language_alias, udf_name)
+    def _manifest_udf_name(
+        self, schema: str, language_alias: str, udf: UdfDefinition = _MANIFEST_UDF
+    ) -> str:
+        if self._udf_schema:
+            return _persistent_udf_name(self._udf_schema, language_alias, udf.kind)
+        return _udf_name(schema, language_alias, udf.kind)
 
-    def _create_manifest_udf(self, language_alias: str, udf_name: str):
+    def _create_manifest_udf_with_retry(
+        self,
+        language_alias: str,
+        udf_name: str,
+        nproc: int,
+        udf: UdfDefinition = _MANIFEST_UDF,
+        per_node: bool | None = None,
+    ):
+        for attempt in self._retrying(self._timeout):
+            with attempt, _fail_fast():
+                self._prepare_manifest_udf(language_alias, udf_name, nproc, udf, per_node)
+
+    def _prepare_manifest_udf(
+        self,
+        language_alias: str,
+        udf_name: str,
+        nproc: int,
+        udf: UdfDefinition = _MANIFEST_UDF,
+        per_node: bool | None = None,
+    ):
+        if not self._udf_schema:
+            self._create_manifest_udf(language_alias, udf_name, udf)
+            if self._per_node(per_node):
+                self._fill_node_table(_node_table_name(udf_name), nproc)
+        elif udf_name not in self._installed_udfs:
+            self._install_manifest_udf(language_alias, udf_name, udf)
+            if self._per_node(per_node):
+                self._fill_node_table(_node_table_name(udf_name), nproc)
+            self._installed_udfs.add(udf_name)
+
+    def _fill_node_table(self, table: str, nproc: int):
+        """
+        Makes sure the table holds rows on each of the nproc nodes. The rows
+        are distributed by the hash of their value, hence rows are inserted
+        until each node holds at least one of them.
+        """
+        conn = self._pyexasol_conn
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (i DECIMAL(18,0), DISTRIBUTE BY i)")
+        for _ in range(_NODE_TABLE_MAX_ROUNDS):
+            rows, nodes = conn.execute(
+                f"SELECT COUNT(*), COUNT(DISTINCT IPROC()) FROM {table}"
+            ).fetchone()
+            if nodes >= nproc:
+                return
+            conn.execute(
+                f"""
+                INSERT INTO {table}
+                SELECT i + {{offset!r}} FROM VALUES BETWEEN 1 AND {{n!r}} t(i)
+                """,
+                {"offset": rows, "n": nproc * _NODE_TABLE_ROWS_PER_NODE},
+            )
+        raise ExtractException(f"Failed to distribute the rows of table {table} to all nodes.")
+
+    def _install_manifest_udf(
+        self, language_alias: str, udf_name: str, udf: UdfDefinition = _MANIFEST_UDF
+    ):
+        """
+        Creates the persistent UDF script unless the database already holds
+        the current version.
+        """
+        script_text = self._pyexasol_conn.execute(
+            """
+            SELECT SCRIPT_TEXT FROM SYS.EXA_ALL_SCRIPTS
+            WHERE SCRIPT_SCHEMA = {schema!s} AND SCRIPT_NAME = {name!s}
+            """,
+            {
+                "schema": self._udf_schema,
+                "name": _persistent_script_name(language_alias, udf.kind),
+            },
+        ).fetchval()
+        if script_text and f"# version: {udf.version}" in script_text:
+            return
+        # Creating a schema opens it, hence the current schema is restored.
+        current_schema = get_schema(self._pyexasol_conn)
+        try:
+            self._pyexasol_conn.execute(f'CREATE SCHEMA IF NOT EXISTS "{self._udf_schema}"')
+        finally:
+            set_schema(self._pyexasol_conn, current_schema)
+        self._create_manifest_udf(language_alias, udf_name, udf)
+
+    def _create_manifest_udf(
+        self, language_alias: str, udf_name: str, udf: UdfDefinition = _MANIFEST_UDF
+    ):
         """
         The SQL statements "ALTER SESSION SET SCRIPT_LANGUAGES" and "ALTER
         SYSTEM SET SCRIPT_LANGUAGES" doe not check whether the specified
@@ -78,41 +390,211 @@ class ExtractValidator:
         message. Hence we need to use a retry here, as well.
         """
         self._pyexasol_conn.execute(dedent(f"""
-            CREATE OR REPLACE {language_alias} SET SCRIPT
-                {udf_name}(my_path VARCHAR(256))
-                EMITS (node INTEGER, manifest BOOL) AS
-            import os
-            def run(ctx):
-                ctx.emit(exa.meta.node_id, os.path.isfile(ctx.my_path))
-            /
-            """))
+                CREATE OR REPLACE {language_alias} SET SCRIPT
+                    {udf_name}({udf.parameters})
+                    EMITS ({udf.emits}) AS
+                # version: {udf.version}""") + udf.body + "/\n")
+
+    def _single_manifest_udf(self) -> UdfDefinition:
+        return _LONG_POLL_MANIFEST_UDF if self._long_poll else _MANIFEST_UDF
 
     def _check_all_nodes_with_retry(
-        self, udf_name: str, nproc: int, manifest: str, timeout: timedelta
+        self, udf_name: str, nproc: int, manifest: str, timeout: timedelta, progress: _Progress
     ):
-        for attempt in Retrying(
-            wait=wait_fixed(self._interval), stop=stop_after_delay(timeout), reraise=True
-        ):
-            with attempt:
-                self._check_all_nodes(udf_name, nproc, manifest)
+        deadline = datetime.now() + timeout
+        for attempt in self._retrying(timeout):
+            with attempt, _fail_fast():
+                self._check_all_nodes(udf_name, nproc, manifest, progress, deadline)
 
-    def _check_all_nodes(self, udf_name: str, nproc: int, manifest: str):
+    def _max_wait(self, deadline: datetime | None) -> float | None:
+        """
+        Returns the number of seconds the long-polling UDF may wait.
+        """
+        if not self._long_poll:
+            return None
+        max_wait = self._long_poll
+        if deadline:
+            max_wait = min(max_wait, deadline - datetime.now())
+        return max(max_wait.total_seconds(), 0.0)
+
+    def _check_all_nodes(
+        self,
+        udf_name: str,
+        nproc: int,
+        manifest: str,
+        progress: _Progress,
+        deadline: datetime | None = None,
+    ):
+        """
+        Probes the nodes and raises an ExtractException if any of them is still
+        pending. The nodes confirmed so far are recorded in the progress. In
+        the long-poll mode the UDF doesn't wait beyond the deadline.
+        """
+        max_wait = self._max_wait(deadline)
+        started = datetime.now()
+        pending = [node for node in range(nproc) if node not in progress.ready]
+        with self._reporting_failure(progress, nproc, pending, started):
+            if self._one_probe_per_node:
+                result = self._probe(udf_name, manifest, nproc, pending, max_wait)
+            else:
+                result = self._probe(udf_name, manifest, nproc, max_wait=max_wait)
+        latency = datetime.now() - started
+        newly_ready = progress.confirm({x[0] for x in result if x[1]})
+        if self._one_probe_per_node:
+            pending = [node for node in pending if node not in progress.ready]
+        else:
+            pending = [x[0] for x in result if not x[1] and x[0] not in progress.ready]
+        self._report(progress, nproc, pending, newly_ready, latency)
+        if len(pending) > 0:
+            raise ExtractException(
+                f"{len(pending)} of {nproc} nodes are still pending. IDs: {pending}"
+            )
+
+    def _report(
+        self,
+        progress: _Progress,
+        nproc: int,
+        pending: list[int],
+        newly_ready: dict[int, timedelta],
+        latency: timedelta,
+    ) -> None:
+        """
+        Reports the outcome of a check to the polling strategy, the callback
+        and the listener.
+        """
+        progress.attempts += 1
+        self._polling.observe(nproc, len(pending))
+        self._callback(nproc, pending)
+        if self._listener:
+            event = ProbeEvent(
+                timestamp=datetime.now(),
+                attempt=progress.attempts,
+                nproc=nproc,
+                pending=pending,
+                ready=newly_ready,
+                latency=latency,
+            )
+            self._listener(event)
+
+    @contextmanager
+    def _reporting_failure(
+        self, progress: _Progress, nproc: int, pending: list[int], started: datetime
+    ) -> Generator[None, None, None]:
+        """
+        Reports a failed check to the listener, so that the telemetry covers
+        all attempts, not only the successful ones. The error is re-raised.
+        """
+        try:
+            yield
+        except Exception as ex:
+            progress.attempts += 1
+            if self._listener:
+                event = ProbeEvent(
+                    timestamp=datetime.now(),
+                    attempt=progress.attempts,
+                    nproc=nproc,
+                    pending=pending,
+                    ready={},
+                    latency=datetime.now() - started,
+                    error=str(ex) or type(ex).__name__,
+                )
+                self._listener(event)
+            raise
+
+    def _probe(
+        self,
+        udf_name: str,
+        argument: str,
+        nproc: int,
+        nodes: list[int] | None = None,
+        max_wait: float | None = None,
+        per_node: bool | None = None,
+    ) -> list:
+        """
+        Calls the UDF on the nodes of the cluster and returns the emitted rows.
+        With the option one_probe_per_node, or if per_node is True, the UDF is
+        called once on each of the specified nodes. The max_wait is passed to
+        the long-polling UDF.
+        """
         if not re.fullmatch(r"\"\w+\"(?:\.\"\w+\")?", udf_name):
             raise ValueError(
                 "The UDF name must contain only alphanumeric characters or underscores."
             )
-        result = self._pyexasol_conn.execute(
+        params: dict[str, Any] = {"argument": argument, "nproc": nproc}
+        arguments = "{argument!s}"
+        if max_wait is not None:
+            params["max_wait"] = max_wait
+            arguments += ", {max_wait!r}"
+        if self._per_node(per_node):
+            node_list = ", ".join(str(int(node)) for node in nodes or [])
+            return self._pyexasol_conn.execute(
+                f"""
+                SELECT {udf_name}({arguments})
+                FROM {_node_table_name(udf_name)} WHERE IPROC() IN ({node_list})
+                GROUP BY IPROC()
+                """,
+                params,
+            ).fetchall()
+        return self._pyexasol_conn.execute(
             f"""
-            SELECT {udf_name}({{manifest!s}})
+            SELECT {udf_name}({arguments})
             FROM VALUES BETWEEN 1 AND {{nproc!r}} t(i) GROUP BY i
             """,
-            {"manifest": manifest, "nproc": nproc},
+            params,
         ).fetchall()
-        pending = [x[0] for x in result if not x[1]]
-        self._callback(nproc, pending)
-        if len(pending) > 0:
+
+    def _check_archives(
+        self,
+        udf_name: str,
+        nproc: int,
+        readiness: dict[str, dict[int, bool]],
+        progress: _Progress,
+    ) -> None:
+        """
+        Probes the nodes for the manifests of the archives still pending and
+        updates their readiness. Raises an ExtractException if any archive is
+        still pending on any node. A node is recorded as ready in the
+        progress once all archives are extracted on it.
+        """
+        all_nodes = range(nproc)
+
+        def pending_nodes(nodes: dict[int, bool]) -> list[int]:
+            if self._one_probe_per_node:
+                return [node for node in all_nodes if not nodes.get(node)]
+            return [node for node, ready in nodes.items() if not ready]
+
+        pending = {
+            manifest: pending_nodes(nodes)
+            for manifest, nodes in readiness.items()
+            if not nodes or pending_nodes(nodes)
+        }
+        probed_nodes = sorted({node for nodes in pending.values() for node in nodes})
+        started = datetime.now()
+        pending_nodes_before = [node for node in all_nodes if node not in progress.ready]
+        with self._reporting_failure(progress, nproc, pending_nodes_before, started):
+            result = self._probe(udf_name, "\n".join(pending), nproc, probed_nodes)
+        latency = datetime.now() - started
+        for node, manifest, ready in result:
+            nodes = readiness[manifest]
+            nodes[node] = nodes.get(node, False) or bool(ready)
+
+        pending = {
+            manifest: pending_nodes(nodes)
+            for manifest, nodes in readiness.items()
+            if pending_nodes(nodes)
+        }
+        pending_node_ids = sorted({node for nodes in pending.values() for node in nodes})
+        if self._one_probe_per_node:
+            seen_nodes = set(all_nodes)
+        else:
+            seen_nodes = {node for nodes in readiness.values() for node in nodes}
+        newly_ready = progress.confirm(seen_nodes - set(pending_node_ids))
+        self._report(progress, nproc, pending_node_ids, newly_ready, latency)
+        if pending:
             raise ExtractException(
-                f"{len(pending)} of {nproc} nodes are still pending. IDs: {pending}"
+                f"{len(pending)} of {len(readiness)} archives are still pending "
+                f"on nodes {pending_node_ids}.",
+                readiness,
             )
 
     def verify_all_nodes(
@@ -127,13 +609,159 @@ class ExtractValidator:
         yet.
         """
         manifest = f"{bfs_archive_path.as_udf_path()}/{MANIFEST_FILE}"
-        nproc = self._pyexasol_conn.execute("SELECT nproc()").fetchone()[0]
-        udf_name = _udf_name(schema, language_alias)
-        start = datetime.now()
+        nproc = self._nproc()
+        udf = self._single_manifest_udf()
+        udf_name = self._manifest_udf_name(schema, language_alias, udf)
+        self._polling.reset()
+        progress = _Progress()
         try:
-            self._create_manifest_udf_with_retry(language_alias, udf_name)
-            elapsed = datetime.now() - start
+            self._create_manifest_udf_with_retry(language_alias, udf_name, nproc, udf)
+            elapsed = datetime.now() - progress.start
             remaining = self._timeout - elapsed
-            self._check_all_nodes_with_retry(udf_name, nproc, manifest, remaining)
+            self._check_all_nodes_with_retry(udf_name, nproc, manifest, remaining, progress)
         finally:
+            self._drop_udf(udf_name)
+
+    def verify_archives(
+        self,
+        schema: str,
+        language_alias: str,
+        bfs_archive_paths: list[bfs.path.PathLike],
+    ) -> dict[str, dict[int, bool]]:
+        """
+        Verify if all the given archives were extracted on all nodes
+        successfully. All manifests are checked by a single UDF call per node
+        and attempt, using the language specified by language_alias. The
+        archives themselves may be used by different language aliases.
+
+        Returns the readiness matrix, i.e. for the UDF path of each archive,
+        the IDs of the probed nodes mapped to whether the archive is extracted
+        on the node.
+
+        Raise an ExtractException if after the configured timeout there are
+        still archives pending. The exception provides the readiness matrix.
+        """
+        archives = {
+            f"{path.as_udf_path()}/{MANIFEST_FILE}": path.as_udf_path()
+            for path in bfs_archive_paths
+        }
+        readiness: dict[str, dict[int, bool]] = {manifest: {} for manifest in archives}
+        nproc = self._nproc()
+        udf = _BATCH_MANIFEST_UDF
+        udf_name = self._manifest_udf_name(schema, language_alias, udf)
+        self._polling.reset()
+        progress = _Progress()
+
+        def archive_readiness() -> dict[str, dict[int, bool]]:
+            return {archives[manifest]: nodes for manifest, nodes in readiness.items()}
+
+        try:
+            self._create_manifest_udf_with_retry(language_alias, udf_name, nproc, udf)
+            remaining = self._timeout - (datetime.now() - progress.start)
+            for attempt in self._retrying(remaining):
+                with attempt, _fail_fast():
+                    self._check_archives(udf_name, nproc, readiness, progress)
+        except ExtractAbortedException:
+            raise
+        except ExtractException as ex:
+            raise ExtractException(str(ex), archive_readiness()) from ex
+        finally:
+            self._drop_udf(udf_name)
+        return archive_readiness()
+
+    @contextmanager
+    def _installed_udf(
+        self, schema: str, language_alias: str, udf: UdfDefinition, per_node: bool | None = None
+    ) -> Generator[tuple[str, int], None, None]:
+        """
+        Creates the specified UDF, with retries until the timeout, and provides its
+        name and the number of nodes. A temporary UDF is dropped afterwards.
+        """
+        nproc = self._nproc()
+        udf_name = self._manifest_udf_name(schema, language_alias, udf)
+        try:
+            self._create_manifest_udf_with_retry(language_alias, udf_name, nproc, udf, per_node)
+            yield udf_name, nproc
+        finally:
+            self._drop_udf(udf_name, per_node)
+
+    @contextmanager
+    def node_udf(
+        self, schema: str, language_alias: str, udf: UdfDefinition
+    ) -> Generator[Callable[[str], list], None, None]:
+        """
+        Creates the specified UDF and provides a function calling it exactly once
+        on each node of the database cluster, with the specified argument, and
+        returning the emitted rows. The calls are distributed over the nodes by
+        a table holding rows on each node, regardless of the option
+        one_probe_per_node. The UDF is created with retries until the timeout,
+        a temporary UDF is dropped afterwards.
+
+        The UDF is created in the specified schema, or in the udf_schema of the
+        validator. It must take a single parameter.
+        """
+        with self._installed_udf(schema, language_alias, udf, per_node=True) as (udf_name, nproc):
+            nodes = list(range(nproc))
+            yield lambda argument: self._probe(udf_name, argument, nproc, nodes, per_node=True)
+
+    def run_on_each_node(
+        self, schema: str, language_alias: str, udf: UdfDefinition, argument: str
+    ) -> list:
+        """
+        Calls the specified UDF exactly once on each node of the database
+        cluster and returns the emitted rows, see node_udf(). The call is
+        retried until the timeout, e.g. while the container is not yet
+        extracted on all nodes.
+        """
+        start = datetime.now()
+        rows: list = []
+        with self.node_udf(schema, language_alias, udf) as call_udf:
+            remaining = self._timeout - (datetime.now() - start)
+            for attempt in self._retrying(remaining):
+                with attempt, _fail_fast():
+                    rows = call_udf(argument)
+        return rows
+
+    def _nproc(self) -> int:
+        return self._pyexasol_conn.execute("SELECT nproc()").fetchone()[0]
+
+    def _drop_udf(self, udf_name: str, per_node: bool | None = None) -> None:
+        if not self._udf_schema:
             self._pyexasol_conn.execute(f"DROP SCRIPT IF EXISTS {udf_name}")
+            if self._per_node(per_node):
+                self._pyexasol_conn.execute(f"DROP TABLE IF EXISTS {_node_table_name(udf_name)}")
+
+    async def verify_all_nodes_async(
+        self, schema: str, language_alias: str, bfs_archive_path: bfs.path.PathLike
+    ) -> None:
+        """
+        Asyncio counterpart of verify_all_nodes(). The SQL statements are
+        executed in worker threads, and the waiting between the attempts
+        doesn't block the event loop.
+
+        The verification can be cancelled. A temporary UDF script is dropped in any
+        case, after the statement being executed at the time of the
+        cancellation has finished.
+        """
+        conn = self._pyexasol_conn
+        manifest = f"{bfs_archive_path.as_udf_path()}/{MANIFEST_FILE}"
+        nproc = await run_in_thread(conn, self._nproc)
+        udf = self._single_manifest_udf()
+        udf_name = self._manifest_udf_name(schema, language_alias, udf)
+        self._polling.reset()
+        progress = _Progress()
+        try:
+            async for attempt in self._async_retrying(self._timeout):
+                with attempt, _fail_fast():
+                    await run_in_thread(
+                        conn, self._prepare_manifest_udf, language_alias, udf_name, nproc, udf
+                    )
+            remaining = self._timeout - (datetime.now() - progress.start)
+            deadline = datetime.now() + remaining
+            async for attempt in self._async_retrying(remaining):
+                with attempt, _fail_fast():
+                    await run_in_thread(
+                        conn, self._check_all_nodes, udf_name, nproc, manifest, progress, deadline
+                    )
+        finally:
+            await run_in_thread(conn, self._drop_udf, udf_name)
@@ -0,0 +1,168 @@
+import logging
+from collections.abc import Callable
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from dataclasses import (
+    dataclass,
+    field,
+)
+from datetime import (
+    datetime,
+    timedelta,
+)
+from pathlib import Path
+from typing import Any
+
+import exasol.bucketfs as bfs  # type: ignore
+
+from exasol.python_extension_common.deployment.language_container_deployer import (
+    DeploymentResult,
+    LanguageContainerDeployer,
+)
+from exasol.python_extension_common.deployment.udf_warm_up import warm_up_container
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DeploymentTarget:
+    """
+    A database to deploy a language container to. The deployer holds the
+    connection to the database and the location in its BucketFS.
+    """
+
+    name: str
+    deployer: LanguageContainerDeployer
+
+
+@dataclass
+class TargetDeploymentResult:
+    """
+    Outcome of deploying a language container to a single target.
+
+    name             - Name of the target.
+    result           - Result of the deployment, None if the deployment failed.
+    error            - The exception raised during the deployment, if any.
+    upload_time      - Duration of uploading the container. Targets sharing the BucketFS
+                       share a single upload and report the same duration.
+    activation_time  - Duration of activating the container including waiting for its
+                       extraction on all nodes. The warm-up of the nodes is not included,
+                       its durations are reported in the result.
+    """
+
+    name: str
+    result: DeploymentResult | None = None
+    error: Exception | None = None
+    upload_time: timedelta = field(default_factory=timedelta)
+    activation_time: timedelta = field(default_factory=timedelta)
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+def _bucketfs_key(target: DeploymentTarget) -> Any:
+    """
+    Returns a key identifying the location of the BucketFS the target
+    deploys to. Targets with equal keys share a single upload.
+    """
+    path = target.deployer.bucketfs_path
+    if isinstance(path, bfs.path.BucketPath):
+        return str(path.bucket_api), path.as_udf_path()
+    return id(path)
+
+
+def _timed(func: Callable[[], Any]) -> tuple[Any, timedelta]:
+    start = datetime.now()
+    value = func()
+    return value, datetime.now() - start
+
+
+class FleetDeployer:
+    """
+    Deploys a language container to many databases concurrently.
+
+    The container is uploaded only once per distinct BucketFS location. Then
+    the container is activated and validated on all targets in parallel. At
+    most `max_workers` targets are processed at the same time.
+
+    If the deployer of a target has warm-up modules, the nodes of this target
+    are warmed up after the activation, see `warm_up_container`.
+
+    A failure of one target doesn't abort the deployment to the others.
+    Instead, the error is reported in the result for this target.
+    """
+
+    def __init__(self, targets: list[DeploymentTarget], max_workers: int = 8) -> None:
+        self._targets = targets
+        self._max_workers = max_workers
+
+    def run(
+        self,
+        container_file: Path,
+        bucket_file_path: str | None = None,
+        alter_system: bool = True,
+        allow_override: bool = False,
+        wait_for_completion: bool = True,
+        skip_if_identical: bool = False,
+    ) -> list[TargetDeploymentResult]:
+        """
+        Deploys the language container to all targets. Returns the results in
+        the order of the targets. See `LanguageContainerDeployer.run` for the
+        description of the parameters. The activation statements are never
+        printed.
+        """
+        bucket_path = bucket_file_path or container_file.name
+        results = [TargetDeploymentResult(target.name) for target in self._targets]
+        groups: dict[Any, list[int]] = {}
+        for index, target in enumerate(self._targets):
+            groups.setdefault(_bucketfs_key(target), []).append(index)
+
+        def upload(group: list[int]) -> tuple[bool, timedelta]:
+            deployer = self._targets[group[0]].deployer
+            return _timed(
+                lambda: deployer.upload_container(container_file, bucket_path, skip_if_identical)
+            )
+
+        def activate(index: int, uploaded: bool) -> tuple[DeploymentResult, timedelta]:
+            deployer = self._targets[index].deployer
+            result = DeploymentResult(upload_skipped=not uploaded)
+            result.system_altered, activation_time = _timed(
+                lambda: deployer.activate_and_wait(
+                    bucket_path,
+                    alter_system,
+                    allow_override,
+                    wait_for_completion and uploaded,
+                    print_activation_statements=False,
+                )
+            )
+            if deployer.warm_up_modules is not None:
+                result.warm_up_times = warm_up_container(deployer, deployer.warm_up_modules)
+            return result, activation_time
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            uploads = {executor.submit(upload, group): group for group in groups.values()}
+            activations: dict[Future, int] = {}
+            for future in as_completed(uploads):
+                group = uploads[future]
+                try:
+                    uploaded, upload_time = future.result()
+                except Exception as ex:  # pylint: disable=broad-exception-caught
+                    logger.error("Upload for %s failed: %s", results[group[0]].name, ex)
+                    for index in group:
+                        results[index].error = ex
+                    continue
+                for index in group:
+                    results[index].upload_time = upload_time
+                    activations[executor.submit(activate, index, uploaded)] = index
+            for activation in as_completed(activations):
+                result = results[activations[activation]]
+                try:
+                    result.result, result.activation_time = activation.result()
+                except Exception as ex:  # pylint: disable=broad-exception-caught
+                    logger.error("Deployment to %s failed: %s", result.name, ex)
+                    result.error = ex
+        return results
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import shlex
 import shutil
 import subprocess
 import tempfile
@@ -16,6 +17,16 @@ from exasol_integration_test_docker_environment.lib.docker.images.image_info imp
     ImageInfo,  # type: ignore
 )
 
+from exasol.python_extension_common.deployment.build_cache import BuildCache
+from exasol.python_extension_common.deployment.container_scripts.compile_bytecode import (
+    DEFAULT_MIN_COVERAGE,
+)
+
+# Directory in the flavor and in the container, holding the scripts used during the build.
+_SCRIPTS_IN_FLAVOR = Path("release") / "scripts"
+_SCRIPTS_IN_CONTAINER = "/build_tools"
+_SIZE_REPORT = "/build_info/size_report.json"
+
 
 def exclude_cuda(line: str) -> bool:
     return not line.startswith("nvidia")
@@ -51,11 +62,22 @@ def copy_slc_flavor(dest_dir: str | Path) -> None:
 
 
 class LanguageContainerBuilder:
+    """
+    Builds and exports a script language container from the standard flavor.
 
-    def __init__(self, container_name: str):
+    container_name  - Name of the flavor directory, hence of the container.
+    build_cache     - Optional cache of exported containers. If the flavor, including
+                      the requirements and the wheel, hasn't changed since a container
+                      was exported and cached, export() returns the cached container
+                      without building it, see BuildCache.
+    """
+
+    def __init__(self, container_name: str, build_cache: BuildCache | None = None):
         self.container_name = container_name
+        self.build_cache = build_cache
         self._root_path: Path | None = None
         self._output_path: Path | None = None
+        self._bytecode_optimize = 0
 
     def __enter__(self):
 
@@ -110,6 +132,90 @@ class LanguageContainerBuilder:
     def wheel_target(self) -> Path:
         return self.flavor_base / "release" / "dist"
 
+    @property
+    def release_dockerfile(self) -> Path:
+        return self.flavor_base / "release" / "Dockerfile"
+
+    def add_bytecode_compilation(
+        self, optimize: int = 0, min_coverage: float = DEFAULT_MIN_COVERAGE
+    ) -> None:
+        """
+        Adds a step to the release build, which precompiles the bytecode of the whole
+        Python environment in the container, see the script compile_bytecode.py. The
+        build fails if bytecode is missing for more than the tolerated share of the
+        source files. UDFs then import modules without compiling them first.
+
+        optimize     - Optimization level of the bytecode. It must match the level of
+                       the Python interpreter running the UDFs, i.e. 0 unless the
+                       interpreter runs with the -O option.
+        min_coverage - Min. share of the source files, for which the bytecode must exist.
+        """
+        self._bytecode_optimize = optimize
+        script = self._add_container_script("compile_bytecode.py")
+        self._add_release_command(
+            f"RUN python3.12 {script} --optimize {optimize} --min-coverage {min_coverage}"
+        )
+
+    def add_slimming(
+        self,
+        directory_patterns: list[str] | None = None,
+        file_patterns: list[str] | None = None,
+        size_budget_mb: float | None = None,
+    ) -> None:
+        """
+        Adds a step to the release build, which removes files not needed at UDF runtime
+        from the installed packages, see the script slim_site_packages.py. The "tests" and
+        "docs" directories installed by a distribution directly into site-packages, type
+        stubs and bytecode which is never loaded are always removed. Nested directories,
+        e.g. the tests of a package, are kept unless they match a directory pattern. The step
+        reports the size of each installed distribution, sorted by size, in the build
+        output and in the file /build_info/size_report.json in the container.
+
+        If the bytecode gets precompiled as well, add_bytecode_compilation should be
+        called first, so that the bytecode of its optimization level is kept.
+
+        directory_patterns - Glob patterns of further directories to remove, matched against
+                             the names of the directories at any depth.
+        file_patterns      - Glob patterns of further files to remove.
+        size_budget_mb     - If specified, the build fails if the installed packages
+                             exceed this size in megabytes after the slimming.
+        """
+        script = self._add_container_script("slim_site_packages.py")
+        options = [f"--optimize {self._bytecode_optimize}", f"--report-file {_SIZE_REPORT}"]
+        options += [
+            f"--directory-pattern {shlex.quote(pattern)}" for pattern in directory_patterns or []
+        ]
+        options += [f"--file-pattern {shlex.quote(pattern)}" for pattern in file_patterns or []]
+        if size_budget_mb is not None:
+            options.append(f"--size-budget-mb {size_budget_mb}")
+        self._add_release_command(f"RUN python3.12 {script} {' '.join(options)}")
+
+    def _add_container_script(self, script_name: str) -> str:
+        """
+        Copies the specified script from the container_scripts package to the flavor,
+        and adds the command copying it into the container to the release Dockerfile.
+        Returns the path of the script in the container.
+        """
+        script_dir = self.flavor_base / _SCRIPTS_IN_FLAVOR
+        script_dir.mkdir(parents=True, exist_ok=True)
+        files = resources.files(__package__).joinpath("container_scripts", script_name)
+        with resources.as_file(files) as script_file:
+            shutil.copyfile(script_file, script_dir / script_name)
+        path_in_container = f"{_SCRIPTS_IN_CONTAINER}/{script_name}"
+        self._add_release_command(
+            f"COPY {(_SCRIPTS_IN_FLAVOR / script_name).as_posix()} {path_in_container}"
+        )
+        return path_in_container
+
+    def _add_release_command(self, command: str) -> None:
+        """
+        Appends the specified command to the release Dockerfile.
+        """
+        content = self.release_dockerfile.read_text()
+        if not content.endswith("\n"):
+            content += "\n"
+        self.release_dockerfile.write_text(f"{content}\n{command}\n")
+
     def prepare_flavor(
         self, project_directory: str | Path, requirement_filter: Callable[[str], bool] | None = None
     ):
@@ -131,12 +237,24 @@ class LanguageContainerBuilder:
     ) -> ExportContainerResult:
         """
         Exports the container into an archive.
+
+        With a build cache, the container is taken from the cache if it holds a
+        container exported from the same flavor, otherwise the exported container
+        is added to the cache.
         """
         assert self._root_path is not None
         if not export_path:
             export_path = self._root_path / ".export"
             if not export_path.exists():
                 export_path.mkdir()
+
+        cache_key: str | None = None
+        if self.build_cache is not None:
+            cache_key = self.build_cache.key(self.flavor_path, compression_strategy)
+            cached_result = self.build_cache.get(cache_key, self.flavor_path, Path(export_path))
+            if cached_result is not None:
+                return cached_result
+
         if self._output_path is None:
             self._output_path = self._root_path / ".output"
             if not self._output_path.exists():
@@ -148,6 +266,8 @@ class LanguageContainerBuilder:
             export_path=str(export_path),
             compression_strategy=compression_strategy,
         )
+        if self.build_cache is not None and cache_key is not None:
+            self.build_cache.put(cache_key, export_result)
         return export_result
 
     def _add_requirements_to_flavor(
@@ -2,6 +2,9 @@ import logging
 import ssl
 import tempfile
 import warnings
+from collections.abc import Generator
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import timedelta
 from enum import Enum
 from pathlib import (
@@ -9,23 +12,45 @@ from pathlib import (
     PurePosixPath,
 )
 from textwrap import dedent
+from typing import (
+    BinaryIO,
+    cast,
+)
 
 import exasol.bucketfs as bfs  # type: ignore
 import pyexasol  # type: ignore
-import requests  # type: ignore
 from exasol.saas.client.api_access import (  # type: ignore
     get_connection_params,
     get_database_id,
 )
 
+from exasol.python_extension_common.deployment.container_cache import ContainerCache
+from exasol.python_extension_common.deployment.container_download import (
+    DEFAULT_CHUNK_SIZE,
+    download_container,
+    open_container_stream,
+)
+from exasol.python_extension_common.deployment.content_hash import (
+    HashingReader,
+    file_sha256,
+)
 from exasol.python_extension_common.deployment.extract_validator import ExtractValidator
+from exasol.python_extension_common.deployment.polling import AdaptivePolling
+from exasol.python_extension_common.deployment.scratch_schema_pool import (
+    ScratchSchemaPool,
+)
+from exasol.python_extension_common.deployment.script_languages import ScriptLanguages
 from exasol.python_extension_common.deployment.temp_schema import (
     get_schema,
     temp_schema,
 )
+from exasol.python_extension_common.deployment.udf_warm_up import warm_up_container
 
 logger = logging.getLogger(__name__)
 
+# Suffix of the file storing the SHA-256 hash of a container next to it in the BucketFS.
+HASH_FILE_SUFFIX = ".sha256"
+
 
 def get_websocket_sslopt(
     use_ssl_cert_validation: bool = True,
@@ -92,6 +117,24 @@ def get_language_settings(
     return result[0][0]
 
 
+def get_all_language_settings(
+    pyexasol_conn: pyexasol.ExaConnection,
+) -> dict[LanguageActivationLevel, str]:
+    """
+    Reads the current language settings at both levels in a single query.
+
+    pyexasol_conn    - Opened database connection.
+    """
+    result = pyexasol_conn.execute(
+        """SELECT "SYSTEM_VALUE", "SESSION_VALUE" FROM SYS.EXA_PARAMETERS WHERE
+        PARAMETER_NAME='SCRIPT_LANGUAGES'"""
+    ).fetchall()
+    return {
+        LanguageActivationLevel.System: result[0][0],
+        LanguageActivationLevel.Session: result[0][1],
+    }
+
+
 def get_udf_path(bucket_base_path: bfs.path.PathLike, bucket_file: str) -> PurePosixPath:
     """
     Returns the path of the specified file in a bucket, as it's seen from a UDF
@@ -104,6 +147,29 @@ def get_udf_path(bucket_base_path: bfs.path.PathLike, bucket_file: str) -> PureP
     return PurePosixPath(file_path.as_udf_path())
 
 
+@dataclass
+class DeploymentResult:
+    """
+    Outcome of deploying a language container.
+
+    upload_skipped   - True if the upload was skipped as the BucketFS already held
+                       an identical container.
+    system_altered   - True if ALTER SYSTEM SET SCRIPT_LANGUAGES was executed. False if
+                       the activation at the System level was not requested or was
+                       already in effect.
+    warm_up_times    - The IDs of the nodes mapped to their warm-up time, if the deployer
+                       warmed up the nodes, see warm_up_container.
+    """
+
+    upload_skipped: bool = False
+    system_altered: bool = False
+    warm_up_times: dict[int, timedelta] | None = None
+
+
+def _activation_command(alter_type: LanguageActivationLevel, settings: ScriptLanguages) -> str:
+    return f"ALTER {alter_type.value} SET SCRIPT_LANGUAGES={settings.to_sql_literal()};"
+
+
 def display_extract_progress(n: int, pending: list[int]):
     logger.info(f"Verify extraction: {len(pending)} of {n} nodes pending, IDs: {pending}")
 
@@ -117,19 +183,27 @@ class LanguageContainerDeployer:
         bucketfs_path: bfs.path.PathLike,
         extract_validator: ExtractValidator | None = None,
         udf_client_binary: str = "exaudfclient",
+        container_cache: ContainerCache | None = None,
+        schema_pool: ScratchSchemaPool | None = None,
+        warm_up_modules: list[str] | None = None,
     ) -> None:
 
         self._bucketfs_path = bucketfs_path
         self._language_alias = language_alias
         self._pyexasol_conn = pyexasol_connection
         self._udf_client_binary = udf_client_binary
+        self._container_cache = container_cache
+        self._schema_pool = schema_pool
+        self._warm_up_modules = warm_up_modules
+        # Snapshot of the language settings, only held during a deployment.
+        self._language_settings: dict[LanguageActivationLevel, str] | None = None
         if extract_validator:
             self._extract_validator = extract_validator
         else:
             self._extract_validator = ExtractValidator(
                 pyexasol_connection,
                 timeout=timedelta(minutes=10),
-                interval=timedelta(seconds=30),
+                polling=AdaptivePolling(maximum=timedelta(seconds=30)),
             )
         logger.debug("Init %s", LanguageContainerDeployer.__name__)
 
@@ -137,6 +211,34 @@ class LanguageContainerDeployer:
     def pyexasol_connection(self) -> pyexasol.ExaConnection:
         return self._pyexasol_conn
 
+    @property
+    def bucketfs_path(self) -> bfs.path.PathLike:
+        return self._bucketfs_path
+
+    @property
+    def language_alias(self) -> str:
+        return self._language_alias
+
+    @property
+    def extract_validator(self) -> ExtractValidator:
+        return self._extract_validator
+
+    @property
+    def container_cache(self) -> ContainerCache | None:
+        return self._container_cache
+
+    @property
+    def schema_pool(self) -> ScratchSchemaPool | None:
+        return self._schema_pool
+
+    @property
+    def warm_up_modules(self) -> list[str] | None:
+        return self._warm_up_modules
+
+    @property
+    def udf_client_binary(self) -> str:
+        return self._udf_client_binary
+
     def download_and_run(
         self,
         url: str,
@@ -145,10 +247,18 @@ class LanguageContainerDeployer:
         allow_override: bool = False,
         wait_for_completion: bool = True,
         print_activation_statements: bool = True,
-    ) -> None:
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        stream_to_bucketfs: bool = False,
+        connections: int = 1,
+        skip_if_identical: bool = False,
+    ) -> DeploymentResult:
         """
         Downloads the language container from the provided url to a temporary file and then deploys it.
         See docstring on the `run` method for details on what is involved in the deployment.
+        If the deployer has a container cache, the container is taken from the cache instead,
+        downloading it only if the cache doesn't hold an up-to-date copy.
+        Optionally, the container can be piped directly from the url into the BucketFS,
+        without using a temporary file or the cache.
 
         url              - Address where the container will be downloaded from.
         bucket_file_path - Path within the designated bucket where the container should be uploaded.
@@ -158,25 +268,64 @@ class LanguageContainerDeployer:
         wait_for_completion - If True will wait until the language container becomes operational.
         print_activation_statements - If True and alter_system is False,
                                       it will print the ALTER SESSION command to stdout.
+        chunk_size       - Max. number of bytes held in memory at once while downloading the container.
+        stream_to_bucketfs - If True the download will be piped directly into the BucketFS.
+                           The download and the upload will overlap in time and no local disk
+                           space will be used.
+        connections      - Number of byte ranges of the container downloaded concurrently. Only used
+                           when downloading to a temporary file. An interrupted download will be
+                           resumed, if the server supports range requests.
+        skip_if_identical - See the `run` method. When streaming to the BucketFS the upload cannot
+                           be skipped, but the hash of the uploaded container is stored nevertheless.
         """
 
+        if stream_to_bucketfs:
+            with open_container_stream(url, chunk_size) as stream:
+                self._write_container(stream, bucket_file_path, skip_if_identical)
+            logging.debug("Container is streamed to bucketfs")
+            result = DeploymentResult()
+            result.system_altered = self.activate_and_wait(
+                bucket_file_path,
+                alter_system,
+                allow_override,
+                wait_for_completion,
+                print_activation_statements,
+            )
+            if self._warm_up_modules is not None:
+                result.warm_up_times = warm_up_container(self, self._warm_up_modules)
+            return result
+
+        if self._container_cache is not None:
+            with self._container_cache.get(url) as container:
+                return self.run(
+                    Path(container.name),
+                    bucket_file_path,
+                    alter_system,
+                    allow_override,
+                    wait_for_completion,
+                    print_activation_statements,
+                    skip_if_identical,
+                )
+
         with tempfile.NamedTemporaryFile() as tmp_file:
-            response = requests.get(url, stream=True, timeout=300)
-            response.raise_for_status()
-            tmp_file.write(response.content)
+            download_container(url, tmp_file, chunk_size, connections)
 
-            self.run(
+            return self.run(
                 Path(tmp_file.name),
                 bucket_file_path,
                 alter_system,
                 allow_override,
                 wait_for_completion,
                 print_activation_statements,
+                skip_if_identical,
             )
 
     def _upload_path(self, bucket_file_path: str | None) -> bfs.path.PathLike:
         return self._bucketfs_path / bucket_file_path
 
+    def _hash_path(self, bucket_file_path: str | None) -> bfs.path.PathLike:
+        return self._bucketfs_path / f"{bucket_file_path}{HASH_FILE_SUFFIX}"
+
     def run(
         self,
         container_file: Path | None = None,
@@ -185,7 +334,8 @@ class LanguageContainerDeployer:
         allow_override: bool = False,
         wait_for_completion: bool = True,
         print_activation_statements: bool = True,
-    ) -> None:
+        skip_if_identical: bool = False,
+    ) -> DeploymentResult:
         """
         Deploys the language container. This includes two steps, both of which are optional:
         - Uploading the container into the database. This step can be skipped if the container
@@ -193,6 +343,8 @@ class LanguageContainerDeployer:
         - Activating the container. In case the container does not get activated at the System
         level, two alternative activation SQL commands (one for the System and one for the Session
         levels) will be printed on the console.
+        If the deployer has warm-up modules, the nodes are warmed up after the activation, see
+        `warm_up_container`.
 
         container_file   - Path of the container tar.gz file in a local file system.
                            If not provided the container is assumed to be uploaded already.
@@ -207,6 +359,9 @@ class LanguageContainerDeployer:
                             The calling user should have a permission to create schema.
         print_activation_statements - If True and alter_system is False,
                                       it will print the ALTER SESSION command to stdout.
+        skip_if_identical - If True the upload and the waiting for the extraction will be skipped
+                           if the BucketFS already holds an identical container, see the
+                           `upload_container` method.
         """
 
         if not bucket_file_path:
@@ -214,66 +369,218 @@ class LanguageContainerDeployer:
                 raise ValueError("Either a container file or a bucket file path must be specified.")
             bucket_file_path = container_file.name
 
+        result = DeploymentResult()
         if container_file:
-            self.upload_container(container_file, bucket_file_path)
+            result.upload_skipped = not self.upload_container(
+                container_file, bucket_file_path, skip_if_identical
+            )
+
+        result.system_altered = self.activate_and_wait(
+            bucket_file_path,
+            alter_system,
+            allow_override,
+            bool(container_file) and not result.upload_skipped and wait_for_completion,
+            print_activation_statements,
+        )
+        if self._warm_up_modules is not None:
+            result.warm_up_times = warm_up_container(self, self._warm_up_modules)
+        return result
 
+    def activate_and_wait(
+        self,
+        bucket_file_path: str,
+        alter_system: bool,
+        allow_override: bool,
+        wait_for_completion: bool,
+        print_activation_statements: bool,
+    ) -> bool:
+        """
+        Activates the container already uploaded to the BucketFS and optionally
+        waits until it gets extracted on all nodes. See the `run` method for
+        the description of the parameters. Unlike `run`, this method waits for
+        the completion also if the container has been uploaded separately.
+
+        The current language settings are read once and reused for generating
+        all activation commands, until the deployer alters them.
+
+        Returns True if ALTER SYSTEM was executed, see `DeploymentResult.system_altered`.
+        """
+        with self._language_settings_snapshot():
+            return self._activate_and_wait(
+                bucket_file_path,
+                alter_system,
+                allow_override,
+                wait_for_completion,
+                print_activation_statements,
+            )
+
+    @contextmanager
+    def _language_settings_snapshot(self) -> Generator[None, None, None]:
+        self._language_settings = {}
+        try:
+            yield
+        finally:
+            self._language_settings = None
+
+    def _get_language_settings(self, alter_type: LanguageActivationLevel) -> str:
+        """
+        Returns the current language settings at the specified level. Outside
+        a deployment the settings are always read from the database.
+        """
+        if not self._language_settings:
+            settings = get_all_language_settings(self._pyexasol_conn)
+            if self._language_settings is not None:
+                self._language_settings.update(settings)
+            return settings[alter_type]
+        return self._language_settings[alter_type]
+
+    def _activate_and_wait(
+        self,
+        bucket_file_path: str,
+        alter_system: bool,
+        allow_override: bool,
+        wait_for_completion: bool,
+        print_activation_statements: bool,
+    ) -> bool:
         # Activate the language container.
+        system_altered = False
         if alter_system:
-            self.activate_container(
-                bucket_file_path, LanguageActivationLevel.System, allow_override
+            system_altered = bool(
+                self.activate_container(
+                    bucket_file_path, LanguageActivationLevel.System, allow_override
+                )
             )
         self.activate_container(bucket_file_path, LanguageActivationLevel.Session, allow_override)
 
         # Optionally wait until the container is extracted on all nodes of the
         # database cluster.
-        if container_file and wait_for_completion:
+        if wait_for_completion:
             self._wait_container_upload_completion(bucket_file_path)
 
         if not alter_system and print_activation_statements:
-            message = dedent(f"""
-                In SQL, you can activate the SLC
-                by using the following statements:
+            self.print_activation_commands(bucket_file_path)
+        return system_altered
+
+    def print_activation_commands(self, bucket_file_path: str) -> None:
+        """
+        Prints the SQL statements activating the container for the session and
+        on the system.
+        """
+        message = dedent(f"""
+            In SQL, you can activate the SLC
+            by using the following statements:
 
-                To activate the SLC only for the current session:
-                {self.generate_activation_command(bucket_file_path, LanguageActivationLevel.Session, True)}
+            To activate the SLC only for the current session:
+            {self.generate_activation_command(bucket_file_path, LanguageActivationLevel.Session, True)}
 
-                To activate the SLC on the system:
-                {self.generate_activation_command(bucket_file_path, LanguageActivationLevel.System, True)}
-                """)
-            print(message)
+            To activate the SLC on the system:
+            {self.generate_activation_command(bucket_file_path, LanguageActivationLevel.System, True)}
+            """)
+        print(message)
 
-    def upload_container(self, container_file: Path, bucket_file_path: str | None = None) -> None:
+    def upload_container(
+        self,
+        container_file: Path,
+        bucket_file_path: str | None = None,
+        skip_if_identical: bool = False,
+        sha256: str | None = None,
+    ) -> bool:
         """
         Upload the language container to the BucketFS.
 
+        Returns False if the upload was skipped, True otherwise.
+
         container_file   - Path of the container tar.gz file in a local file system.
         bucket_file_path - Path within the designated bucket where the container should be uploaded.
+        skip_if_identical - If True the SHA-256 hash of the container will be stored in the BucketFS
+                           next to the container, in a file with the suffix ".sha256". The upload
+                           will be skipped if the stored hash matches the hash of the container file.
+        sha256           - The SHA-256 hash of the container file, if it is already known. Otherwise,
+                           it gets computed if needed.
         """
         if not container_file.is_file():
             raise RuntimeError(f"Container file {container_file} " f"is not a file.")
+        if skip_if_identical:
+            sha256 = sha256 or file_sha256(container_file)
+            if sha256 == self._read_container_hash(bucket_file_path):
+                logging.info(
+                    "Skipping the upload, the BucketFS already holds an identical container."
+                )
+                return False
         with open(container_file, "br") as f:
-            self._upload_path(bucket_file_path).write(f)
+            self._write_container(f, bucket_file_path, skip_if_identical, sha256)
         logging.debug("Container is uploaded to bucketfs")
+        return True
+
+    def _read_container_hash(self, bucket_file_path: str | None) -> str | None:
+        """
+        Returns the hash stored next to the container in the BucketFS, if both
+        the container and the hash exist.
+        """
+        hash_path = self._hash_path(bucket_file_path)
+        if not (hash_path.exists() and self._upload_path(bucket_file_path).exists()):
+            return None
+        return b"".join(hash_path.read()).decode("utf-8").strip()
+
+    def _write_container(
+        self,
+        stream: BinaryIO,
+        bucket_file_path: str | None,
+        store_hash: bool,
+        sha256: str | None = None,
+    ) -> None:
+        """
+        Writes the container to the BucketFS, optionally storing its hash. The
+        hash is computed while streaming, unless it is already known. A
+        previously stored hash gets removed first, so that it can never refer
+        to an incompletely uploaded container.
+        """
+        if not store_hash:
+            self._upload_path(bucket_file_path).write(stream)
+            return
+        hash_path = self._hash_path(bucket_file_path)
+        if hash_path.exists():
+            hash_path.rm()
+        if sha256 is None:
+            hashing_stream = HashingReader(stream)
+            self._upload_path(bucket_file_path).write(cast(BinaryIO, hashing_stream))
+            sha256 = hashing_stream.hexdigest()
+        else:
+            self._upload_path(bucket_file_path).write(stream)
+        hash_path.write(sha256.encode("utf-8"))
 
     def activate_container(
         self,
         bucket_file_path: str,
         alter_type: LanguageActivationLevel = LanguageActivationLevel.Session,
         allow_override: bool = False,
-    ) -> None:
+    ) -> bool:
         """
         Activates the language container at the required level.
 
+        At the System level the ALTER statement is skipped, if the current settings
+        already contain the requested activation. Returns True if the statement was
+        executed, False if it was skipped. Activating the container the alias already
+        refers to is not an override, hence it doesn't require allow_override.
+
         bucket_file_path - Path within the designated bucket where the container is uploaded.
         alter_type       - Language activation level, defaults to the SESSION.
         allow_override   - If True the activation of a language container with the same alias will be overriden,
                            otherwise a RuntimeException will be thrown.
         """
-        alter_command = self.generate_activation_command(
-            bucket_file_path, alter_type, allow_override
+        prev_lang_settings = self._get_language_settings(alter_type)
+        new_settings = self._update_previous_language_settings(
+            prev_lang_settings, allow_override, bucket_file_path
         )
+        if alter_type == LanguageActivationLevel.System and str(new_settings) == prev_lang_settings:
+            logging.info("Skipping ALTER SYSTEM, the language container is already activated.")
+            return False
+        alter_command = _activation_command(alter_type, new_settings)
         self._pyexasol_conn.execute(alter_command)
+        if self._language_settings:
+            self._language_settings.clear()
         logging.debug(alter_command)
+        return True
 
     def generate_activation_command(
         self,
@@ -291,36 +598,53 @@ class LanguageContainerDeployer:
         allow_override   - If True the activation of a language container with the same alias will be overriden,
                            otherwise a RuntimeException will be thrown.
         """
-        path_in_udf = get_udf_path(self._bucketfs_path, bucket_file_path)
         new_settings = self._update_previous_language_settings(
-            alter_type, allow_override, path_in_udf
+            self._get_language_settings(alter_type), allow_override, bucket_file_path
         )
-        alter_command = f"ALTER {alter_type.value} SET SCRIPT_LANGUAGES='{new_settings}';"
-        return alter_command
+        return _activation_command(alter_type, new_settings)
 
     def _wait_container_upload_completion(self, bucket_file_path: str):
         """
         The function waits till the container is fully uploaded and operational on all nodes.
         It creates and then subsequently deletes a simple UDF that checks for the presence of
-        a certain file. This UDF is created in the current schema of the pyexasol connection
-        if one is open. Otherwise, a temporary schema will be created.
+        a certain file, in the schema provided by `udf_schema`.
         """
         upload_path = self._upload_path(bucket_file_path)
-        schema = get_schema(self._pyexasol_conn)
-        if schema:
+        with self.udf_schema() as schema:
             self._extract_validator.verify_all_nodes(schema, self._language_alias, upload_path)
+
+    @contextmanager
+    def udf_schema(self) -> Generator[str, None, None]:
+        """
+        Provides the schema for the UDFs created by the deployer. This is the current schema
+        of the pyexasol connection if one is open. Otherwise, a schema is leased from the
+        schema pool of the deployer, if it has one, or a temporary schema will be created.
+        No schema is needed if the extract validator uses a persistent UDF in a dedicated
+        schema.
+        """
+        schema = self._extract_validator.udf_schema or get_schema(self._pyexasol_conn)
+        if schema:
+            yield schema
+            return
+        if self._schema_pool:
+            scratch_schema = self._schema_pool.lease(self._pyexasol_conn)
         else:
-            with temp_schema(self._pyexasol_conn) as schema:
-                self._extract_validator.verify_all_nodes(schema, self._language_alias, upload_path)
+            scratch_schema = temp_schema(self._pyexasol_conn)
+        with scratch_schema as schema:
+            yield schema
 
     def _update_previous_language_settings(
-        self, alter_type: LanguageActivationLevel, allow_override: bool, path_in_udf: PurePosixPath
-    ) -> str:
-        prev_lang_settings = get_language_settings(self._pyexasol_conn, alter_type)
-        prev_lang_aliases = prev_lang_settings.split(" ")
-        self._check_if_requested_language_alias_already_exists(allow_override, prev_lang_aliases)
-        new_definitions_str = self._generate_new_language_settings(path_in_udf, prev_lang_aliases)
-        return new_definitions_str
+        self, prev_lang_settings: str, allow_override: bool, bucket_file_path: str
+    ) -> ScriptLanguages:
+        path_in_udf = get_udf_path(self._bucketfs_path, bucket_file_path)
+        languages = ScriptLanguages.parse(prev_lang_settings)
+        url = self._language_url(path_in_udf)
+        # Activating the same container again leaves the settings unchanged, it
+        # doesn't override the alias.
+        if languages.get(self._language_alias) != url:
+            self._check_if_requested_language_alias_already_exists(allow_override, languages)
+        languages[self._language_alias] = url
+        return languages
 
     def get_language_definition(self, bucket_file_path: str):
         """
@@ -329,36 +653,20 @@ class LanguageContainerDeployer:
         bucket_file_path - Path within the designated bucket where the container is uploaded.
         """
         path_in_udf = get_udf_path(self._bucketfs_path, bucket_file_path)
-        result = self._generate_new_language_settings(path_in_udf=path_in_udf, prev_lang_aliases=[])
-        return result
+        return f"{self._language_alias}={self._language_url(path_in_udf)}"
 
-    def _generate_new_language_settings(
-        self, path_in_udf: PurePosixPath, prev_lang_aliases: list[str]
-    ) -> str:
-        other_definitions = [
-            alias_definition
-            for alias_definition in prev_lang_aliases
-            if not alias_definition.startswith(self._language_alias + "=")
-        ]
+    def _language_url(self, path_in_udf: PurePosixPath) -> str:
         path_in_udf_without_buckets = PurePosixPath(*path_in_udf.parts[2:])
-        new_language_alias_definition = (
-            f"{self._language_alias}=localzmq+protobuf:///"
+        return (
+            f"localzmq+protobuf:///"
             f"{path_in_udf_without_buckets}?lang=python#"
             f"{path_in_udf}/exaudf/{self._udf_client_binary}"
         )
-        new_definitions = other_definitions + [new_language_alias_definition]
-        new_definitions_str = " ".join(new_definitions)
-        return new_definitions_str
 
     def _check_if_requested_language_alias_already_exists(
-        self, allow_override: bool, prev_lang_aliases: list[str]
+        self, allow_override: bool, languages: ScriptLanguages
     ) -> None:
-        definition_for_requested_alias = [
-            alias_definition
-            for alias_definition in prev_lang_aliases
-            if alias_definition.startswith(self._language_alias + "=")
-        ]
-        if not len(definition_for_requested_alias) == 0:
+        if self._language_alias in languages:
             warning_message = (
                 f"The requested language alias {self._language_alias} is already in use."
             )
@@ -480,7 +788,9 @@ class LanguageContainerDeployer:
         )
 
         callback = display_extract_progress if display_progress else None
-        extract_validator = ExtractValidator(pyexasol_conn, deploy_timeout, callback=callback)
+        extract_validator = ExtractValidator(
+            pyexasol_conn, deploy_timeout, callback=callback, polling=AdaptivePolling()
+        )
         return cls(
             pyexasol_conn, language_alias, bucketfs_path, extract_validator, udf_client_binary
         )
@@ -0,0 +1,106 @@
+import math
+import random
+import time
+from datetime import timedelta
+
+from tenacity import RetryCallState
+from tenacity.wait import wait_base
+
+
+class PollingStrategy(wait_base):
+    """
+    A tenacity wait strategy for polling the progress of an operation, e.g.
+    the extraction of a language container on the nodes of a database
+    cluster.
+
+    Besides the retry state, a strategy can take the observed progress into
+    account. The poller reports the number of pending items after each
+    attempt by calling observe(). Before starting a new operation the poller
+    calls reset().
+    """
+
+    def reset(self) -> None:
+        pass
+
+    def observe(self, total: int, pending: int) -> None:
+        pass
+
+
+class FixedPolling(PollingStrategy):
+    """
+    Polls at a fixed interval.
+    """
+
+    def __init__(self, interval: timedelta) -> None:
+        self._interval = interval
+
+    def __call__(self, retry_state: RetryCallState) -> float:
+        return self._interval.total_seconds()
+
+
+class AdaptivePolling(PollingStrategy):
+    """
+    Starts polling quickly and then backs off exponentially, up to the
+    specified maximum interval. Each interval is randomized by the jitter,
+    i.e. a fraction of the interval, to avoid many pollers hitting the
+    database at the same time.
+
+    Once the progress has been observed at least twice, the strategy
+    estimates the remaining time from the rate at which items have been
+    completing, and waits until the estimated completion instead, bounded
+    by the initial and the maximum interval.
+
+    initial     - Interval before the second attempt.
+    maximum     - Max. interval between two attempts.
+    multiplier  - Factor by which the interval grows with each attempt.
+    jitter      - Max. fraction by which an interval is randomly shortened or prolonged.
+    """
+
+    def __init__(
+        self,
+        initial: timedelta = timedelta(seconds=1),
+        maximum: timedelta = timedelta(seconds=30),
+        multiplier: float = 2.0,
+        jitter: float = 0.1,
+    ) -> None:
+        self._initial = initial.total_seconds()
+        self._maximum = maximum.total_seconds()
+        self._multiplier = multiplier
+        self._jitter = jitter
+        # The interval stops growing once it reaches the maximum, keeping the
+        # power bounded for any number of attempts.
+        if multiplier > 1 and 0 < self._initial < self._maximum:
+            self._max_exponent = math.ceil(math.log(self._maximum / self._initial, multiplier))
+        else:
+            self._max_exponent = 0
+        self._observations: list[tuple[float, int]] = []
+
+    def reset(self) -> None:
+        self._observations = []
+
+    def observe(self, total: int, pending: int) -> None:
+        self._observations.append((time.monotonic(), pending))
+
+    def estimate(self) -> float | None:
+        """
+        Returns the estimated number of seconds until no items are pending,
+        or None if there is not enough progress for an estimate.
+        """
+        if len(self._observations) < 2:
+            return None
+        first_time, first_pending = self._observations[0]
+        last_time, last_pending = self._observations[-1]
+        completed = first_pending - last_pending
+        if completed <= 0 or last_time <= first_time:
+            return None
+        return last_pending * (last_time - first_time) / completed
+
+    def __call__(self, retry_state: RetryCallState) -> float:
+        eta = self.estimate()
+        if eta is None:
+            exponent = min(retry_state.attempt_number - 1, self._max_exponent)
+            interval = self._initial * self._multiplier**exponent
+        else:
+            interval = max(self._initial, eta)
+        interval *= random.uniform(1 - self._jitter, 1 + self._jitter)
+        return min(self._maximum, interval)
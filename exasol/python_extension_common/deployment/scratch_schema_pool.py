@@ -0,0 +1,165 @@
+import threading
+from collections.abc import (
+    AsyncGenerator,
+    Generator,
+)
+from contextlib import (
+    asynccontextmanager,
+    contextmanager,
+)
+
+import pyexasol  # type: ignore
+
+from exasol.python_extension_common.connections.async_connection import run_in_thread
+from exasol.python_extension_common.deployment.temp_objects import is_own_temp_object
+from exasol.python_extension_common.deployment.temp_schema import (
+    get_schema,
+    set_schema,
+    temp_schema,
+    temp_schema_async,
+)
+
+DEFAULT_SCRATCH_SCHEMA_PREFIX = "PEC_SCRATCH"
+
+# Dependent objects are dropped before the objects they depend on.
+_DROP_ORDER = ["VIEW", "SCRIPT", "FUNCTION", "TABLE"]
+
+
+def _schema_objects(conn: pyexasol.ExaConnection, schema: str) -> set[tuple[str, str]]:
+    """
+    Returns the type and name of each object in the specified schema.
+    """
+    rows = conn.execute(
+        """
+        SELECT OBJECT_TYPE, OBJECT_NAME FROM SYS.EXA_ALL_OBJECTS
+        WHERE ROOT_TYPE = 'SCHEMA' AND ROOT_NAME = {schema!s}
+        """,
+        {"schema": schema},
+    ).fetchall()
+    return {(object_type, name) for object_type, name in rows}
+
+
+def _drop_objects(conn: pyexasol.ExaConnection, schema: str, objects: set[tuple[str, str]]) -> None:
+    def drop_order(obj: tuple[str, str]) -> int:
+        object_type, _ = obj
+        return _DROP_ORDER.index(object_type) if object_type in _DROP_ORDER else len(_DROP_ORDER)
+
+    for object_type, name in sorted(objects, key=drop_order):
+        conn.execute(f'DROP {object_type} IF EXISTS "{schema}"."{name}"')
+
+
+class ScratchSchemaPool:
+    """
+    A small pool of scratch schemas, e.g. for the UDF scripts used to
+    validate the extraction of a language container, replacing a temporary
+    schema created and dropped for each deployment.
+
+    The pool holds up to the specified number of schemas, named by the
+    prefix and an index, e.g. PEC_SCRATCH_0. A schema is created when it is
+    leased the first time, and is kept in the database afterwards. Hence,
+    subsequent processes using the same prefix reuse it, too. If all schemas
+    are leased, the lease falls back to a temporary schema.
+
+    Within a process, each schema is leased to one user at a time. When a
+    lease ends, the temporary objects created by the current process in the
+    schema during the lease are dropped, e.g. UDF scripts and node tables
+    left behind by an interrupted validation, see temp_object_name(). The
+    objects of other processes leasing the same schema concurrently are
+    kept, as are objects without the tags of a temporary object.
+
+    size    - Max. number of schemas in the pool.
+    prefix  - Prefix of the names of the schemas.
+    """
+
+    def __init__(self, size: int = 4, prefix: str = DEFAULT_SCRATCH_SCHEMA_PREFIX) -> None:
+        if size < 1:
+            raise ValueError(f"The size of the pool must be positive, got {size}.")
+        self._schemas = [f"{prefix}_{index}" for index in range(size)]
+        self._leased: set[str] = set()
+        self._created: set[str] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def schemas(self) -> list[str]:
+        return list(self._schemas)
+
+    def _acquire(self) -> str | None:
+        with self._lock:
+            for schema in self._schemas:
+                if schema not in self._leased:
+                    self._leased.add(schema)
+                    return schema
+        return None
+
+    def _release(self, schema: str) -> None:
+        with self._lock:
+            self._leased.discard(schema)
+
+    def _prepare(self, conn: pyexasol.ExaConnection, schema: str) -> set[tuple[str, str]]:
+        """
+        Creates the schema unless it has been created by the pool before, and
+        returns the objects it holds at the start of the lease. Creating a
+        schema opens it, hence the previously open schema is reopened.
+        """
+        if schema not in self._created:
+            current_schema = get_schema(conn)
+            conn.execute(f'CREATE SCHEMA IF NOT EXISTS "{schema}"')
+            set_schema(conn, current_schema)
+            self._created.add(schema)
+        return _schema_objects(conn, schema)
+
+    def _cleanup(
+        self, conn: pyexasol.ExaConnection, schema: str, existing: set[tuple[str, str]]
+    ) -> None:
+        created = _schema_objects(conn, schema) - existing
+        _drop_objects(conn, schema, {obj for obj in created if is_own_temp_object(obj[1])})
+
+    @contextmanager
+    def lease(self, conn: pyexasol.ExaConnection) -> Generator[str, None, None]:
+        """
+        A context manager leasing a schema from the pool. Returns the name of
+        the schema. The current schema of the connection is not changed.
+
+        conn    - pyexasol connection.
+        """
+        schema = self._acquire()
+        if schema is None:
+            with temp_schema(conn) as schema:
+                yield schema
+            return
+        try:
+            existing = self._prepare(conn, schema)
+        except BaseException:
+            self._release(schema)
+            raise
+        try:
+            yield schema
+        finally:
+            try:
+                self._cleanup(conn, schema, existing)
+            finally:
+                self._release(schema)
+
+    @asynccontextmanager
+    async def lease_async(self, conn: pyexasol.ExaConnection) -> AsyncGenerator[str, None]:
+        """
+        Asyncio counterpart of lease(). The SQL statements are executed in
+        worker threads, see run_in_thread.
+        """
+        schema = self._acquire()
+        if schema is None:
+            async with temp_schema_async(conn) as schema:
+                yield schema
+            return
+        try:
+            existing = await run_in_thread(conn, self._prepare, conn, schema)
+        except BaseException:
+            self._release(schema)
+            raise
+        try:
+            yield schema
+        finally:
+            try:
+                await run_in_thread(conn, self._cleanup, conn, schema, existing)
+            finally:
+                self._release(schema)
@@ -0,0 +1,77 @@
+import re
+from collections.abc import (
+    Iterator,
+    MutableMapping,
+)
+
+_ALIAS_PATTERN = re.compile(r"\w+")
+
+
+class ScriptLanguages(MutableMapping[str, str]):
+    """
+    The value of the database parameter SCRIPT_LANGUAGES, i.e. a list of
+    language definitions in the form ALIAS=URL, separated by spaces.
+
+    Maps the language aliases to their URLs, keeping the order of the
+    definitions. Replacing the URL of an existing alias keeps its position,
+    a new alias is appended at the end. Hence, converting an unchanged
+    object back to a string returns the string it was parsed from, as long
+    as it separates the definitions by single spaces.
+    """
+
+    def __init__(self, definitions: dict[str, str] | None = None) -> None:
+        self._definitions: dict[str, str] = {}
+        if definitions:
+            self.update(definitions)
+
+    @classmethod
+    def parse(cls, settings: str) -> "ScriptLanguages":
+        """
+        Parses the value of the SCRIPT_LANGUAGES parameter. If an alias is
+        defined multiple times, the last definition wins.
+        """
+        languages = cls()
+        for definition in settings.split():
+            alias, separator, url = definition.partition("=")
+            if not separator:
+                raise ValueError(f"Invalid language definition {definition!r}, expected ALIAS=URL.")
+            languages[alias] = url
+        return languages
+
+    def __getitem__(self, alias: str) -> str:
+        return self._definitions[alias]
+
+    def __setitem__(self, alias: str, url: str) -> None:
+        if not _ALIAS_PATTERN.fullmatch(alias):
+            raise ValueError(f"Invalid language alias {alias!r}.")
+        if not url or any(c.isspace() for c in url):
+            raise ValueError(f"Invalid URL {url!r} for language alias {alias}.")
+        self._definitions[alias] = url
+
+    def __delitem__(self, alias: str) -> None:
+        del self._definitions[alias]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._definitions)
+
+    def __len__(self) -> int:
+        return len(self._definitions)
+
+    def __str__(self) -> str:
+        return " ".join(f"{alias}={url}" for alias, url in self._definitions.items())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._definitions!r})"
+
+    def definition(self, alias: str) -> str:
+        """
+        Returns the language definition ALIAS=URL for the specified alias.
+        """
+        return f"{alias}={self._definitions[alias]}"
+
+    def to_sql_literal(self) -> str:
+        """
+        Returns the settings as an SQL string literal, e.g. for use in
+        ALTER SYSTEM SET SCRIPT_LANGUAGES=...
+        """
+        return "'" + str(self).replace("'", "''") + "'"
@@ -0,0 +1,108 @@
+import logging
+from pathlib import (
+    Path,
+    PurePosixPath,
+)
+
+import pyexasol  # type: ignore
+
+from exasol.python_extension_common.deployment.content_hash import file_sha256
+from exasol.python_extension_common.deployment.language_container_deployer import (
+    DeploymentResult,
+    LanguageActivationLevel,
+    LanguageContainerDeployer,
+    get_language_settings,
+)
+from exasol.python_extension_common.deployment.script_languages import ScriptLanguages
+from exasol.python_extension_common.deployment.udf_warm_up import warm_up_container
+
+
+def versioned_bucket_file_path(bucket_file_path: str, version: str) -> str:
+    """
+    Returns the path of a specific version of a container in the bucket, i.e.
+    the specified path with an additional directory named by the version,
+    e.g. "slc/<version>/container.tar.gz" for "slc/container.tar.gz".
+    """
+    path = PurePosixPath(bucket_file_path)
+    return str(path.parent / version / path.name)
+
+
+def _remove_session_language(pyexasol_conn: pyexasol.ExaConnection, language_alias: str) -> None:
+    level = LanguageActivationLevel.Session
+    languages = ScriptLanguages.parse(get_language_settings(pyexasol_conn, level))
+    if language_alias in languages:
+        del languages[language_alias]
+        pyexasol_conn.execute(
+            f"ALTER {level.value} SET SCRIPT_LANGUAGES={languages.to_sql_literal()};"
+        )
+
+
+def run_staged(
+    deployer: LanguageContainerDeployer,
+    container_file: Path,
+    bucket_file_path: str | None = None,
+    alter_system: bool = True,
+    allow_override: bool = False,
+    print_activation_statements: bool = True,
+    staging_alias: str | None = None,
+) -> DeploymentResult:
+    """
+    Deploys the language container without affecting queries which use the
+    language alias of the deployer during the deployment:
+    - The container is uploaded to a versioned path, named by the hash of the
+      container, see `versioned_bucket_file_path`. Hence, the container in use
+      is never overwritten. An identical container already stored at this path
+      is not uploaded again.
+    - The container is activated at the Session level under the staging alias,
+      and the deployer waits until it is extracted on all nodes.
+    - Only then the language alias is switched to the new container, by a
+      single ALTER SYSTEM statement, and at the Session level. The staging alias
+      is removed from the Session in any case.
+
+    Previous versions of the container are kept in the BucketFS. If the deployer
+    has warm-up modules, the nodes are warmed up after the switch.
+
+    See the `run` method of the LanguageContainerDeployer for the description
+    of the parameters.
+    staging_alias    - Language alias used while validating the extraction,
+                       by default the language alias with the suffix "_STAGING".
+    """
+    staging_alias = staging_alias or f"{deployer.language_alias}_STAGING"
+    # The hash names the version and is reused for the upload.
+    sha256 = file_sha256(container_file)
+    versioned_path = versioned_bucket_file_path(
+        bucket_file_path or container_file.name, sha256[:12]
+    )
+    result = DeploymentResult()
+    result.upload_skipped = not deployer.upload_container(
+        container_file, versioned_path, skip_if_identical=True, sha256=sha256
+    )
+    logging.info("Staging the language container %s as %s.", versioned_path, staging_alias)
+    staging_deployer = LanguageContainerDeployer(
+        deployer.pyexasol_connection,
+        staging_alias,
+        deployer.bucketfs_path,
+        deployer.extract_validator,
+        deployer.udf_client_binary,
+        schema_pool=deployer.schema_pool,
+    )
+    try:
+        staging_deployer.activate_and_wait(
+            versioned_path,
+            alter_system=False,
+            allow_override=True,
+            wait_for_completion=True,
+            print_activation_statements=False,
+        )
+        result.system_altered = deployer.activate_and_wait(
+            versioned_path,
+            alter_system,
+            allow_override,
+            False,
+            print_activation_statements,
+        )
+    finally:
+        _remove_session_language(deployer.pyexasol_connection, staging_alias)
+    if deployer.warm_up_modules is not None:
+        result.warm_up_times = warm_up_container(deployer, deployer.warm_up_modules)
+    return result
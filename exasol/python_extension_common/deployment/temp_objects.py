@@ -0,0 +1,143 @@
+import logging
+import os
+import re
+import secrets
+from dataclasses import dataclass
+from datetime import (
+    datetime,
+    timedelta,
+)
+
+import pyexasol  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# Prefix of the names of all temporary database objects, e.g. schemas and UDF
+# scripts created for validating the extraction of a language container.
+TEMP_OBJECT_PREFIX = "PEC_TMP_"
+
+# The name of a temporary object ends with its creation time, optionally
+# followed by a suffix, e.g. the node table of a UDF script.
+_TEMP_OBJECT_PATTERN = re.compile(rf"{TEMP_OBJECT_PREFIX}\w*?_(\d+)(?:_NODES)?")
+
+# Random tag of each process, keyed by the process ID, so that a forked
+# process gets a tag of its own.
+_process_tags: dict[int, str] = {}
+
+
+def process_tag() -> str:
+    """
+    Returns the random tag identifying the temporary objects created by the
+    current process.
+    """
+    return _process_tags.setdefault(os.getpid(), secrets.token_hex(4))
+
+
+def temp_object_name(name: str, created: datetime | None = None) -> str:
+    """
+    Returns the name for a temporary database object, tagged with the
+    prefix TEMP_OBJECT_PREFIX, the tag of the current process and the
+    creation time. This allows finding and dropping temporary objects left
+    behind by an interrupted process, and tells apart objects created by
+    concurrent processes in the same second.
+
+    name    - Name of the object, without tags.
+    created - Creation time, the current time by default.
+    """
+    created = created or datetime.now()
+    return f"{TEMP_OBJECT_PREFIX}{name}_{process_tag()}_{created.timestamp():.0f}"
+
+
+def is_own_temp_object(name: str) -> bool:
+    """
+    Tells if the object is a temporary object created by the current process.
+    """
+    pattern = rf"{TEMP_OBJECT_PREFIX}\w*_{process_tag()}_\d+(?:_NODES)?"
+    return re.fullmatch(pattern, name) is not None
+
+
+def temp_object_creation_time(name: str) -> datetime | None:
+    """
+    Returns the creation time of a temporary object, or None if the name is
+    not the name of a temporary object.
+    """
+    match = _TEMP_OBJECT_PATTERN.fullmatch(name)
+    return datetime.fromtimestamp(int(match.group(1))) if match else None
+
+
+@dataclass(frozen=True)
+class TempObject:
+    """
+    A temporary database object.
+
+    object_type - Type of the object, e.g. SCHEMA, SCRIPT or TABLE.
+    schema      - Schema containing the object, None for a schema.
+    name        - Name of the object.
+    created     - Creation time of the object, as tagged in its name.
+    """
+
+    object_type: str
+    schema: str | None
+    name: str
+    created: datetime
+
+    @property
+    def qualified_name(self) -> str:
+        return f'"{self.schema}"."{self.name}"' if self.schema else f'"{self.name}"'
+
+
+def find_temp_objects(
+    pyexasol_conn: pyexasol.ExaConnection, min_age: timedelta
+) -> list[TempObject]:
+    """
+    Returns the temporary objects created at least min_age ago. Objects in a
+    returned temporary schema are not returned separately.
+
+    pyexasol_conn   - Opened database connection.
+    min_age         - Min. age of the objects, protecting objects which
+                      are still in use.
+    """
+    rows = pyexasol_conn.execute(
+        r"""
+        SELECT OBJECT_TYPE, ROOT_NAME, OBJECT_NAME FROM SYS.EXA_ALL_OBJECTS
+        WHERE OBJECT_NAME LIKE {prefix!s} ESCAPE '\'
+        """,
+        {"prefix": TEMP_OBJECT_PREFIX.replace("_", r"\_") + "%"},
+    ).fetchall()
+    threshold = datetime.now() - min_age
+    objects = []
+    for object_type, root_name, name in rows:
+        created = temp_object_creation_time(name)
+        if created is None or created > threshold:
+            continue
+        schema = None if object_type == "SCHEMA" else root_name
+        objects.append(TempObject(object_type, schema, name, created))
+    schemas = {obj.name for obj in objects if obj.schema is None}
+    return [obj for obj in objects if obj.schema not in schemas]
+
+
+def sweep_temp_objects(
+    pyexasol_conn: pyexasol.ExaConnection, min_age: timedelta, dry_run: bool = False
+) -> list[TempObject]:
+    """
+    Drops the temporary objects created at least min_age ago, e.g. left
+    behind by a deployment which has been killed while validating the
+    extraction of a language container. Temporary schemas are dropped
+    including all the objects they contain.
+
+    Returns the dropped objects, or the objects to be dropped in case of a
+    dry run.
+
+    pyexasol_conn   - Opened database connection.
+    min_age         - Min. age of the objects, protecting objects which
+                      are still in use.
+    dry_run         - If True, only find the objects without dropping them.
+    """
+    objects = find_temp_objects(pyexasol_conn, min_age)
+    if dry_run:
+        return objects
+    for obj in objects:
+        cascade = " CASCADE" if obj.object_type == "SCHEMA" else ""
+        pyexasol_conn.execute(f"DROP {obj.object_type} IF EXISTS {obj.qualified_name}{cascade}")
+        logger.info("Dropped temporary %s %s", obj.object_type.lower(), obj.qualified_name)
+    return objects
@@ -1,21 +1,32 @@
 import random
 import string
-from collections.abc import Generator
-from contextlib import contextmanager
+from collections.abc import (
+    AsyncGenerator,
+    Generator,
+)
+from contextlib import (
+    asynccontextmanager,
+    contextmanager,
+)
 
 import pyexasol  # type: ignore
 from tenacity import retry
 from tenacity.stop import stop_after_attempt
 
+from exasol.python_extension_common.connections.async_connection import run_in_thread
+from exasol.python_extension_common.deployment.temp_objects import temp_object_name
+
 
 @retry(reraise=True, stop=stop_after_attempt(3))
 def _create_random_schema(conn: pyexasol.ExaConnection, schema_name_length: int) -> str:
     """
     The function creates a schema with randomly generated name. It makes a few retries,
     as it's theoretically possible to create a collision with an existing schema.
+    The name is tagged as a temporary object, see temp_object_name().
     """
 
-    schema = "".join(random.choice(string.ascii_letters) for _ in range(schema_name_length))
+    random_name = "".join(random.choice(string.ascii_letters) for _ in range(schema_name_length))
+    schema = temp_object_name(random_name)
     sql = f'CREATE SCHEMA "{schema}";'
     conn.execute(query=sql)
     return schema
@@ -47,7 +58,7 @@ def temp_schema(
     created in this schema will be deleted with it. Returns the name of the created schema.
 
     conn                - pyexasol connection.
-    schema_name_length  - Number of characters in the temporary schema name.
+    schema_name_length  - Number of random characters in the temporary schema name.
     """
     current_schema = get_schema(conn)
     schema = ""
@@ -57,3 +68,21 @@ def temp_schema(
     finally:
         delete_schema(conn, schema)
         set_schema(conn, current_schema)
+
+
+@asynccontextmanager
+async def temp_schema_async(
+    conn: pyexasol.ExaConnection, schema_name_length: int = 20
+) -> AsyncGenerator[str, None]:
+    """
+    Asyncio counterpart of the temp_schema context manager. The SQL statements
+    are executed in worker threads, see run_in_thread.
+    """
+    current_schema = await run_in_thread(conn, get_schema, conn)
+    schema = ""
+    try:
+        schema = await run_in_thread(conn, _create_random_schema, conn, schema_name_length)
+        yield schema
+    finally:
+        await run_in_thread(conn, delete_schema, conn, schema)
+        await run_in_thread(conn, set_schema, conn, current_schema)
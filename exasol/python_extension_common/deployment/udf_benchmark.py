@@ -0,0 +1,181 @@
+import json
+import statistics
+from dataclasses import (
+    asdict,
+    dataclass,
+    field,
+)
+from datetime import datetime
+from textwrap import dedent
+
+from exasol.python_extension_common.deployment.extract_validator import (
+    ExtractValidator,
+    UdfDefinition,
+)
+
+# Emits the time from the start of the UDF process until the call of run(),
+# i.e. the startup of the UDF VM, and the time needed for importing the
+# modules. The age of the process is the uptime of the system minus the start
+# of the process since the boot, both read from /proc with a resolution of
+# clock ticks. The startup is NULL where /proc is not available.
+_BENCHMARK_UDF = UdfDefinition(
+    kind="benchmark",
+    parameters="modules VARCHAR(2000000)",
+    emits="node INTEGER, startup DOUBLE, imports DOUBLE",
+    body=dedent("""
+        import importlib
+        import os
+        import time
+        def process_age():
+            try:
+                with open("/proc/self/stat") as f:
+                    ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+                with open("/proc/uptime") as f:
+                    uptime = float(f.read().split()[0])
+                return uptime - ticks / os.sysconf("SC_CLK_TCK")
+            except Exception:
+                return None
+        def run(ctx):
+            startup = process_age()
+            start = time.perf_counter()
+            for module in (ctx.modules or "").split("\\n"):
+                if module:
+                    importlib.import_module(module)
+            ctx.emit(exa.meta.node_id, startup, time.perf_counter() - start)
+        """),
+)
+
+
+@dataclass(frozen=True)
+class NodeTiming:
+    """
+    Timings of the UDF on a single node, in seconds.
+
+    startup - Time from the start of the UDF process until the UDF was called,
+              None if not available.
+    imports - Time needed for importing the modules.
+    """
+
+    startup: float | None
+    imports: float
+
+
+@dataclass(frozen=True)
+class BenchmarkRun:
+    """
+    A single cold start of the UDF on the nodes of the cluster.
+
+    latency - Duration of the query calling the UDF, in seconds.
+    nodes   - The IDs of the nodes mapped to the timings of the UDF.
+    """
+
+    latency: float
+    nodes: dict[int, NodeTiming]
+
+
+def _stats(values: list[float]) -> dict[str, float] | None:
+    if not values:
+        return None
+    return {
+        "mean": statistics.mean(values),
+        "stdev": statistics.pstdev(values),
+        "min": min(values),
+        "max": max(values),
+    }
+
+
+@dataclass
+class ColdStartBenchmark:
+    """
+    Results of benchmarking the cold start of a language container, see
+    benchmark_cold_start().
+    """
+
+    language_alias: str
+    modules: list[str]
+    runs: list[BenchmarkRun] = field(default_factory=list)
+
+    def _timings(self, metric: str, node: int | None = None) -> list[float]:
+        values = (
+            getattr(timing, metric)
+            for run in self.runs
+            for timing_node, timing in run.nodes.items()
+            if node is None or timing_node == node
+        )
+        return [value for value in values if value is not None]
+
+    def summary(self) -> dict:
+        """
+        Returns the mean, the standard deviation, the min. and the max. of the
+        query latency, of the startup and of the import time, over all nodes
+        and for each node.
+        """
+        nodes = sorted({node for run in self.runs for node in run.nodes})
+        return {
+            "latency": _stats([run.latency for run in self.runs]),
+            "startup": _stats(self._timings("startup")),
+            "imports": _stats(self._timings("imports")),
+            "nodes": {
+                str(node): {
+                    "startup": _stats(self._timings("startup", node)),
+                    "imports": _stats(self._timings("imports", node)),
+                }
+                for node in nodes
+            },
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "language_alias": self.language_alias,
+            "modules": self.modules,
+            "repetitions": len(self.runs),
+            "runs": [
+                {
+                    "latency": run.latency,
+                    "nodes": {str(node): asdict(timing) for node, timing in run.nodes.items()},
+                }
+                for run in self.runs
+            ],
+            "summary": self.summary(),
+        }
+
+    def to_json(self, indent: int | None = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+
+def benchmark_cold_start(
+    validator: ExtractValidator,
+    schema: str,
+    language_alias: str,
+    modules: list[str],
+    repetitions: int = 5,
+) -> ColdStartBenchmark:
+    """
+    Measures the cold start of the language container on the nodes of the
+    database cluster, e.g. for comparing two builds of a container before
+    switching the language alias to one of them.
+
+    Each repetition calls a UDF exactly once on each node in a separate query,
+    starting new UDF VMs, see ExtractValidator.node_udf(). The UDF reports the
+    startup of its VM and the time needed for importing the specified modules.
+    The language container needs to be extracted on all nodes already.
+
+    validator       - The validator providing the connection, the timeout and
+                      the schema for a persistent UDF, see ExtractValidator.
+    schema          - Schema for the temporary UDF script.
+    language_alias  - Language alias of the language container.
+    modules         - Names of the modules to import.
+    repetitions     - Number of cold starts.
+    """
+    if repetitions < 1:
+        raise ValueError(f"The number of repetitions must be positive, got {repetitions}.")
+    result = ColdStartBenchmark(language_alias, modules)
+    argument = "\n".join(modules)
+    with validator.node_udf(schema, language_alias, _BENCHMARK_UDF) as call_udf:
+        for _ in range(repetitions):
+            start = datetime.now()
+            rows = call_udf(argument)
+            latency = (datetime.now() - start).total_seconds()
+            timings = {node: NodeTiming(startup, imports) for node, startup, imports in rows}
+            result.runs.append(BenchmarkRun(latency, dict(sorted(timings.items()))))
+    return result
@@ -0,0 +1,75 @@
+import logging
+from datetime import timedelta
+from textwrap import dedent
+from typing import TYPE_CHECKING
+
+from exasol.python_extension_common.deployment.extract_validator import (
+    ExtractValidator,
+    UdfDefinition,
+)
+
+if TYPE_CHECKING:
+    from exasol.python_extension_common.deployment.language_container_deployer import (
+        LanguageContainerDeployer,
+    )
+
+_WARM_UP_UDF = UdfDefinition(
+    kind="warmup",
+    parameters="modules VARCHAR(2000000)",
+    emits="node INTEGER, duration DOUBLE",
+    body=dedent("""
+        import importlib
+        import time
+        def run(ctx):
+            start = time.perf_counter()
+            for module in (ctx.modules or "").split("\\n"):
+                if module:
+                    importlib.import_module(module)
+            ctx.emit(exa.meta.node_id, time.perf_counter() - start)
+        """),
+)
+
+
+def warm_up_nodes(
+    validator: ExtractValidator, schema: str, language_alias: str, modules: list[str]
+) -> dict[int, timedelta]:
+    """
+    Calls a warm-up UDF exactly once on each node of the database cluster,
+    starting the UDF VM of the language container and importing the specified
+    modules. Hence, the first query using the language container doesn't need
+    to wait for the cold start. The UDF is distributed over the nodes by a
+    table, regardless of the option one_probe_per_node of the validator, see
+    ExtractValidator.node_udf().
+
+    Returns the IDs of the warmed up nodes mapped to the time the UDF needed for
+    importing the modules.
+
+    validator       - The validator providing the connection, the timeout and
+                      the schema for a persistent UDF, see ExtractValidator.
+    schema          - Schema for the temporary UDF script.
+    language_alias  - Language alias of the language container.
+    modules         - Names of the modules to import.
+    """
+    rows = validator.run_on_each_node(schema, language_alias, _WARM_UP_UDF, "\n".join(modules))
+    return {node: timedelta(seconds=duration) for node, duration in sorted(rows)}
+
+
+def warm_up_container(
+    deployer: "LanguageContainerDeployer", modules: list[str]
+) -> dict[int, timedelta]:
+    """
+    Warms up the language container activated by the deployer, see
+    `warm_up_nodes`. The warm-up is retried until the timeout of the extract
+    validator of the deployer. The UDF is created in the schema provided by
+    `LanguageContainerDeployer.udf_schema`.
+
+    Returns the IDs of the nodes mapped to the time needed for importing the modules.
+
+    deployer        - The deployer which activated the language container.
+    modules         - Names of the modules to import in the warm-up UDF.
+    """
+    with deployer.udf_schema() as schema:
+        times = warm_up_nodes(deployer.extract_validator, schema, deployer.language_alias, modules)
+    for node, duration in times.items():
+        logging.info("Warmed up node %d in %.3f seconds.", node, duration.total_seconds())
+    return times
@@ -0,0 +1,18 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from exasol.python_extension_common.cli.temp_object_sweeper_cli import (
+    TempObjectSweeperCli,
+)
+
+
+@patch("exasol.python_extension_common.cli.temp_object_sweeper_cli.sweep_temp_objects")
+@patch("exasol.python_extension_common.cli.temp_object_sweeper_cli.open_pyexasol_connection")
+def test_temp_object_sweeper_cli(open_connection_mock, sweep_mock, capsys):
+    sweep_mock.return_value = []
+    callback = TempObjectSweeperCli("min_age_hours", "dry_run")
+    callback(min_age_hours=12, dry_run=True, dsn="my_dsn")
+    open_connection_mock.assert_called_once_with(dsn="my_dsn")
+    sweep_mock.assert_called_once_with(open_connection_mock.return_value, timedelta(hours=12), True)
+    open_connection_mock.return_value.close.assert_called_once()
+    assert "Would drop 0 temporary objects." in capsys.readouterr().out
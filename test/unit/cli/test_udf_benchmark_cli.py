@@ -0,0 +1,26 @@
+import json
+from unittest.mock import patch
+
+from exasol.python_extension_common.cli.udf_benchmark_cli import UdfBenchmarkCli
+from exasol.python_extension_common.deployment.udf_benchmark import ColdStartBenchmark
+
+
+@patch("exasol.python_extension_common.cli.udf_benchmark_cli.benchmark_cold_start")
+@patch("exasol.python_extension_common.cli.udf_benchmark_cli.open_pyexasol_connection")
+def test_udf_benchmark_cli(open_connection_mock, benchmark_mock, tmp_path):
+    conn = open_connection_mock.return_value
+    conn.execute.return_value.fetchval.return_value = "MY_SCHEMA"
+    benchmark_mock.return_value = ColdStartBenchmark("PYTHON3_TEST", ["numpy", "pandas"])
+    output_file = tmp_path / "benchmark.json"
+    callback = UdfBenchmarkCli("modules", "repetitions", "output_file")
+    callback(
+        modules="numpy, pandas",
+        repetitions=3,
+        output_file=str(output_file),
+        language_alias="PYTHON3_TEST",
+        dsn="my_dsn",
+    )
+    args = benchmark_mock.call_args.args
+    assert args[1:] == ("MY_SCHEMA", "PYTHON3_TEST", ["numpy", "pandas"], 3)
+    assert json.loads(output_file.read_text())["language_alias"] == "PYTHON3_TEST"
+    conn.close.assert_called_once()
@@ -0,0 +1,108 @@
+import asyncio
+from pathlib import Path
+from unittest.mock import (
+    AsyncMock,
+    create_autospec,
+)
+
+import exasol.bucketfs as bfs
+import pytest
+from pyexasol import ExaConnection
+
+from exasol.python_extension_common.deployment.async_language_container_deployer import (
+    AsyncLanguageContainerDeployer,
+)
+from exasol.python_extension_common.deployment.extract_validator import ExtractValidator
+from exasol.python_extension_common.deployment.language_container_deployer import (
+    LanguageContainerDeployer,
+)
+from exasol.python_extension_common.deployment.scratch_schema_pool import (
+    ScratchSchemaPool,
+)
+
+
+@pytest.fixture
+def deployer() -> LanguageContainerDeployer:
+    deployer = create_autospec(LanguageContainerDeployer, instance=True)
+    deployer.pyexasol_connection = create_autospec(ExaConnection)
+    deployer.pyexasol_connection.execute.return_value.fetchval.return_value = "MY_SCHEMA"
+    deployer.bucketfs_path = bfs.path.BucketPath("/", bucket_api=bfs.MountedBucket("svc", "bkt"))
+    deployer.language_alias = "PYTHON3_TEST"
+    deployer.extract_validator = create_autospec(ExtractValidator, instance=True)
+    deployer.extract_validator.verify_all_nodes_async = AsyncMock()
+    deployer.extract_validator.udf_schema = None
+    deployer.container_cache = None
+    deployer.schema_pool = None
+    deployer.warm_up_modules = None
+    deployer.upload_container.return_value = True
+    deployer.activate_and_wait.return_value = True
+    return deployer
+
+
+def test_run(deployer):
+    result = asyncio.run(AsyncLanguageContainerDeployer(deployer).run(Path("slc.tar.gz")))
+    deployer.upload_container.assert_called_once_with(Path("slc.tar.gz"), "slc.tar.gz", False)
+    deployer.activate_and_wait.assert_called_once_with("slc.tar.gz", True, False, False, False)
+    validator = deployer.extract_validator
+    validator.verify_all_nodes_async.assert_awaited_once()
+    schema, alias, path = validator.verify_all_nodes_async.call_args.args
+    assert (schema, alias) == ("MY_SCHEMA", "PYTHON3_TEST")
+    assert path.as_udf_path() == (deployer.bucketfs_path / "slc.tar.gz").as_udf_path()
+    assert not result.upload_skipped
+    assert result.system_altered
+
+
+def test_run_prints_activation_commands_after_waiting(deployer):
+    events = []
+    validator = deployer.extract_validator
+    validator.verify_all_nodes_async.side_effect = lambda *args: events.append("wait")
+    deployer.print_activation_commands.side_effect = lambda *args: events.append("print")
+    asyncio.run(
+        AsyncLanguageContainerDeployer(deployer).run(Path("slc.tar.gz"), alter_system=False)
+    )
+    deployer.print_activation_commands.assert_called_once_with("slc.tar.gz")
+    assert events == ["wait", "print"]
+
+
+def test_run_skipped_upload(deployer):
+    deployer.upload_container.return_value = False
+    result = asyncio.run(
+        AsyncLanguageContainerDeployer(deployer).run(Path("slc.tar.gz"), skip_if_identical=True)
+    )
+    assert result.upload_skipped
+    deployer.extract_validator.verify_all_nodes_async.assert_not_awaited()
+
+
+def test_run_without_schema(deployer):
+    deployer.pyexasol_connection.execute.return_value.fetchval.return_value = None
+    asyncio.run(AsyncLanguageContainerDeployer(deployer).run(Path("slc.tar.gz")))
+    calls = deployer.pyexasol_connection.execute.call_args_list
+    statements = [c.kwargs.get("query") or c.args[0] for c in calls]
+    assert any(s.startswith("CREATE SCHEMA") for s in statements)
+    assert any(s.startswith("DROP SCHEMA") for s in statements)
+
+
+def test_run_with_schema_pool(deployer):
+    deployer.pyexasol_connection.execute.return_value.fetchval.return_value = None
+    deployer.schema_pool = ScratchSchemaPool(prefix="SCRATCH")
+    asyncio.run(AsyncLanguageContainerDeployer(deployer).run(Path("slc.tar.gz")))
+    assert deployer.extract_validator.verify_all_nodes_async.call_args.args[0] == "SCRATCH_0"
+    calls = deployer.pyexasol_connection.execute.call_args_list
+    statements = [c.kwargs.get("query") or c.args[0] for c in calls]
+    assert not any(s.startswith("DROP SCHEMA") for s in statements)
+
+
+def test_concurrent_deployments(deployer):
+    async def deploy_all():
+        testee = AsyncLanguageContainerDeployer(deployer)
+        return await asyncio.gather(*(testee.run(Path(f"slc{i}.tar.gz")) for i in range(3)))
+
+    assert len(asyncio.run(deploy_all())) == 3
+    assert deployer.upload_container.call_count == 3
+
+
+def test_run_with_persistent_udf(deployer):
+    deployer.extract_validator.udf_schema = "VALIDATION"
+    asyncio.run(AsyncLanguageContainerDeployer(deployer).run(Path("slc.tar.gz")))
+    assert deployer.extract_validator.verify_all_nodes_async.call_args.args[0] == "VALIDATION"
+    deployer.pyexasol_connection.execute.assert_not_called()
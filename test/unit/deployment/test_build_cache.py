@@ -0,0 +1,107 @@
+import os
+import zipfile
+from pathlib import Path
+
+import pytest
+from exasol.slc.models.compression_strategy import CompressionStrategy
+from exasol.slc.models.export_container_result import ExportContainerResult
+from exasol.slc.models.export_info import ExportInfo
+
+from exasol.python_extension_common.deployment.build_cache import (
+    BuildCache,
+    flavor_hash,
+)
+
+
+def write_wheel(path: Path, content: str, date_time=(2020, 1, 1, 0, 0, 0)) -> None:
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr(zipfile.ZipInfo("my_package/__init__.py", date_time), content)
+
+
+@pytest.fixture
+def flavor_path(tmp_path) -> Path:
+    flavor_path = tmp_path / "my_container"
+    (flavor_path / "flavor_base" / "release" / "dist").mkdir(parents=True)
+    (flavor_path / "flavor_base" / "dependencies").mkdir(parents=True)
+    (flavor_path / "flavor_base" / "release" / "Dockerfile").write_text("FROM base")
+    (flavor_path / "flavor_base" / "dependencies" / "requirements.txt").write_text("numpy\n")
+    write_wheel(flavor_path / "flavor_base" / "release" / "dist" / "my.whl", "x = 1")
+    return flavor_path
+
+
+def export_result(export_dir: Path, flavor_path: Path) -> ExportContainerResult:
+    export_dir.mkdir(parents=True, exist_ok=True)
+    container = export_dir / "my_container.tar.gz"
+    container.write_bytes(b"container")
+    export_info = ExportInfo(
+        str(container), "my_container", "my_container", "hash", True, "release", None
+    )
+    return ExportContainerResult({str(flavor_path): {"release": export_info}}, None)
+
+
+def test_flavor_hash_ignores_wheel_timestamps(flavor_path):
+    before = flavor_hash(flavor_path)
+    wheel = flavor_path / "flavor_base" / "release" / "dist" / "my.whl"
+    write_wheel(wheel, "x = 1", date_time=(2024, 6, 1, 12, 0, 0))
+    assert flavor_hash(flavor_path) == before
+
+
+@pytest.mark.parametrize(
+    "file_name, content",
+    [
+        ("flavor_base/release/Dockerfile", "FROM other"),
+        ("flavor_base/dependencies/requirements.txt", "numpy\npandas\n"),
+    ],
+)
+def test_flavor_hash_changes_with_flavor(flavor_path, file_name, content):
+    before = flavor_hash(flavor_path)
+    (flavor_path / file_name).write_text(content)
+    assert flavor_hash(flavor_path) != before
+
+
+def test_flavor_hash_changes_with_wheel_content(flavor_path):
+    before = flavor_hash(flavor_path)
+    write_wheel(flavor_path / "flavor_base" / "release" / "dist" / "my.whl", "x = 2")
+    assert flavor_hash(flavor_path) != before
+
+
+def test_key_depends_on_compression(tmp_path, flavor_path):
+    cache = BuildCache(tmp_path / "cache")
+    assert cache.key(flavor_path, CompressionStrategy.GZIP) != cache.key(
+        flavor_path, CompressionStrategy.NONE
+    )
+
+
+def test_get_missing(tmp_path, flavor_path):
+    cache = BuildCache(tmp_path / "cache")
+    assert cache.get("no_such_key", flavor_path, tmp_path / "export") is None
+
+
+def test_put_get(tmp_path, flavor_path):
+    cache = BuildCache(tmp_path / "cache")
+    cache.put("key", export_result(tmp_path / "first_export", flavor_path))
+
+    other_flavor_path = tmp_path / "other" / "my_container"
+    result = cache.get("key", other_flavor_path, tmp_path / "second_export")
+    assert result is not None
+    export_info = result.export_infos[str(other_flavor_path)]["release"]
+    assert export_info.cache_file == str(tmp_path / "second_export" / "my_container.tar.gz")
+    assert Path(export_info.cache_file).read_bytes() == b"container"
+    assert not export_info.is_new
+
+
+def test_get_with_missing_container(tmp_path, flavor_path):
+    cache = BuildCache(tmp_path / "cache")
+    cache.put("key", export_result(tmp_path / "export", flavor_path))
+    (cache.cache_dir / "key" / "my_container.tar.gz").unlink()
+    assert cache.get("key", flavor_path, tmp_path / "export") is None
+
+
+def test_evict_least_recently_used(tmp_path, flavor_path):
+    cache = BuildCache(tmp_path / "cache", max_entries=2)
+    for i, key in enumerate(["key1", "key2"]):
+        cache.put(key, export_result(tmp_path / "export", flavor_path))
+        os.utime(cache.cache_dir / key, (i, i))
+    assert cache.get("key1", flavor_path, tmp_path / "export") is not None
+    cache.put("key3", export_result(tmp_path / "export", flavor_path))
+    assert sorted(entry.name for entry in cache.cache_dir.iterdir()) == ["key1", "key3"]
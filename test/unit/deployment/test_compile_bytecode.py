@@ -0,0 +1,52 @@
+import importlib.util
+import py_compile
+from pathlib import Path
+
+from exasol.python_extension_common.deployment.container_scripts.compile_bytecode import (
+    bytecode_coverage,
+    main,
+)
+
+
+def create_sources(path: Path) -> list[Path]:
+    package = path / "pkg"
+    package.mkdir()
+    sources = [package / "__init__.py", package / "module.py"]
+    for source in sources:
+        source.write_text("VALUE = 1\n")
+    return sources
+
+
+def test_compile_bytecode(tmp_path, capsys):
+    sources = create_sources(tmp_path)
+    assert main([str(tmp_path), "--min-coverage", "1.0"]) == 0
+    for source in sources:
+        assert Path(importlib.util.cache_from_source(str(source))).is_file()
+    assert "2 of 2 source files" in capsys.readouterr().out
+
+
+def test_compile_bytecode_replaces_timestamp_bytecode(tmp_path):
+    sources = create_sources(tmp_path)
+    for source in sources:
+        py_compile.compile(str(source), invalidation_mode=py_compile.PycInvalidationMode.TIMESTAMP)
+    main([str(tmp_path)])
+    for source in sources:
+        header = Path(importlib.util.cache_from_source(str(source))).read_bytes()[:16]
+        # The flags of unchecked hash-based bytecode, see PEP 552.
+        assert int.from_bytes(header[4:8], "little") == 0b01
+
+
+def test_compile_bytecode_optimized(tmp_path):
+    sources = create_sources(tmp_path)
+    main([str(tmp_path), "--optimize", "2"])
+    assert bytecode_coverage([tmp_path], 2) == (2, [])
+    total, missing = bytecode_coverage([tmp_path], 0)
+    assert total == 2
+    assert sorted(missing) == sorted(sources)
+
+
+def test_compile_bytecode_insufficient_coverage(tmp_path):
+    create_sources(tmp_path)
+    (tmp_path / "pkg" / "invalid.py").write_text("def (:\n")
+    assert main([str(tmp_path), "--min-coverage", "0.9"]) == 1
+    assert main([str(tmp_path), "--min-coverage", "0.5"]) == 0
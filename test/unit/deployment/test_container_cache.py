@@ -0,0 +1,162 @@
+import hashlib
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from exasol.python_extension_common.deployment.container_cache import (
+    ContainerCache,
+)
+
+URL = "https://some/url/container.tar.gz"
+
+
+class ResponseMock:
+    def __init__(self, content: bytes = b"", status_code: int = 200, headers=None):
+        self.content = content
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_details):
+        pass
+
+    def iter_content(self, chunk_size: int = 1):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i : i + chunk_size]
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error")
+
+
+def cached_path(cache: ContainerCache, url: str) -> Path:
+    with cache.get(url) as container:
+        return Path(container.name)
+
+
+def cached_content(cache: ContainerCache, url: str) -> bytes:
+    with cache.get(url) as container:
+        return container.read()
+
+
+@pytest.fixture
+def mock_get():
+    with patch("exasol.python_extension_common.deployment.container_cache.requests.get") as get:
+        yield get
+
+
+def test_download_on_miss(mock_get, tmp_path):
+    mock_get.return_value = ResponseMock(b"content", headers={"ETag": '"v1"'})
+    cache = ContainerCache(tmp_path)
+    path = cached_path(cache, URL)
+    assert path.read_bytes() == b"content"
+    assert path.name == hashlib.sha256(b"content").hexdigest()
+    assert mock_get.call_args.kwargs["headers"] == {}
+    assert cache.lookup(URL).etag == '"v1"'
+
+
+def test_revalidate_not_modified(mock_get, tmp_path):
+    headers = {"ETag": '"v1"', "Last-Modified": "Mon, 05 Oct 2026 10:00:00 GMT"}
+    mock_get.return_value = ResponseMock(b"content", headers=headers)
+    cache = ContainerCache(tmp_path)
+    first = cached_path(cache, URL)
+    mock_get.return_value = ResponseMock(status_code=304)
+    second = cached_path(cache, URL)
+    assert first == second
+    assert mock_get.call_args.kwargs["headers"] == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 05 Oct 2026 10:00:00 GMT",
+    }
+
+
+def test_revalidate_modified(mock_get, tmp_path):
+    mock_get.return_value = ResponseMock(b"old", headers={"ETag": '"v1"'})
+    cache = ContainerCache(tmp_path)
+    cached_path(cache, URL)
+    mock_get.return_value = ResponseMock(b"new", headers={"ETag": '"v2"'})
+    assert cached_content(cache, URL) == b"new"
+    assert cache.lookup(URL).etag == '"v2"'
+
+
+def test_offline_uses_cached(mock_get, tmp_path):
+    mock_get.return_value = ResponseMock(b"content", headers={"ETag": '"v1"'})
+    cache = ContainerCache(tmp_path)
+    cached_path(cache, URL)
+    mock_get.side_effect = requests.ConnectionError()
+    assert cached_content(cache, URL) == b"content"
+
+
+def test_offline_without_cached(mock_get, tmp_path):
+    mock_get.side_effect = requests.ConnectionError()
+    with pytest.raises(requests.ConnectionError):
+        ContainerCache(tmp_path).get(URL)
+
+
+def test_http_error_not_cached(mock_get, tmp_path):
+    mock_get.return_value = ResponseMock(status_code=404)
+    cache = ContainerCache(tmp_path)
+    with pytest.raises(requests.HTTPError):
+        cache.get(URL)
+    assert cache.lookup(URL) is None
+
+
+def test_lru_eviction(mock_get, tmp_path):
+    cache = ContainerCache(tmp_path, max_size=25)
+    paths = {}
+    for i, url in enumerate(["u1", "u2", "u3"]):
+        mock_get.return_value = ResponseMock(bytes([i]) * 10)
+        paths[url] = cached_path(cache, url)
+        entry_path = cache._entry_path(url)
+        os.utime(entry_path, (1000 + i, 1000 + i))
+    assert cache.lookup("u1") is None
+    assert not paths["u1"].exists()
+    assert cache.lookup("u2") is not None
+    assert cache.lookup("u3") is not None
+
+
+def test_open_container_not_evicted(mock_get, tmp_path):
+    cache = ContainerCache(tmp_path, max_size=15)
+    mock_get.return_value = ResponseMock(b"1" * 10)
+    with cache.get("u1") as container:
+        os.utime(cache._entry_path("u1"), (1000, 1000))
+        # Another process, using a cache on the same directory.
+        mock_get.return_value = ResponseMock(b"2" * 10)
+        cached_path(ContainerCache(tmp_path, max_size=15), "u2")
+        assert Path(container.name).is_file()
+        assert cache.lookup("u1") is not None
+    cache.evict()
+    assert cache.lookup("u1") is None
+    assert not Path(container.name).exists()
+
+
+def test_identical_content_shared(mock_get, tmp_path):
+    mock_get.return_value = ResponseMock(b"same")
+    cache = ContainerCache(tmp_path)
+    assert cached_path(cache, "u1") == cached_path(cache, "u2")
+
+
+def test_miss_downloads_once(mock_get, tmp_path):
+    mock_get.return_value = ResponseMock(b"content", headers={"ETag": '"v1"'})
+    cache = ContainerCache(tmp_path, connections=4)
+    assert cached_content(cache, URL) == b"content"
+    assert mock_get.call_count == 1
+
+
+def test_miss_resumes_interrupted_response(mock_get, tmp_path):
+    class InterruptedResponse(ResponseMock):
+        def iter_content(self, chunk_size: int = 1):
+            yield self.content[:3]
+            raise requests.ConnectionError()
+
+    headers = {"Accept-Ranges": "bytes"}
+    mock_get.side_effect = [
+        InterruptedResponse(b"content", headers=headers),
+        ResponseMock(b"tent", status_code=206, headers=headers),
+    ]
+    assert cached_content(ContainerCache(tmp_path), URL) == b"content"
+    assert mock_get.call_args.kwargs["headers"] == {"Range": "bytes=3-"}
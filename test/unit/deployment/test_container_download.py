@@ -0,0 +1,229 @@
+import io
+import threading
+from unittest.mock import (
+    MagicMock,
+    patch,
+)
+
+import pytest
+import requests
+
+from exasol.python_extension_common.deployment.container_download import (
+    PipeReader,
+    download_container,
+    open_container_stream,
+)
+
+
+class ResponseMock:
+    def __init__(
+        self,
+        content: bytes = b"",
+        status_code: int = 200,
+        headers=None,
+        fail_after: int | None = None,
+    ):
+        self.content_bytes = content
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.fail_after = fail_after
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_details):
+        pass
+
+    def iter_content(self, chunk_size: int = 1):
+        content = self.content_bytes
+        if self.fail_after is not None:
+            content = content[: self.fail_after]
+        for i in range(0, len(content), chunk_size):
+            yield content[i : i + chunk_size]
+        if self.fail_after is not None:
+            raise requests.exceptions.ChunkedEncodingError("connection broken")
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error")
+
+
+class ServerMock:
+    """
+    Simulates a server optionally supporting range requests. The first
+    `failures` responses break after `fail_after` bytes.
+    """
+
+    def __init__(
+        self, content: bytes, accept_ranges: bool = True, failures: int = 0, fail_after: int = 0
+    ):
+        self.content = content
+        self.accept_ranges = accept_ranges
+        self.failures = failures
+        self.fail_after = fail_after
+        self.lock = threading.Lock()
+        self.ranges = []
+
+    def get(self, url, stream=False, timeout=None, headers=None):
+        requested = (headers or {}).get("Range")
+        with self.lock:
+            self.ranges.append(requested)
+            fail = self.failures > 0
+            self.failures -= 1
+        fail_after = self.fail_after if fail else None
+        if not (requested and self.accept_ranges):
+            headers = {"Accept-Ranges": "bytes"} if self.accept_ranges else {}
+            return ResponseMock(self.content, headers=headers, fail_after=fail_after)
+        first, last = requested[len("bytes=") :].split("-")
+        last = int(last) if last else len(self.content) - 1
+        content = self.content[int(first) : last + 1]
+        headers = {
+            "Accept-Ranges": "bytes",
+            "Content-Range": f"bytes {first}-{last}/{len(self.content)}",
+        }
+        return ResponseMock(content, 206, headers, fail_after)
+
+
+@pytest.fixture
+def content() -> bytes:
+    return bytes(range(256)) * 40
+
+
+@pytest.fixture
+def mock_get():
+    with patch("exasol.python_extension_common.deployment.container_download.requests.get") as get:
+        yield get
+
+
+def test_download_container(mock_get):
+    content = bytes(range(256)) * 10
+    mock_get.return_value = ResponseMock(content)
+    file = io.BytesIO()
+    size = download_container("https://some/url", file, chunk_size=100)
+    assert size == len(content)
+    assert file.getvalue() == content
+    assert mock_get.call_args.kwargs["stream"] is True
+
+
+def test_download_container_chunk_size(mock_get):
+    content = b"x" * 1000
+    mock_get.return_value = ResponseMock(content)
+    file = MagicMock()
+    download_container("https://some/url", file, chunk_size=300)
+    assert [len(c.args[0]) for c in file.write.call_args_list] == [300, 300, 300, 100]
+
+
+def test_download_container_http_error(mock_get):
+    mock_get.return_value = ResponseMock(status_code=404)
+    with pytest.raises(requests.HTTPError):
+        download_container("https://some/url", io.BytesIO())
+
+
+def test_pipe_reader():
+    chunks = [b"abc", b"", b"defgh", b"i"]
+    with PipeReader(chunks, length=9, buffer_chunks=1) as reader:
+        assert reader.len == 9
+        assert reader.read(2) == b"ab"
+        assert reader.tell() == 2
+        assert reader.read() == b"cdefghi"
+        assert reader.read() == b""
+
+
+def test_pipe_reader_producer_failure():
+    def chunks():
+        yield b"abc"
+        raise RuntimeError("connection lost")
+
+    with PipeReader(chunks()) as reader:
+        with pytest.raises(RuntimeError, match="connection lost"):
+            reader.read()
+
+
+def test_pipe_reader_bounded_buffer():
+    produced = []
+
+    def chunks():
+        for i in range(100):
+            produced.append(i)
+            yield b"x"
+
+    reader = PipeReader(chunks(), buffer_chunks=2)
+    threading.Event().wait(0.3)
+    # 2 chunks in the queue plus 1 waiting to be put.
+    assert len(produced) <= 3
+    reader.close()
+    assert len(produced) < 100
+
+
+@pytest.mark.parametrize(
+    "headers, expected_len",
+    [
+        ({"Content-Length": "6"}, 6),
+        ({"Content-Length": "6", "Content-Encoding": "gzip"}, None),
+        ({}, None),
+    ],
+)
+def test_open_container_stream(mock_get, headers, expected_len):
+    mock_get.return_value = ResponseMock(b"abcdef", headers=headers)
+    with open_container_stream("https://some/url", chunk_size=4) as stream:
+        assert stream.len == expected_len
+        assert stream.read() == b"abcdef"
+
+
+def test_download_resumed(mock_get, content):
+    server = ServerMock(content, failures=2, fail_after=1000)
+    mock_get.side_effect = server.get
+    file = io.BytesIO()
+    assert download_container("https://some/url", file, chunk_size=256) == len(content)
+    assert file.getvalue() == content
+    assert server.ranges == [None, "bytes=1000-", "bytes=2000-"]
+
+
+def test_download_restarted_without_ranges(mock_get, content):
+    server = ServerMock(content, accept_ranges=False, failures=1, fail_after=1000)
+    mock_get.side_effect = server.get
+    file = io.BytesIO()
+    download_container("https://some/url", file, chunk_size=256)
+    assert file.getvalue() == content
+    assert server.ranges == [None, None]
+
+
+def test_download_too_many_failures(mock_get, content):
+    server = ServerMock(content, failures=3, fail_after=1000)
+    mock_get.side_effect = server.get
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        download_container("https://some/url", io.BytesIO(), max_retries=2)
+
+
+def test_download_parallel(mock_get, content):
+    server = ServerMock(content)
+    mock_get.side_effect = server.get
+    file = io.BytesIO()
+    size = download_container("https://some/url", file, chunk_size=100, connections=4)
+    assert size == len(content)
+    assert file.getvalue() == content
+    assert server.ranges[0] == "bytes=0-0"
+    assert sorted(server.ranges[1:]) == [
+        "bytes=0-2559",
+        "bytes=2560-5119",
+        "bytes=5120-7679",
+        "bytes=7680-10239",
+    ]
+
+
+def test_download_parallel_resumed(mock_get, content):
+    # The probe request for the content length fails as well.
+    server = ServerMock(content, failures=3, fail_after=1)
+    mock_get.side_effect = server.get
+    file = io.BytesIO()
+    download_container("https://some/url", file, chunk_size=100, connections=2)
+    assert file.getvalue() == content
+
+
+def test_download_parallel_fallback(mock_get, content):
+    server = ServerMock(content, accept_ranges=False)
+    mock_get.side_effect = server.get
+    file = io.BytesIO()
+    download_container("https://some/url", file, connections=4)
+    assert file.getvalue() == content
+    assert server.ranges == ["bytes=0-0", None]
@@ -0,0 +1,35 @@
+import hashlib
+import io
+
+from exasol.python_extension_common.deployment.content_hash import (
+    HashingReader,
+    file_sha256,
+)
+
+
+def test_file_sha256(tmp_path):
+    file = tmp_path / "file"
+    file.write_bytes(b"abc" * 1000)
+    assert file_sha256(file, chunk_size=7) == hashlib.sha256(b"abc" * 1000).hexdigest()
+
+
+def test_hashing_reader():
+    reader = HashingReader(io.BytesIO(b"some content"))
+    assert reader.read(4) == b"some"
+    assert reader.tell() == 4
+    assert reader.read() == b" content"
+    assert reader.hexdigest() == hashlib.sha256(b"some content").hexdigest()
+
+
+def test_hashing_reader_len_of_file(tmp_path):
+    file = tmp_path / "file"
+    file.write_bytes(b"some content")
+    with open(file, "rb") as f:
+        f.read(5)
+        assert HashingReader(f).len == 7
+
+
+def test_hashing_reader_len_passed_through():
+    stream = io.BytesIO(b"abc")
+    stream.len = 3
+    assert HashingReader(stream).len == 3
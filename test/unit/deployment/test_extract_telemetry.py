@@ -0,0 +1,67 @@
+from datetime import (
+    datetime,
+    timedelta,
+)
+
+from exasol.python_extension_common.deployment.extract_telemetry import (
+    ExtractionStats,
+    ExtractTelemetry,
+    ProbeEvent,
+)
+
+
+def seconds(*values: float) -> list[timedelta]:
+    return [timedelta(seconds=v) for v in values]
+
+
+def event(attempt: int, ready: dict[int, float], latency: float = 0.1) -> ProbeEvent:
+    return ProbeEvent(
+        timestamp=datetime.now(),
+        attempt=attempt,
+        nproc=3,
+        pending=[],
+        ready={node: timedelta(seconds=s) for node, s in ready.items()},
+        latency=timedelta(seconds=latency),
+    )
+
+
+def test_stats():
+    stats = ExtractionStats.of(seconds(*range(1, 21)))
+    assert stats == ExtractionStats(
+        count=20,
+        p50=timedelta(seconds=10),
+        p95=timedelta(seconds=19),
+        max=timedelta(seconds=20),
+    )
+
+
+def test_stats_single_value():
+    stats = ExtractionStats.of(seconds(3))
+    assert stats.p50 == stats.p95 == stats.max == timedelta(seconds=3)
+
+
+def test_empty_telemetry():
+    telemetry = ExtractTelemetry()
+    assert telemetry.summary() == {}
+    assert telemetry.overall() is None
+    assert telemetry.probe_latency() is None
+
+
+def test_summary_over_multiple_validations():
+    telemetry = ExtractTelemetry()
+    # first validation
+    telemetry(event(1, {0: 1, 2: 1}))
+    telemetry(event(2, {1: 5}))
+    # second validation
+    telemetry(event(1, {0: 2}))
+    telemetry(event(2, {1: 7, 2: 2}, latency=0.3))
+    summary = telemetry.summary()
+    assert list(summary) == [0, 1, 2]
+    assert summary[1] == ExtractionStats(
+        count=2,
+        p50=timedelta(seconds=5),
+        p95=timedelta(seconds=7),
+        max=timedelta(seconds=7),
+    )
+    assert telemetry.overall().max == timedelta(seconds=7)
+    assert telemetry.probe_latency().max == timedelta(seconds=0.3)
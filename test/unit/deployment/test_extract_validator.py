@@ -1,7 +1,11 @@
+import asyncio
 import contextlib
 import logging
 import re
-from datetime import timedelta
+from datetime import (
+    datetime,
+    timedelta,
+)
 from typing import Any
 from unittest.mock import (
     Mock,
@@ -10,13 +14,18 @@ from unittest.mock import (
 )
 
 import exasol.bucketfs as bfs  # type: ignore
+import pyexasol  # type: ignore
 import pytest
 
+from exasol.python_extension_common.deployment.extract_telemetry import ExtractTelemetry
 from exasol.python_extension_common.deployment.extract_validator import (
+    MANIFEST_UDF_VERSION,
+    ExtractAbortedException,
     ExtractException,
     ExtractValidator,
     _udf_name,
 )
+from exasol.python_extension_common.deployment.polling import FixedPolling
 
 LOG = logging.getLogger(__name__)
 
@@ -57,8 +66,9 @@ class ConnectionMock:
 
 
 class Simulator:
-    def __init__(self, nodes: int, udf_results: list[list[any]], create_script=()):
+    def __init__(self, nodes: int, udf_results: list[list[any]], create_script=(), listener=None):
         self.create_script = create_script
+        self.listener = listener
         self.nodes = nodes
         self.udf = Mock(side_effect=udf_results)
         self.callback = Mock(side_effect=self._callback)
@@ -81,6 +91,7 @@ class Simulator:
             timeout=timedelta(seconds=10),
             interval=timedelta(seconds=1),
             callback=self.callback,
+            listener=self.listener,
         )
 
 
@@ -129,8 +140,8 @@ def mock_tenacity_wait(*wait_lists: list[int | float], max: int = 1000):
 @pytest.mark.parametrize(
     "schema, expected",
     [
-        (None, r'"alias_manifest_[0-9]+"'),
-        ("schema", r'"schema"\."alias_manifest_[0-9]+"'),
+        (None, r'"PEC_TMP_alias_manifest_[0-9a-f]+_[0-9]+"'),
+        ("schema", r'"schema"\."PEC_TMP_alias_manifest_[0-9a-f]+_[0-9]+"'),
     ],
 )
 def test_udf_name(schema, expected):
@@ -202,3 +213,410 @@ def test_reduced_timeout(archive_bucket_path):
         with mock_tenacity_wait([1], [2, 4]):
             sim.testee.verify_all_nodes("alias", "schema", archive_bucket_path)
     assert "1 of 4 nodes are still pending. IDs: [2]" == str(ex.value)
+
+
+def async_testee(sim: Simulator) -> ExtractValidator:
+    """
+    The event loop relies on time.monotonic(), hence mock_tenacity_wait
+    cannot be used for the asyncio tests. Short real durations are used
+    instead.
+    """
+    testee = sim.testee
+    testee._timeout = timedelta(seconds=0.2)
+    testee._polling = FixedPolling(timedelta(seconds=0.01))
+    return testee
+
+
+def test_async_success(archive_bucket_path):
+    sim = Simulator(
+        nodes=4,
+        udf_results=[
+            [[1, False], [2, False]],
+            [[1, True], [2, True]],
+        ],
+    )
+    asyncio.run(async_testee(sim).verify_all_nodes_async("alias", "schema", archive_bucket_path))
+    assert sim.callback.call_args_list == [call(4, [1, 2]), call(4, [])]
+
+
+def test_async_failure(archive_bucket_path):
+    sim = Simulator(nodes=4, udf_results=[])
+    sim.udf = Mock(return_value=[[1, False]])
+    with pytest.raises(ExtractException, match="1 of 4 nodes are still pending"):
+        asyncio.run(
+            async_testee(sim).verify_all_nodes_async("alias", "schema", archive_bucket_path)
+        )
+
+
+def test_async_cancel_drops_udf(archive_bucket_path):
+    statements = []
+    connection = Mock()
+    connection.execute.side_effect = lambda query, *args: (
+        statements.append(query.strip().splitlines()[0]) or Mock(fetchone=lambda: [4])
+    )
+    testee = ExtractValidator(connection, timeout=timedelta(seconds=60), interval=timedelta(0))
+    testee._check_all_nodes = Mock(side_effect=ExtractException("pending"))
+
+    async def cancel():
+        task = asyncio.create_task(
+            testee.verify_all_nodes_async("schema", "alias", archive_bucket_path)
+        )
+        while testee._check_all_nodes.call_count < 2:
+            await asyncio.sleep(0.001)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel())
+    assert statements[-1].startswith("DROP SCRIPT IF EXISTS")
+
+
+def test_polling_observes_progress(archive_bucket_path):
+    sim = Simulator(
+        nodes=4,
+        udf_results=[
+            [[1, False], [2, False]],
+            [[1, True], [2, True]],
+        ],
+    )
+    testee = sim.testee
+    polling = Mock(wraps=FixedPolling(timedelta(seconds=1)))
+    testee._polling = polling
+    with mock_tenacity_wait([1], [2]):
+        testee.verify_all_nodes("alias", "schema", archive_bucket_path)
+    polling.reset.assert_called_once()
+    assert polling.observe.call_args_list == [call(4, 2), call(4, 0)]
+
+
+class PersistentUdfConnection(ConnectionMock):
+    def __init__(self, script_text: str | None, current_schema: str | None = "MY_SCHEMA"):
+        super().__init__(
+            {
+                r"SELECT SCRIPT_TEXT": [script_text],
+                r"SELECT CURRENT_SCHEMA": lambda: [self.current_schema],
+                r"(CREATE|DROP|OPEN|CLOSE) ": (),
+                r"SELECT nproc\(\)": [2],
+                r"SELECT .*_MANIFEST_CHECK": [[1, True], [2, True]],
+            }
+        )
+        self.current_schema = current_schema
+        self.statements: list[str] = []
+
+    def execute(self, *args, **kwargs):
+        statement = args[0] if len(args) else kwargs["query"]
+        first_line = statement.strip().splitlines()[0]
+        self.statements.append(first_line)
+        # Creating or opening a schema makes it the current schema.
+        match = re.match(r'(CREATE SCHEMA IF NOT EXISTS|OPEN SCHEMA) "(\w+)"', first_line)
+        if match:
+            self.current_schema = match.group(2)
+        elif first_line.startswith("CLOSE SCHEMA"):
+            self.current_schema = None
+        return super().execute(*args, **kwargs)
+
+    def fetchval(self):
+        return next(self.values)
+
+
+def persistent_testee(connection: ConnectionMock) -> ExtractValidator:
+    return ExtractValidator(
+        pyexasol_connection=Mock(execute=connection.execute),
+        timeout=timedelta(seconds=10),
+        udf_schema="VALIDATION",
+    )
+
+
+def test_persistent_udf_installed(archive_bucket_path):
+    connection = PersistentUdfConnection(None)
+    testee = persistent_testee(connection)
+    with mock_tenacity_wait([1], [2]):
+        testee.verify_all_nodes("schema", "alias", archive_bucket_path)
+    assert connection.statements == [
+        "SELECT nproc()",
+        "SELECT SCRIPT_TEXT FROM SYS.EXA_ALL_SCRIPTS",
+        "SELECT CURRENT_SCHEMA;",
+        'CREATE SCHEMA IF NOT EXISTS "VALIDATION"',
+        'OPEN SCHEMA "MY_SCHEMA";',
+        "CREATE OR REPLACE alias SET SCRIPT",
+        'SELECT "VALIDATION"."alias_MANIFEST_CHECK"({argument!s})',
+    ]
+
+
+@pytest.mark.parametrize("current_schema", ["MY_SCHEMA", None])
+def test_persistent_udf_install_keeps_current_schema(archive_bucket_path, current_schema):
+    connection = PersistentUdfConnection(None, current_schema)
+    with mock_tenacity_wait([1], [2]):
+        persistent_testee(connection).verify_all_nodes("schema", "alias", archive_bucket_path)
+    assert 'CREATE SCHEMA IF NOT EXISTS "VALIDATION"' in connection.statements
+    assert connection.current_schema == current_schema
+
+
+@pytest.mark.parametrize(
+    "script_text, expected_create",
+    [
+        (f"CREATE ... # version: {MANIFEST_UDF_VERSION} ...", False),
+        ("CREATE ... # version: 0123456789ab ...", True),
+    ],
+)
+def test_persistent_udf_version(archive_bucket_path, script_text, expected_create):
+    connection = PersistentUdfConnection(script_text)
+    with mock_tenacity_wait([1], [2]):
+        persistent_testee(connection).verify_all_nodes("schema", "alias", archive_bucket_path)
+    created = any(s.startswith("CREATE OR REPLACE") for s in connection.statements)
+    assert created == expected_create
+    assert not any(s.startswith("DROP") for s in connection.statements)
+
+
+def test_persistent_udf_checked_once(archive_bucket_path):
+    connection = PersistentUdfConnection(None)
+    testee = persistent_testee(connection)
+    with mock_tenacity_wait([1], [2], [1], [2]):
+        testee.verify_all_nodes("schema", "alias", archive_bucket_path)
+        testee.verify_all_nodes("schema", "alias", archive_bucket_path)
+    lookups = [s for s in connection.statements if s.startswith("SELECT SCRIPT_TEXT")]
+    assert len(lookups) == 1
+
+
+class NodeTableConnection:
+    """
+    Simulates a cluster with a table for probing each node once. Node n gets
+    ready in attempt ready_at[n].
+    """
+
+    def __init__(self, ready_at: list[int]):
+        self.ready_at = ready_at
+        self.rows = 0
+        self.attempt = 0
+        self.probed: list[list[int]] = []
+        self.statements: list[str] = []
+        self.result: Any = None
+
+    @property
+    def nproc(self) -> int:
+        return len(self.ready_at)
+
+    def execute(self, query, params=None):
+        first_line = query.strip().splitlines()[0]
+        self.statements.append(first_line)
+        if first_line.startswith("SELECT nproc()"):
+            self.result = [self.nproc]
+        elif first_line.startswith("SELECT COUNT(*)"):
+            # Pretend the first insert distributes rows to half of the nodes.
+            self.result = (self.rows, min(self.nproc, self.rows // 8))
+        elif first_line.startswith("INSERT INTO"):
+            self.rows += params["n"]
+        elif first_line.startswith("SELECT") and "_manifest_" in first_line:
+            self.attempt += 1
+            nodes = [int(n) for n in re.search(r"IN \(([\d, ]*)\)", query).group(1).split(",")]
+            self.probed.append(nodes)
+            self.result = [[n, self.ready_at[n] <= self.attempt] for n in nodes]
+        return self
+
+    def fetchone(self):
+        return self.result
+
+    def fetchall(self):
+        return self.result
+
+
+def test_one_probe_per_node(archive_bucket_path):
+    connection = NodeTableConnection(ready_at=[1, 2, 1, 3])
+    callback = Mock()
+    testee = ExtractValidator(
+        pyexasol_connection=connection,
+        timeout=timedelta(seconds=10),
+        callback=callback,
+        one_probe_per_node=True,
+    )
+    with mock_tenacity_wait([1], [2, 4]):
+        testee.verify_all_nodes("schema", "alias", archive_bucket_path)
+    assert connection.probed == [[0, 1, 2, 3], [1, 3], [3]]
+    assert callback.call_args_list == [call(4, [1, 3]), call(4, [3]), call(4, [])]
+    # Two rounds are required for distributing the rows to all nodes.
+    assert sum(s.startswith("INSERT INTO") for s in connection.statements) == 2
+    assert connection.statements[-2].startswith("DROP SCRIPT IF EXISTS")
+    assert connection.statements[-1].startswith("DROP TABLE IF EXISTS")
+
+
+def test_node_table_distribution_failure(archive_bucket_path):
+    connection = NodeTableConnection(ready_at=[1, 1])
+    testee = ExtractValidator(connection, timeout=timedelta(seconds=10), one_probe_per_node=True)
+    with patch(
+        "exasol.python_extension_common.deployment.extract_validator._NODE_TABLE_MAX_ROUNDS", 0
+    ):
+        with pytest.raises(ExtractException, match="Failed to distribute"):
+            with mock_tenacity_wait([1]):
+                testee.verify_all_nodes("schema", "alias", archive_bucket_path)
+
+
+def test_unprobed_nodes_stay_confirmed(archive_bucket_path):
+    sim = Simulator(
+        nodes=4,
+        udf_results=[
+            [[1, True], [2, False]],
+            [[1, False], [2, True]],
+        ],
+    )
+    with mock_tenacity_wait([1], [2]):
+        sim.testee.verify_all_nodes("alias", "schema", archive_bucket_path)
+    assert sim.callback.call_args_list == [call(4, [2]), call(4, [])]
+
+
+def test_probe_events(archive_bucket_path):
+    connection = NodeTableConnection(ready_at=[1, 2, 1, 3])
+    telemetry = ExtractTelemetry()
+    testee = ExtractValidator(
+        pyexasol_connection=connection,
+        timeout=timedelta(seconds=10),
+        one_probe_per_node=True,
+        listener=telemetry,
+    )
+    with mock_tenacity_wait([1], [2, 4]):
+        testee.verify_all_nodes("schema", "alias", archive_bucket_path)
+    events = telemetry.events
+    assert [e.attempt for e in events] == [1, 2, 3]
+    assert [e.pending for e in events] == [[1, 3], [3], []]
+    assert [sorted(e.ready) for e in events] == [[0, 2], [1], [3]]
+    assert all(e.nproc == 4 and e.latency >= timedelta(0) for e in events)
+    assert sorted(telemetry.summary()) == [0, 1, 2, 3]
+    assert telemetry.overall().count == 4
+
+
+def test_failed_probe_events(archive_bucket_path):
+    error = query_error("VM error: cannot open /buckets/bfsdefault/default/slc/exaudf", "22002")
+    telemetry = ExtractTelemetry()
+    sim = Simulator(nodes=2, udf_results=[error, [[0, True], [1, True]]], listener=telemetry)
+    with mock_tenacity_wait([1], [2]):
+        sim.testee.verify_all_nodes("alias", "schema", archive_bucket_path)
+    events = telemetry.events
+    assert [e.attempt for e in events] == [1, 2]
+    assert [e.failed for e in events] == [True, False]
+    assert events[0].pending == [0, 1] and events[0].ready == {}
+    assert "cannot open" in events[0].error
+    assert telemetry.failures() == events[:1]
+    assert telemetry.probe_latency().count == 2
+
+
+class BatchConnection(NodeTableConnection):
+    """
+    Simulates a cluster checking multiple manifests per UDF call. Archive a
+    gets ready on node n in attempt ready_at[a][n], with a being the name of
+    the archive as seen from a UDF.
+    """
+
+    def __init__(self, ready_at: dict[str, list[int]]):
+        super().__init__(next(iter(ready_at.values())))
+        self.archive_ready_at = ready_at
+        self.arguments: list[list[str]] = []
+
+    def execute(self, query, params=None):
+        first_line = query.strip().splitlines()[0]
+        if first_line.startswith("SELECT") and "_manifests_" in first_line:
+            self.statements.append(first_line)
+            self.attempt += 1
+            manifests = params["argument"].split("\n")
+            self.arguments.append([m.split("/")[-2] for m in manifests])
+            self.result = [
+                [node, manifest, ready_at <= self.attempt]
+                for manifest in manifests
+                for node, ready_at in enumerate(self.archive_ready_at[manifest.split("/")[-2]])
+            ]
+            return self
+        return super().execute(query, params)
+
+
+def batch_paths(*names: str) -> list:
+    return [bucket_path(f"/folder/{name}") for name in names]
+
+
+def test_verify_archives(archive_bucket_path):
+    connection = BatchConnection({"a": [1, 1], "b": [1, 2], "c": [3, 1]})
+    testee = ExtractValidator(connection, timeout=timedelta(seconds=10))
+    with mock_tenacity_wait([1], [2, 4]):
+        readiness = testee.verify_archives(
+            "schema", "alias", batch_paths("a.tgz", "b.tgz", "c.tgz")
+        )
+    # Archives ready on all nodes are not checked again.
+    assert connection.arguments == [["a", "b", "c"], ["b", "c"], ["c"]]
+    assert all(all(nodes.values()) for nodes in readiness.values())
+    assert list(readiness) == [p.as_udf_path() for p in batch_paths("a.tgz", "b.tgz", "c.tgz")]
+    assert connection.statements[-1].startswith("DROP SCRIPT IF EXISTS")
+
+
+def test_verify_archives_failure(archive_bucket_path):
+    connection = BatchConnection({"a": [1, 1], "b": [1, 9]})
+    testee = ExtractValidator(connection, timeout=timedelta(seconds=10))
+    with pytest.raises(ExtractException, match="1 of 2 archives are still pending") as ex:
+        with mock_tenacity_wait([1], [2, 4]):
+            testee.verify_archives("schema", "alias", batch_paths("a.tgz", "b.tgz"))
+    a, b = (p.as_udf_path() for p in batch_paths("a.tgz", "b.tgz"))
+    assert ex.value.readiness == {a: {0: True, 1: True}, b: {0: True, 1: False}}
+
+
+def test_long_poll(archive_bucket_path):
+    statements = []
+
+    def execute(query, params=None):
+        statements.append((query.strip(), params))
+        if query.startswith("SELECT nproc()"):
+            return Mock(fetchone=lambda: [2])
+        return Mock(fetchall=lambda: [[0, True], [1, True]])
+
+    testee = ExtractValidator(
+        Mock(execute=execute),
+        timeout=timedelta(seconds=600),
+        long_poll=timedelta(seconds=20),
+    )
+    testee.verify_all_nodes("schema", "alias", archive_bucket_path)
+    create = next(q for q, _ in statements if q.startswith("CREATE OR REPLACE"))
+    assert "max_wait DOUBLE" in create
+    query, params = next((q, p) for q, p in statements if q.startswith("SELECT") and p)
+    assert "({argument!s}, {max_wait!r})" in query
+    assert params["max_wait"] == 20
+
+
+def test_long_poll_capped_by_deadline():
+    testee = ExtractValidator(
+        Mock(), timeout=timedelta(seconds=600), long_poll=timedelta(seconds=20)
+    )
+    deadline = datetime.now() + timedelta(seconds=5)
+    assert 4 < testee._max_wait(deadline) <= 5
+    assert testee._max_wait(datetime.now() - timedelta(seconds=1)) == 0
+
+
+def query_error(message: str, code: str = "42000") -> pyexasol.ExaQueryError:
+    connection = Mock(options={"verbose_error": False})
+    return pyexasol.ExaQueryError(connection, "CREATE ...", code, message)
+
+
+@pytest.mark.parametrize(
+    "error, diagnosis",
+    [
+        (query_error("insufficient privileges for creating script", "42500"), "privilege"),
+        (query_error("syntax error, unexpected IDENTIFIER_PART_"), "invalid"),
+        (query_error("script language PYTHON3_XY not found"), "not defined in SCRIPT_LANGUAGES"),
+        (
+            pyexasol.ExaCommunicationError(Mock(options={"verbose_error": False}), "closed"),
+            "connection",
+        ),
+    ],
+)
+def test_terminal_error_fails_fast(archive_bucket_path, error, diagnosis):
+    create_script = Mock(side_effect=error)
+    sim = Simulator(nodes=4, udf_results=[], create_script=create_script)
+    with pytest.raises(ExtractAbortedException, match=diagnosis) as ex:
+        with mock_tenacity_wait([1, 2, 3]):
+            sim.testee.verify_all_nodes("alias", "schema", archive_bucket_path)
+    assert create_script.call_count == 1
+    assert ex.value.__cause__ is error
+
+
+def test_retryable_query_error(archive_bucket_path):
+    error = query_error("VM error: cannot open /buckets/bfsdefault/default/slc/exaudf", "22002")
+    sim = Simulator(
+        nodes=4,
+        udf_results=[error, [[1, True], [2, True]]],
+    )
+    with mock_tenacity_wait([1], [2]):
+        sim.testee.verify_all_nodes("alias", "schema", archive_bucket_path)
+    assert sim.udf.call_count == 2
@@ -0,0 +1,96 @@
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import (
+    Mock,
+    create_autospec,
+    patch,
+)
+
+import exasol.bucketfs as bfs
+import pytest
+
+from exasol.python_extension_common.deployment.fleet_deployer import (
+    DeploymentTarget,
+    FleetDeployer,
+)
+from exasol.python_extension_common.deployment.language_container_deployer import (
+    LanguageContainerDeployer,
+)
+
+
+def make_target(name: str, bucket: str, upload_result: bool = True) -> DeploymentTarget:
+    deployer = create_autospec(LanguageContainerDeployer, instance=True)
+    bucket_api = bfs.MountedBucket("svc", bucket)
+    deployer.bucketfs_path = bfs.path.BucketPath("container", bucket_api=bucket_api)
+    deployer.upload_container.return_value = upload_result
+    deployer.activate_and_wait.return_value = True
+    deployer.warm_up_modules = None
+    return DeploymentTarget(name, deployer)
+
+
+@pytest.fixture
+def container_file() -> Path:
+    return Path("container.tar.gz")
+
+
+def test_upload_once_per_bucketfs(container_file):
+    targets = [make_target("a", "b1"), make_target("b", "b1"), make_target("c", "b2")]
+    results = FleetDeployer(targets, max_workers=2).run(container_file)
+    upload_calls = [t.deployer.upload_container.call_count for t in targets]
+    assert upload_calls == [1, 0, 1]
+    for target in targets:
+        target.deployer.activate_and_wait.assert_called_once_with(
+            "container.tar.gz", True, False, True, print_activation_statements=False
+        )
+    assert [r.name for r in results] == ["a", "b", "c"]
+    assert all(r.succeeded for r in results)
+    assert all(r.result.system_altered for r in results)
+
+
+def test_failing_target_does_not_abort_others(container_file):
+    targets = [make_target("a", "b1"), make_target("b", "b2"), make_target("c", "b3")]
+    targets[1].deployer.activate_and_wait.side_effect = RuntimeError("cluster down")
+    results = FleetDeployer(targets).run(container_file)
+    assert [r.succeeded for r in results] == [True, False, True]
+    assert str(results[1].error) == "cluster down"
+    assert results[1].result is None
+    assert targets[2].deployer.activate_and_wait.called
+
+
+def test_failing_upload_fails_group(container_file):
+    targets = [make_target("a", "b1"), make_target("b", "b1"), make_target("c", "b2")]
+    targets[0].deployer.upload_container.side_effect = RuntimeError("upload failed")
+    results = FleetDeployer(targets).run(container_file)
+    assert [r.succeeded for r in results] == [False, False, True]
+    assert not targets[0].deployer.activate_and_wait.called
+    assert not targets[1].deployer.activate_and_wait.called
+
+
+def test_skipped_upload(container_file):
+    targets = [make_target("a", "b1", upload_result=False)]
+    results = FleetDeployer(targets).run(container_file, "slc.tar.gz", skip_if_identical=True)
+    targets[0].deployer.upload_container.assert_called_once_with(container_file, "slc.tar.gz", True)
+    assert targets[0].deployer.activate_and_wait.call_args.args[3] is False
+    assert results[0].result.upload_skipped
+
+
+def test_non_bucket_path_targets_not_shared(container_file):
+    targets = [make_target("a", "b1"), make_target("b", "b1")]
+    for target in targets:
+        target.deployer.bucketfs_path = Mock()
+    FleetDeployer(targets).run(container_file)
+    assert all(t.deployer.upload_container.call_count == 1 for t in targets)
+
+
+def test_warm_up_targets_with_modules(container_file):
+    targets = [make_target("a", "b1"), make_target("b", "b2")]
+    targets[0].deployer.warm_up_modules = ["numpy"]
+    times = {0: timedelta(seconds=1)}
+    with patch(
+        "exasol.python_extension_common.deployment.fleet_deployer.warm_up_container",
+        return_value=times,
+    ) as warm_up_mock:
+        results = FleetDeployer(targets).run(container_file)
+    warm_up_mock.assert_called_once_with(targets[0].deployer, ["numpy"])
+    assert results[0].result.warm_up_times == times
+    assert results[1].result.warm_up_times is None
@@ -1,3 +1,4 @@
+from pathlib import Path
 from unittest.mock import (
     MagicMock,
     call,
@@ -7,7 +8,10 @@ import pytest
 from _pytest.monkeypatch import MonkeyPatch
 from exasol.slc import api
 from exasol.slc.models.compression_strategy import CompressionStrategy
+from exasol.slc.models.export_container_result import ExportContainerResult
+from exasol.slc.models.export_info import ExportInfo
 
+from exasol.python_extension_common.deployment.build_cache import BuildCache
 from exasol.python_extension_common.deployment.language_container_builder import (
     LanguageContainerBuilder,
     copy_slc_flavor,
@@ -70,3 +74,55 @@ def test_export(mock_export, tmp_path, compression_strategy):
             ),
         ]
         assert mock_export.call_args_list == expected_calls
+
+
+def test_add_bytecode_compilation():
+    with LanguageContainerBuilder("test_container") as builder:
+        builder.add_bytecode_compilation(min_coverage=0.9)
+        dockerfile = builder.release_dockerfile.read_text().splitlines()
+        assert dockerfile[-3:] == [
+            "COPY release/scripts/compile_bytecode.py /build_tools/compile_bytecode.py",
+            "",
+            "RUN python3.12 /build_tools/compile_bytecode.py --optimize 0 --min-coverage 0.9",
+        ]
+        assert (builder.flavor_base / "release" / "scripts" / "compile_bytecode.py").is_file()
+
+
+def test_add_slimming():
+    with LanguageContainerBuilder("test_container") as builder:
+        builder.add_bytecode_compilation(optimize=1)
+        builder.add_slimming(
+            directory_patterns=["examples", "test_*"], file_patterns=["*.md"], size_budget_mb=500
+        )
+        command = builder.release_dockerfile.read_text().splitlines()[-1]
+        assert command == (
+            "RUN python3.12 /build_tools/slim_site_packages.py --optimize 1"
+            " --report-file /build_info/size_report.json"
+            " --directory-pattern examples --directory-pattern 'test_*'"
+            " --file-pattern '*.md' --size-budget-mb 500"
+        )
+        assert (builder.flavor_base / "release" / "scripts" / "slim_site_packages.py").is_file()
+
+
+def test_export_with_build_cache(mock_export, tmp_path):
+    def export(flavor_path, output_directory, export_path, compression_strategy):
+        container = Path(export_path) / "test_container.tar.gz"
+        container.write_bytes(b"container")
+        export_info = ExportInfo(
+            str(container), "test_container", "test_container", "hash", True, "release", None
+        )
+        return ExportContainerResult({flavor_path[0]: {"release": export_info}}, None)
+
+    mock_export.side_effect = export
+    build_cache = BuildCache(tmp_path / "cache")
+    for i in range(2):
+        with LanguageContainerBuilder("test_container", build_cache=build_cache) as builder:
+            builder.write_file("flavor_base/dependencies/requirements.txt", "numpy\n")
+            export_path = tmp_path / f"export{i}"
+            export_path.mkdir()
+            result = builder.export(export_path)
+            export_info = result.export_infos[str(builder.flavor_path)]["release"]
+            assert Path(export_info.cache_file).read_bytes() == b"container"
+            assert Path(export_info.cache_file).parent == export_path
+    assert mock_export.call_count == 1
+    assert api.clean_all_images.call_count == 1
@@ -1,3 +1,6 @@
+import hashlib
+import re
+from datetime import timedelta
 from pathlib import (
     Path,
     PurePosixPath,
@@ -25,6 +28,10 @@ def bucket_path(path: str):
     return bfs.path.BucketPath(path, bucket_api=bucket_api)
 
 
+def language_settings(value: str) -> dict[LanguageActivationLevel, str]:
+    return {level: value for level in LanguageActivationLevel}
+
+
 def equal(a: bfs.path.BucketPath, b: bfs.path.BucketPath) -> bool:
     return (a._path, a._bucket_api) == (b._path, b._bucket_api)
 
@@ -92,7 +99,7 @@ def test_slc_deployer_deploy(container_deployer, container_file_name, container_
         wait_for_completion=False,
     )
     container_deployer.upload_container.assert_called_once_with(
-        container_file_path, container_file_name
+        container_file_path, container_file_name, False
     )
     expected_calls = [
         call(container_file_name, LanguageActivationLevel.Session, True),
@@ -106,7 +113,7 @@ def test_slc_deployer_upload(container_deployer, container_file_name, container_
         container_file=container_file_path, alter_system=False, wait_for_completion=False
     )
     container_deployer.upload_container.assert_called_once_with(
-        container_file_path, container_file_name
+        container_file_path, container_file_name, False
     )
     container_deployer.activate_container.assert_called_once_with(
         container_file_name, LanguageActivationLevel.Session, False
@@ -130,7 +137,7 @@ def test_slc_deployer_activate(container_deployer, container_file_name):
 
 @patch("exasol.python_extension_common.deployment.language_container_deployer.get_udf_path")
 @patch(
-    "exasol.python_extension_common.deployment.language_container_deployer.get_language_settings"
+    "exasol.python_extension_common.deployment.language_container_deployer.get_all_language_settings"
 )
 def test_slc_deployer_generate_activation_command(
     mock_lang_settings,
@@ -140,7 +147,9 @@ def test_slc_deployer_generate_activation_command(
     container_file_name,
     container_bfs_path,
 ):
-    mock_lang_settings.return_value = "R=builtin_r JAVA=builtin_java PYTHON3=builtin_python3"
+    mock_lang_settings.return_value = language_settings(
+        "R=builtin_r JAVA=builtin_java PYTHON3=builtin_python3"
+    )
     mock_udf_path.return_value = PurePosixPath(f"/buckets/{container_bfs_path}")
 
     alter_type = LanguageActivationLevel.Session
@@ -157,7 +166,7 @@ def test_slc_deployer_generate_activation_command(
 
 @patch("exasol.python_extension_common.deployment.language_container_deployer.get_udf_path")
 @patch(
-    "exasol.python_extension_common.deployment.language_container_deployer.get_language_settings"
+    "exasol.python_extension_common.deployment.language_container_deployer.get_all_language_settings"
 )
 def test_slc_deployer_generate_activation_command_override(
     mock_lang_settings,
@@ -168,7 +177,7 @@ def test_slc_deployer_generate_activation_command_override(
     container_bfs_path,
 ):
     current_bfs_path = "bfsdefault/default/container_abc"
-    mock_lang_settings.return_value = (
+    mock_lang_settings.return_value = language_settings(
         "R=builtin_r JAVA=builtin_java PYTHON3=builtin_python3 "
         f"{language_alias}=localzmq+protobuf:///{current_bfs_path}?"
         f"lang=python#/buckets/{current_bfs_path}/exaudf/exaudfclient"
@@ -191,7 +200,7 @@ def test_slc_deployer_generate_activation_command_override(
 
 @patch("exasol.python_extension_common.deployment.language_container_deployer.get_udf_path")
 @patch(
-    "exasol.python_extension_common.deployment.language_container_deployer.get_language_settings"
+    "exasol.python_extension_common.deployment.language_container_deployer.get_all_language_settings"
 )
 def test_slc_deployer_generate_activation_command_failure(
     mock_lang_settings,
@@ -202,7 +211,7 @@ def test_slc_deployer_generate_activation_command_failure(
     container_bfs_path,
 ):
     current_bfs_path = "bfsdefault/default/container_abc"
-    mock_lang_settings.return_value = (
+    mock_lang_settings.return_value = language_settings(
         "R=builtin_r JAVA=builtin_java PYTHON3=builtin_python3 "
         f"{language_alias}=localzmq+protobuf:///{current_bfs_path}?"
         f"lang=python#/buckets/{current_bfs_path}/exaudf/exaudfclient"
@@ -264,3 +273,205 @@ def test_print_alter_session_activation(
         container_deployer.generate_activation_command.called
         == invocation_generate_activation_command_expected
     )
+
+
+@patch("exasol.python_extension_common.deployment.language_container_deployer.download_container")
+def test_download_and_run(mock_download, container_deployer, container_file_name):
+    container_deployer.run = MagicMock()
+    container_deployer.download_and_run(
+        "https://some/url",
+        container_file_name,
+        wait_for_completion=False,
+        chunk_size=100,
+        connections=4,
+    )
+    assert mock_download.call_args.args[0] == "https://some/url"
+    assert mock_download.call_args.args[2:] == (100, 4)
+    tmp_file = mock_download.call_args.args[1]
+    assert container_deployer.run.call_args.args[:2] == (Path(tmp_file.name), container_file_name)
+
+
+@patch(
+    "exasol.python_extension_common.deployment.language_container_deployer.open_container_stream"
+)
+def test_download_and_run_stream_to_bucketfs(
+    mock_open_stream, container_deployer, container_file_name
+):
+    upload_path = Mock()
+    container_deployer._upload_path = Mock(return_value=upload_path)
+    container_deployer.download_and_run(
+        "https://some/url", container_file_name, stream_to_bucketfs=True
+    )
+    stream = mock_open_stream.return_value.__enter__.return_value
+    upload_path.write.assert_called_once_with(stream)
+    container_deployer.upload_container.assert_not_called()
+    assert container_deployer._extract_validator.verify_all_nodes.called
+
+
+def test_download_and_run_with_cache(container_deployer, container_file_name, container_file):
+    container = MagicMock()
+    container.__enter__.return_value.name = str(container_file)
+    container_cache = Mock(get=Mock(return_value=container))
+    container_deployer._container_cache = container_cache
+    container_deployer.run = MagicMock()
+    container_deployer.download_and_run("https://some/url", container_file_name)
+    container_cache.get.assert_called_once_with("https://some/url")
+    assert container_deployer.run.call_args.args[:2] == (container_file, container_file_name)
+    container.__exit__.assert_called_once()
+
+
+@pytest.fixture
+def mounted_deployer(tmp_path, mock_pyexasol_conn, language_alias) -> LanguageContainerDeployer:
+    bucket_api = bfs.MountedBucket(base_path=str(tmp_path / "bucket"))
+    deployer = LanguageContainerDeployer(
+        pyexasol_connection=mock_pyexasol_conn,
+        language_alias=language_alias,
+        bucketfs_path=bfs.path.BucketPath("", bucket_api=bucket_api),
+        extract_validator=Mock(),
+    )
+    deployer.activate_container = MagicMock()
+    return deployer
+
+
+def test_upload_container_stores_hash(mounted_deployer, tmp_path):
+    container = tmp_path / "container.tar.gz"
+    container.write_bytes(b"container content")
+    assert mounted_deployer.upload_container(container, "slc.tar.gz", skip_if_identical=True)
+    bucket = tmp_path / "bucket"
+    assert (bucket / "slc.tar.gz").read_bytes() == b"container content"
+    assert (bucket / "slc.tar.gz.sha256").read_text() == hashlib.sha256(
+        b"container content"
+    ).hexdigest()
+
+
+@patch("exasol.python_extension_common.deployment.language_container_deployer.HashingReader")
+def test_upload_container_hashes_once(hashing_reader_mock, mounted_deployer, tmp_path):
+    container = tmp_path / "container.tar.gz"
+    container.write_bytes(b"container content")
+    mounted_deployer.upload_container(container, "slc.tar.gz", skip_if_identical=True)
+    hashing_reader_mock.assert_not_called()
+
+
+def test_upload_container_skipped_if_identical(mounted_deployer, tmp_path):
+    container = tmp_path / "container.tar.gz"
+    container.write_bytes(b"container content")
+    mounted_deployer.upload_container(container, "slc.tar.gz", skip_if_identical=True)
+    assert not mounted_deployer.upload_container(container, "slc.tar.gz", skip_if_identical=True)
+    container.write_bytes(b"changed content")
+    assert mounted_deployer.upload_container(container, "slc.tar.gz", skip_if_identical=True)
+    assert (tmp_path / "bucket" / "slc.tar.gz").read_bytes() == b"changed content"
+
+
+def test_upload_container_without_hash(mounted_deployer, tmp_path):
+    container = tmp_path / "container.tar.gz"
+    container.write_bytes(b"container content")
+    mounted_deployer.upload_container(container, "slc.tar.gz")
+    assert not (tmp_path / "bucket" / "slc.tar.gz.sha256").exists()
+    assert mounted_deployer.upload_container(container, "slc.tar.gz", skip_if_identical=True)
+    assert (tmp_path / "bucket" / "slc.tar.gz.sha256").exists()
+
+
+def test_run_reports_skipped_upload(mounted_deployer, tmp_path):
+    container = tmp_path / "container.tar.gz"
+    container.write_bytes(b"container content")
+    first = mounted_deployer.run(container, skip_if_identical=True)
+    second = mounted_deployer.run(container, skip_if_identical=True)
+    assert not first.upload_skipped
+    assert second.upload_skipped
+    assert mounted_deployer._extract_validator.verify_all_nodes.call_count == 1
+    assert mounted_deployer.activate_container.call_count == 4
+
+
+@pytest.fixture
+def settings_conn() -> ExaConnection:
+    conn = create_autospec(ExaConnection)
+    conn.execute.return_value.fetchall.return_value = [("R=builtin_r", "R=builtin_r")]
+    return conn
+
+
+@pytest.fixture
+def settings_deployer(settings_conn, language_alias, sample_bucket_path):
+    return LanguageContainerDeployer(
+        pyexasol_connection=settings_conn,
+        language_alias=language_alias,
+        bucketfs_path=sample_bucket_path,
+        extract_validator=Mock(),
+    )
+
+
+def settings_queries(conn) -> int:
+    return sum("EXA_PARAMETERS" in c.args[0] for c in conn.execute.call_args_list)
+
+
+def test_language_settings_read_once_per_alter(settings_deployer, settings_conn, capsys):
+    settings_deployer.activate_and_wait("slc.tar.gz", False, False, False, True)
+    # One read for the session activation, one after the ALTER SESSION for
+    # printing both activation statements.
+    assert settings_queries(settings_conn) == 2
+
+
+def test_language_settings_not_cached_outside_deployment(settings_deployer, settings_conn):
+    for _ in range(2):
+        settings_deployer.generate_activation_command("slc.tar.gz", LanguageActivationLevel.Session)
+    assert settings_queries(settings_conn) == 2
+
+
+def alter_statements(conn, level: LanguageActivationLevel) -> list[str]:
+    return [
+        c.args[0]
+        for c in conn.execute.call_args_list
+        if c.args[0].startswith(f"ALTER {level.value}")
+    ]
+
+
+def test_activation_in_effect_skips_alter_system(settings_deployer, settings_conn):
+    definition = settings_deployer.get_language_definition("slc.tar.gz")
+    settings_conn.execute.return_value.fetchall.return_value = [
+        (f"R=builtin_r {definition}", "R=builtin_r")
+    ]
+    altered = settings_deployer.activate_and_wait("slc.tar.gz", True, True, False, False)
+    assert not altered
+    assert alter_statements(settings_conn, LanguageActivationLevel.System) == []
+    assert len(alter_statements(settings_conn, LanguageActivationLevel.Session)) == 1
+
+
+def test_unchanged_activation_without_override(settings_deployer, settings_conn):
+    definition = settings_deployer.get_language_definition("slc.tar.gz")
+    settings_conn.execute.return_value.fetchall.return_value = [
+        (f"R=builtin_r {definition}", f"R=builtin_r {definition}")
+    ]
+    altered = settings_deployer.activate_and_wait("slc.tar.gz", True, False, False, False)
+    assert not altered
+    assert alter_statements(settings_conn, LanguageActivationLevel.System) == []
+
+
+def test_other_container_without_override_fails(settings_deployer, settings_conn):
+    definition = settings_deployer.get_language_definition("other.tar.gz")
+    settings_conn.execute.return_value.fetchall.return_value = [
+        (f"R=builtin_r {definition}", "R=builtin_r")
+    ]
+    with pytest.raises(RuntimeError, match="already in use"):
+        settings_deployer.activate_and_wait("slc.tar.gz", True, False, False, False)
+
+
+def test_changed_activation_alters_system(settings_deployer, settings_conn):
+    altered = settings_deployer.activate_and_wait("slc.tar.gz", True, False, False, False)
+    assert altered
+    assert len(alter_statements(settings_conn, LanguageActivationLevel.System)) == 1
+
+
+def test_run_reports_system_altered(settings_deployer):
+    result = settings_deployer.run(bucket_file_path="slc.tar.gz", wait_for_completion=False)
+    assert result.system_altered
+
+
+@patch("exasol.python_extension_common.deployment.udf_warm_up.warm_up_nodes")
+def test_run_warms_up_nodes(warm_up_mock, mounted_deployer, tmp_path):
+    warm_up_mock.return_value = {0: timedelta(seconds=1)}
+    mounted_deployer._warm_up_modules = ["numpy"]
+    mounted_deployer._extract_validator.udf_schema = "VALIDATION"
+    container = tmp_path / "container.tar.gz"
+    container.write_bytes(b"container content")
+    result = mounted_deployer.run(container)
+    assert result.warm_up_times == {0: timedelta(seconds=1)}
+    assert warm_up_mock.call_args.args[1:] == ("VALIDATION", "PYTHON3_TEST", ["numpy"])
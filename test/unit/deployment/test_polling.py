@@ -0,0 +1,72 @@
+from datetime import timedelta
+from unittest.mock import (
+    Mock,
+    patch,
+)
+
+import pytest
+
+from exasol.python_extension_common.deployment.polling import (
+    AdaptivePolling,
+    FixedPolling,
+)
+
+
+def retry_state(attempt_number: int) -> Mock:
+    return Mock(attempt_number=attempt_number)
+
+
+def test_fixed():
+    assert FixedPolling(timedelta(seconds=5))(retry_state(3)) == 5
+
+
+def test_backoff_without_jitter():
+    testee = AdaptivePolling(initial=timedelta(seconds=1), maximum=timedelta(seconds=10), jitter=0)
+    waits = [testee(retry_state(n)) for n in range(1, 7)]
+    assert waits == [1, 2, 4, 8, 10, 10]
+
+
+@pytest.mark.parametrize("attempt_number", [1100, 10**6])
+def test_backoff_with_many_attempts(attempt_number):
+    testee = AdaptivePolling(maximum=timedelta(seconds=0.5), jitter=0)
+    assert testee(retry_state(attempt_number)) == 0.5
+    testee = AdaptivePolling(maximum=timedelta(seconds=30), jitter=0)
+    assert testee(retry_state(attempt_number)) == 30
+
+
+def test_jitter_respects_maximum():
+    testee = AdaptivePolling(maximum=timedelta(seconds=10), jitter=0.5)
+    for n in range(1, 10):
+        assert 0 < testee(retry_state(n)) <= 10
+
+
+@patch("exasol.python_extension_common.deployment.polling.time.monotonic")
+def test_estimate(monotonic):
+    testee = AdaptivePolling(initial=timedelta(seconds=1), maximum=timedelta(seconds=30), jitter=0)
+    monotonic.side_effect = [100, 110]
+    testee.observe(8, 8)
+    assert testee.estimate() is None
+    testee.observe(8, 4)
+    # 4 nodes completed in 10 seconds, the remaining 4 need another 10 seconds.
+    assert testee.estimate() == pytest.approx(10)
+    assert testee(retry_state(1)) == pytest.approx(10)
+
+
+@patch("exasol.python_extension_common.deployment.polling.time.monotonic")
+def test_no_progress_falls_back_to_backoff(monotonic):
+    testee = AdaptivePolling(initial=timedelta(seconds=2), jitter=0)
+    monotonic.side_effect = [100, 110]
+    testee.observe(8, 8)
+    testee.observe(8, 8)
+    assert testee.estimate() is None
+    assert testee(retry_state(2)) == 4
+
+
+@patch("exasol.python_extension_common.deployment.polling.time.monotonic")
+def test_reset(monotonic):
+    testee = AdaptivePolling()
+    monotonic.side_effect = [100, 110]
+    testee.observe(8, 8)
+    testee.observe(8, 4)
+    testee.reset()
+    assert testee.estimate() is None
@@ -0,0 +1,131 @@
+import asyncio
+import re
+
+import pytest
+
+from exasol.python_extension_common.deployment.scratch_schema_pool import (
+    ScratchSchemaPool,
+)
+from exasol.python_extension_common.deployment.temp_objects import temp_object_name
+
+# Names of temporary objects created by the current process.
+SCRIPT = temp_object_name("alias_manifest")
+TABLE = SCRIPT + "_NODES"
+
+
+class SchemaConnection:
+    """
+    Simulates the statements of the ScratchSchemaPool against a database
+    holding the specified objects per schema.
+    """
+
+    def __init__(self, objects: dict[str, set[tuple[str, str]]] | None = None):
+        self.objects = objects or {}
+        self.statements: list[str] = []
+        self.result = None
+
+    def execute(self, query: str, params: dict | None = None):
+        statement = query.strip()
+        self.statements.append(statement)
+        if statement.startswith("SELECT CURRENT_SCHEMA"):
+            self.result = "MY_SCHEMA"
+        elif match := re.match(r'CREATE SCHEMA IF NOT EXISTS "(\w+)"', statement):
+            self.objects.setdefault(match.group(1), set())
+        elif statement.startswith("SELECT OBJECT_TYPE"):
+            self.result = list(self.objects.get(params["schema"], ()))
+        elif match := re.match(r'DROP (\w+) IF EXISTS "(\w+)"\."(\w+)"', statement):
+            object_type, schema, name = match.groups()
+            self.objects[schema].discard((object_type, name))
+        return self
+
+    def fetchval(self):
+        return self.result
+
+    def fetchall(self):
+        return self.result
+
+    def create(self, schema: str, object_type: str, name: str):
+        self.objects[schema].add((object_type, name))
+
+
+def test_lease_creates_schema_once():
+    conn = SchemaConnection()
+    testee = ScratchSchemaPool(size=2, prefix="SCRATCH")
+    for _ in range(3):
+        with testee.lease(conn) as schema:
+            assert schema == "SCRATCH_0"
+    creates = [s for s in conn.statements if s.startswith("CREATE SCHEMA")]
+    assert creates == ['CREATE SCHEMA IF NOT EXISTS "SCRATCH_0"']
+    assert 'OPEN SCHEMA "MY_SCHEMA";' in conn.statements
+    assert not any(s.startswith("DROP SCHEMA") for s in conn.statements)
+
+
+def test_lease_drops_only_objects_created_during_lease():
+    conn = SchemaConnection({"SCRATCH_0": {("TABLE", "KEEP")}})
+    testee = ScratchSchemaPool(size=1, prefix="SCRATCH")
+    with testee.lease(conn) as schema:
+        conn.create(schema, "TABLE", TABLE)
+        conn.create(schema, "SCRIPT", SCRIPT)
+    assert conn.objects["SCRATCH_0"] == {("TABLE", "KEEP")}
+    drops = [s for s in conn.statements if s.startswith("DROP")]
+    assert drops == [
+        f'DROP SCRIPT IF EXISTS "SCRATCH_0"."{SCRIPT}"',
+        f'DROP TABLE IF EXISTS "SCRATCH_0"."{TABLE}"',
+    ]
+
+
+def test_lease_keeps_objects_of_other_processes():
+    conn = SchemaConnection()
+    testee = ScratchSchemaPool(size=1, prefix="SCRATCH")
+    other_process = "PEC_TMP_alias_manifest_0123abcd_1700000000"
+    with testee.lease(conn) as schema:
+        conn.create(schema, "SCRIPT", other_process)
+        conn.create(schema, "TABLE", other_process + "_NODES")
+        conn.create(schema, "TABLE", "USER_TABLE")
+        conn.create(schema, "SCRIPT", SCRIPT)
+    assert conn.objects["SCRATCH_0"] == {
+        ("SCRIPT", other_process),
+        ("TABLE", other_process + "_NODES"),
+        ("TABLE", "USER_TABLE"),
+    }
+
+
+def test_lease_cleans_up_on_error():
+    conn = SchemaConnection()
+    testee = ScratchSchemaPool(size=1, prefix="SCRATCH")
+    with pytest.raises(RuntimeError):
+        with testee.lease(conn) as schema:
+            conn.create(schema, "SCRIPT", SCRIPT)
+            raise RuntimeError("failed")
+    assert conn.objects["SCRATCH_0"] == set()
+    with testee.lease(conn) as schema:
+        assert schema == "SCRATCH_0"
+
+
+def test_concurrent_leases_get_different_schemas():
+    conn = SchemaConnection()
+    testee = ScratchSchemaPool(size=1, prefix="SCRATCH")
+    with testee.lease(conn) as first:
+        with testee.lease(conn) as second:
+            assert first == "SCRATCH_0"
+            # The pool is exhausted, falling back to a temporary schema.
+            assert second != first
+    assert any(s.startswith("DROP SCHEMA") for s in conn.statements)
+
+
+def test_lease_async():
+    conn = SchemaConnection()
+    testee = ScratchSchemaPool(size=1, prefix="SCRATCH")
+
+    async def lease():
+        async with testee.lease_async(conn) as schema:
+            conn.create(schema, "SCRIPT", SCRIPT)
+            return schema
+
+    assert asyncio.run(lease()) == "SCRATCH_0"
+    assert conn.objects["SCRATCH_0"] == set()
+
+
+def test_invalid_size():
+    with pytest.raises(ValueError):
+        ScratchSchemaPool(size=0)
@@ -0,0 +1,57 @@
+import pytest
+
+from exasol.python_extension_common.deployment.script_languages import ScriptLanguages
+
+SETTINGS = (
+    "R=builtin_r JAVA=builtin_java PYTHON3=builtin_python3 "
+    "MY_PY=localzmq+protobuf:///bfsdefault/default/slc?lang=python#"
+    "/buckets/bfsdefault/default/slc/exaudf/exaudfclient"
+)
+
+
+def test_round_trip():
+    assert str(ScriptLanguages.parse(SETTINGS)) == SETTINGS
+
+
+def test_parse_empty():
+    languages = ScriptLanguages.parse("")
+    assert len(languages) == 0
+    assert str(languages) == ""
+
+
+def test_lookup():
+    languages = ScriptLanguages.parse(SETTINGS)
+    assert languages["JAVA"] == "builtin_java"
+    assert "MY_PY" in languages
+    assert "MY" not in languages
+    assert languages.definition("R") == "R=builtin_r"
+
+
+def test_replace_keeps_position():
+    languages = ScriptLanguages.parse("R=builtin_r JAVA=builtin_java PYTHON3=builtin_python3")
+    languages["JAVA"] = "other_java"
+    assert str(languages) == "R=builtin_r JAVA=other_java PYTHON3=builtin_python3"
+
+
+def test_update_several_aliases():
+    languages = ScriptLanguages.parse("R=builtin_r JAVA=builtin_java")
+    languages.update({"JAVA": "other_java", "PY": "builtin_python3"})
+    del languages["R"]
+    assert str(languages) == "JAVA=other_java PY=builtin_python3"
+
+
+@pytest.mark.parametrize("settings", ["R", "R=builtin_r =x", "R-1=builtin_r"])
+def test_parse_invalid(settings):
+    with pytest.raises(ValueError):
+        ScriptLanguages.parse(settings)
+
+
+@pytest.mark.parametrize("url", ["", "a b"])
+def test_invalid_url(url):
+    with pytest.raises(ValueError):
+        ScriptLanguages()["R"] = url
+
+
+def test_to_sql_literal():
+    languages = ScriptLanguages({"R": "builtin_r", "X": "url?q='1'"})
+    assert languages.to_sql_literal() == "'R=builtin_r X=url?q=''1'''"
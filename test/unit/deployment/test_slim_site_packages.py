@@ -0,0 +1,110 @@
+import json
+import shutil
+import sys
+from pathlib import Path
+
+from exasol.python_extension_common.deployment.container_scripts.slim_site_packages import (
+    distribution_sizes,
+    main,
+)
+
+CACHE_TAG = sys.implementation.cache_tag
+
+
+def write(path: Path, size: int) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    return path
+
+
+def install(site_packages: Path, name: str, files: dict[str, int]) -> None:
+    """
+    Creates the files of a distribution and its metadata, listing the files.
+    """
+    for file, size in files.items():
+        write(site_packages / file, size)
+    dist_info = site_packages / f"{name}-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text(f"Metadata-Version: 2.1\nName: {name}\nVersion: 1.0\n")
+    (dist_info / "RECORD").write_text("".join(f"{file},,\n" for file in files))
+
+
+def create_site_packages(path: Path) -> Path:
+    site_packages = path / "site-packages"
+    install(
+        site_packages,
+        "big",
+        {
+            "big/__init__.py": 1000,
+            "big/tests/test_big.py": 5000,
+            "tests/test_big.py": 5000,
+            "docs/index.rst": 3000,
+            "big/__init__.pyi": 100,
+            f"big/__pycache__/__init__.{CACHE_TAG}.pyc": 500,
+            f"big/__pycache__/__init__.{CACHE_TAG}.opt-1.pyc": 500,
+            "big/__pycache__/__init__.cpython-27.pyc": 500,
+            "big/data/huge.bin": 20000,
+        },
+    )
+    install(site_packages, "small", {"small.py": 200})
+    return site_packages
+
+
+def test_slim_site_packages(tmp_path):
+    site_packages = create_site_packages(tmp_path)
+    report_file = tmp_path / "report.json"
+    assert main([str(site_packages), "--report-file", str(report_file)]) == 0
+    remaining = sorted(
+        str(f.relative_to(site_packages))
+        for f in site_packages.rglob("*")
+        if f.is_file() and ".dist-info" not in str(f)
+    )
+    assert remaining == [
+        "big/__init__.py",
+        f"big/__pycache__/__init__.{CACHE_TAG}.pyc",
+        "big/data/huge.bin",
+        "big/tests/test_big.py",
+        "small.py",
+    ]
+    report = json.loads(report_file.read_text())
+    assert report["removed"] == 5000 + 3000 + 100 + 500 + 500
+    assert list(report["distributions"].items()) == [("big", 26500), ("small", 200)]
+
+
+def test_top_level_directory_of_no_distribution_kept(tmp_path):
+    site_packages = create_site_packages(tmp_path)
+    write(site_packages / "docs" / "other.rst", 100)
+    shutil.rmtree(site_packages / "big-1.0.dist-info")
+    main([str(site_packages)])
+    assert (site_packages / "docs" / "other.rst").is_file()
+    assert (site_packages / "tests" / "test_big.py").is_file()
+
+
+def test_slim_site_packages_with_patterns(tmp_path):
+    site_packages = create_site_packages(tmp_path)
+    main(
+        [
+            str(site_packages),
+            "--directory-pattern",
+            "data",
+            "--directory-pattern",
+            "tests",
+            "--optimize",
+            "1",
+        ]
+    )
+    assert not (site_packages / "big" / "data").exists()
+    assert not (site_packages / "big" / "tests").exists()
+    pycache = site_packages / "big" / "__pycache__"
+    assert [f.name for f in pycache.iterdir()] == [f"__init__.{CACHE_TAG}.opt-1.pyc"]
+
+
+def test_size_budget(tmp_path):
+    site_packages = create_site_packages(tmp_path)
+    assert main([str(site_packages), "--size-budget-mb", "0.01"]) == 1
+    assert main([str(site_packages), "--size-budget-mb", "1"]) == 0
+
+
+def test_distribution_sizes(tmp_path):
+    site_packages = create_site_packages(tmp_path)
+    assert distribution_sizes([site_packages]) == {"big": 35600, "small": 200}
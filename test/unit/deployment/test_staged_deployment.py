@@ -0,0 +1,125 @@
+import hashlib
+import re
+from unittest.mock import (
+    Mock,
+    patch,
+)
+
+import exasol.bucketfs as bfs
+import pytest
+
+from exasol.python_extension_common.deployment.language_container_deployer import (
+    LanguageActivationLevel,
+    LanguageContainerDeployer,
+)
+from exasol.python_extension_common.deployment.staged_deployment import (
+    run_staged,
+    versioned_bucket_file_path,
+)
+
+
+@pytest.fixture(scope="module")
+def language_alias() -> str:
+    return "PYTHON3_TEST"
+
+
+class SettingsConnection:
+    """
+    Simulates the language settings of a database, applying the ALTER
+    statements at both levels.
+    """
+
+    def __init__(self, settings: str):
+        self.settings = {level: settings for level in LanguageActivationLevel}
+        self.statements: list[str] = []
+        self.result: list = []
+
+    def execute(self, query: str, *args, **kwargs):
+        self.statements.append(query)
+        system = self.settings[LanguageActivationLevel.System]
+        session = self.settings[LanguageActivationLevel.Session]
+        if '"SYSTEM_VALUE", "SESSION_VALUE"' in query:
+            self.result = [(system, session)]
+        elif '"SESSION_VALUE"' in query:
+            self.result = [(session,)]
+        elif match := re.match(r"ALTER (\w+) SET SCRIPT_LANGUAGES='(.*)';", query):
+            self.settings[LanguageActivationLevel(match.group(1))] = match.group(2)
+        return self
+
+    def fetchall(self):
+        return self.result
+
+
+def test_run_staged(tmp_path, language_alias):
+    conn = SettingsConnection(f"R=builtin_r {language_alias}=localzmq+protobuf:///old")
+    bucket_api = bfs.MountedBucket(base_path=str(tmp_path / "bucket"))
+    validated = []
+
+    def verify_all_nodes(schema, alias, path):
+        validated.append((alias, list(conn.settings.values())))
+
+    deployer = LanguageContainerDeployer(
+        pyexasol_connection=conn,
+        language_alias=language_alias,
+        bucketfs_path=bfs.path.BucketPath("", bucket_api=bucket_api),
+        extract_validator=Mock(udf_schema="VALIDATION", verify_all_nodes=verify_all_nodes),
+    )
+    container = tmp_path / "container.tar.gz"
+    container.write_bytes(b"container content")
+    result = run_staged(deployer, container, "slc.tar.gz", allow_override=True)
+
+    version = hashlib.sha256(b"container content").hexdigest()[:12]
+    versioned_path = versioned_bucket_file_path("slc.tar.gz", version)
+    assert versioned_path == f"{version}/slc.tar.gz"
+    assert (tmp_path / "bucket" / versioned_path).read_bytes() == b"container content"
+    assert result.system_altered and not result.upload_skipped
+    # The extraction is validated under the staging alias, before the
+    # production alias is switched.
+    staging_alias = f"{language_alias}_STAGING"
+    ((alias, settings),) = validated
+    assert alias == staging_alias
+    assert all(f"{language_alias}=localzmq+protobuf:///old" in s for s in settings)
+    definition = deployer.get_language_definition(versioned_path)
+    for level in LanguageActivationLevel:
+        languages = conn.settings[level].split()
+        assert languages == ["R=builtin_r", definition]
+    assert sum(s.startswith("ALTER SYSTEM") for s in conn.statements) == 1
+
+
+def test_run_staged_failure_removes_staging_alias(tmp_path, language_alias):
+    old_settings = f"R=builtin_r {language_alias}=localzmq+protobuf:///old"
+    conn = SettingsConnection(old_settings)
+    bucket_api = bfs.MountedBucket(base_path=str(tmp_path / "bucket"))
+    validator = Mock(udf_schema="VALIDATION")
+    validator.verify_all_nodes.side_effect = RuntimeError("extraction failed")
+    deployer = LanguageContainerDeployer(
+        pyexasol_connection=conn,
+        language_alias=language_alias,
+        bucketfs_path=bfs.path.BucketPath("", bucket_api=bucket_api),
+        extract_validator=validator,
+    )
+    container = tmp_path / "container.tar.gz"
+    container.write_bytes(b"container content")
+    with pytest.raises(RuntimeError, match="extraction failed"):
+        run_staged(deployer, container, "slc.tar.gz", allow_override=True)
+    assert all(settings == old_settings for settings in conn.settings.values())
+
+
+@patch("exasol.python_extension_common.deployment.language_container_deployer.HashingReader")
+@patch("exasol.python_extension_common.deployment.language_container_deployer.file_sha256")
+def test_run_staged_hashes_once(deployer_sha256, hashing_reader, tmp_path, language_alias):
+    conn = SettingsConnection("R=builtin_r")
+    bucket_api = bfs.MountedBucket(base_path=str(tmp_path / "bucket"))
+    deployer = LanguageContainerDeployer(
+        pyexasol_connection=conn,
+        language_alias=language_alias,
+        bucketfs_path=bfs.path.BucketPath("", bucket_api=bucket_api),
+        extract_validator=Mock(udf_schema="VALIDATION"),
+    )
+    container = tmp_path / "container.tar.gz"
+    container.write_bytes(b"container content")
+    run_staged(deployer, container, "slc.tar.gz")
+    deployer_sha256.assert_not_called()
+    hashing_reader.assert_not_called()
+    version = hashlib.sha256(b"container content").hexdigest()
+    assert (tmp_path / "bucket" / version[:12] / "slc.tar.gz.sha256").read_text() == version
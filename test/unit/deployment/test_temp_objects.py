@@ -0,0 +1,99 @@
+from datetime import (
+    datetime,
+    timedelta,
+)
+from unittest.mock import Mock
+
+import pytest
+
+from exasol.python_extension_common.deployment.temp_objects import (
+    TempObject,
+    find_temp_objects,
+    is_own_temp_object,
+    process_tag,
+    sweep_temp_objects,
+    temp_object_creation_time,
+    temp_object_name,
+)
+
+NOW = datetime.now().replace(microsecond=0)
+OLD = NOW - timedelta(days=2)
+
+
+def name(base: str, created: datetime = OLD) -> str:
+    return temp_object_name(base, created)
+
+
+def test_temp_object_name():
+    expected = f"PEC_TMP_alias_manifest_{process_tag()}_{OLD.timestamp():.0f}"
+    assert temp_object_name("alias_manifest", OLD) == expected
+
+
+@pytest.mark.parametrize(
+    "object_name, expected",
+    [
+        (name("alias_manifest"), True),
+        (name("alias_manifest") + "_NODES", True),
+        ("PEC_TMP_alias_manifest_0123abcd_1700000000", False),
+        ("alias_manifest", False),
+    ],
+)
+def test_is_own_temp_object(object_name, expected):
+    assert is_own_temp_object(object_name) == expected
+
+
+@pytest.mark.parametrize(
+    "object_name, expected",
+    [
+        (name("alias_manifest"), OLD),
+        (name("alias_manifest") + "_NODES", OLD),
+        (name("AbC_1"), OLD),
+        ("alias_manifest_1700000000", None),
+        ("PEC_TMP_alias", None),
+        ("PEC_SCRATCH_0", None),
+    ],
+)
+def test_temp_object_creation_time(object_name, expected):
+    assert temp_object_creation_time(object_name) == expected
+
+
+@pytest.fixture
+def conn():
+    rows = [
+        ("SCHEMA", None, name("OldSchema")),
+        ("SCRIPT", name("OldSchema"), name("alias_manifest")),
+        ("SCRIPT", "MY_SCHEMA", name("alias_manifest")),
+        ("TABLE", "MY_SCHEMA", name("alias_manifest") + "_NODES"),
+        ("SCRIPT", "MY_SCHEMA", name("alias_manifest", NOW)),
+        ("SCHEMA", None, name("NewSchema", NOW)),
+        ("TABLE", "MY_SCHEMA", "PEC_TMP_TABLE"),
+    ]
+    conn = Mock()
+    conn.execute.return_value.fetchall.return_value = rows
+    return conn
+
+
+def test_find_temp_objects(conn):
+    objects = find_temp_objects(conn, timedelta(hours=1))
+    assert objects == [
+        TempObject("SCHEMA", None, name("OldSchema"), OLD),
+        TempObject("SCRIPT", "MY_SCHEMA", name("alias_manifest"), OLD),
+        TempObject("TABLE", "MY_SCHEMA", name("alias_manifest") + "_NODES", OLD),
+    ]
+
+
+def test_sweep_temp_objects(conn):
+    objects = sweep_temp_objects(conn, timedelta(hours=1))
+    statements = [c.args[0] for c in conn.execute.call_args_list[1:]]
+    assert len(objects) == 3
+    assert statements == [
+        f'DROP SCHEMA IF EXISTS "{name("OldSchema")}" CASCADE',
+        f'DROP SCRIPT IF EXISTS "MY_SCHEMA"."{name("alias_manifest")}"',
+        f'DROP TABLE IF EXISTS "MY_SCHEMA"."{name("alias_manifest")}_NODES"',
+    ]
+
+
+def test_sweep_temp_objects_dry_run(conn):
+    objects = sweep_temp_objects(conn, timedelta(hours=1), dry_run=True)
+    assert len(objects) == 3
+    assert conn.execute.call_count == 1
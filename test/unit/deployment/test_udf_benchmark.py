@@ -0,0 +1,58 @@
+import json
+from datetime import timedelta
+from test.utils.node_udf_connection import NodeUdfConnection
+
+import pytest
+
+from exasol.python_extension_common.deployment.extract_validator import ExtractValidator
+from exasol.python_extension_common.deployment.udf_benchmark import (
+    NodeTiming,
+    benchmark_cold_start,
+)
+
+
+@pytest.fixture
+def connection():
+    return NodeUdfConnection(
+        "benchmark",
+        2,
+        [
+            [(1, 0.4, 3.0), (0, 0.2, 1.0)],
+            [(0, 0.4, 2.0), (1, None, 1.0)],
+        ],
+    )
+
+
+def test_benchmark_cold_start(connection):
+    validator = ExtractValidator(connection, timeout=timedelta(seconds=5))
+    benchmark = benchmark_cold_start(validator, "schema", "alias", ["numpy"], repetitions=2)
+    assert [run.nodes for run in benchmark.runs] == [
+        {0: NodeTiming(0.2, 1.0), 1: NodeTiming(0.4, 3.0)},
+        {0: NodeTiming(0.4, 2.0), 1: NodeTiming(None, 1.0)},
+    ]
+    summary = benchmark.summary()
+    expected_imports = {"mean": 1.75, "stdev": 0.829, "min": 1, "max": 3}
+    assert list(benchmark.runs[0].nodes) == [0, 1]
+    assert summary["imports"] == pytest.approx(expected_imports, abs=1e-3)
+    assert summary["nodes"]["1"]["startup"] == {"mean": 0.4, "stdev": 0.0, "min": 0.4, "max": 0.4}
+    assert summary["nodes"]["0"]["imports"]["mean"] == 1.5
+    assert sum(s.startswith("CREATE OR REPLACE") for s in connection.statements) == 1
+    # Each repetition calls the UDF once per node.
+    assert len(connection.udf_calls) == 2
+    assert connection.statements[-2].startswith("DROP SCRIPT IF EXISTS")
+    assert connection.statements[-1].startswith("DROP TABLE IF EXISTS")
+
+
+def test_benchmark_to_json(connection):
+    validator = ExtractValidator(connection, timeout=timedelta(seconds=5))
+    benchmark = benchmark_cold_start(validator, "schema", "alias", ["numpy"], repetitions=2)
+    result = json.loads(benchmark.to_json())
+    assert result["repetitions"] == 2
+    assert result["modules"] == ["numpy"]
+    assert result["runs"][1]["nodes"]["1"] == {"startup": None, "imports": 1.0}
+
+
+def test_benchmark_invalid_repetitions(connection):
+    validator = ExtractValidator(connection, timeout=timedelta(seconds=5))
+    with pytest.raises(ValueError):
+        benchmark_cold_start(validator, "schema", "alias", [], repetitions=0)
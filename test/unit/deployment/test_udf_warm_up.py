@@ -0,0 +1,31 @@
+from datetime import timedelta
+from test.utils.node_udf_connection import NodeUdfConnection
+
+import pytest
+
+from exasol.python_extension_common.deployment.extract_validator import ExtractValidator
+from exasol.python_extension_common.deployment.udf_warm_up import warm_up_nodes
+
+
+def test_warm_up_nodes():
+    conn = NodeUdfConnection("warmup", 3, [[(1, 1.5), (0, 0.7), (2, 0.1)]], ready_at=2)
+    validator = ExtractValidator(conn, timeout=timedelta(seconds=5), interval=timedelta(0))
+    times = warm_up_nodes(validator, "schema", "alias", ["numpy", "pandas"])
+    assert times == {
+        0: timedelta(seconds=0.7),
+        1: timedelta(seconds=1.5),
+        2: timedelta(seconds=0.1),
+    }
+    assert conn.params[-1]["argument"] == "numpy\npandas"
+    # The UDF is called once per node, even if the validator doesn't probe per node.
+    assert len(conn.udf_calls) == 2
+    assert conn.statements[-2].startswith("DROP SCRIPT IF EXISTS")
+    assert conn.statements[-1].startswith("DROP TABLE IF EXISTS")
+
+
+def test_warm_up_nodes_failure():
+    conn = NodeUdfConnection("warmup", 1, [], ready_at=10**9)
+    validator = ExtractValidator(conn, timeout=timedelta(seconds=0.2), interval=timedelta(0))
+    with pytest.raises(RuntimeError, match="not extracted"):
+        warm_up_nodes(validator, "schema", "alias", [])
+    assert conn.statements[-2].startswith("DROP SCRIPT IF EXISTS")
@@ -0,0 +1,47 @@
+class NodeUdfConnection:
+    """
+    Simulates a cluster of nproc nodes running a UDF of the specified kind
+    exactly once on each node, see ExtractValidator.node_udf(). The node table
+    holds rows on all nodes.
+
+    Each call of the UDF returns the next list of rows. The calls fail until
+    the specified attempt, e.g. while the container is not extracted yet.
+    """
+
+    def __init__(self, kind: str, nproc: int, rows: list[list], ready_at: int = 1):
+        self.kind = kind
+        self.nproc = nproc
+        self.rows = iter(rows)
+        self.ready_at = ready_at
+        self.attempt = 0
+        self.statements: list[str] = []
+        self.params: list = []
+        self.result: list | tuple = []
+
+    def execute(self, query: str, params=None):
+        statement = query.strip()
+        self.statements.append(statement)
+        if statement.startswith("SELECT nproc()"):
+            self.result = [self.nproc]
+        elif statement.startswith("SELECT COUNT(*)"):
+            self.result = (self.nproc, self.nproc)
+        elif statement.startswith("SELECT") and f"_{self.kind}_" in statement:
+            self.attempt += 1
+            self.params.append(params)
+            if self.attempt < self.ready_at:
+                raise RuntimeError("container not extracted yet")
+            self.result = next(self.rows)
+        return self
+
+    def fetchone(self):
+        return self.result
+
+    def fetchall(self):
+        return self.result
+
+    @property
+    def udf_calls(self) -> list[str]:
+        """
+        The statements calling the UDF.
+        """
+        return [s for s in self.statements if "GROUP BY IPROC()" in s]